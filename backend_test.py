@@ -11,41 +11,24 @@ Tests the improvements mentioned in the review request:
 import requests
 import json
 import time
+import os
 import sys
 from typing import Dict, Any, List
 
+from ferdi_enums import load_enum_tables, validate_records
+from ferdi_event_log import log_test_event
+from ferdi_http import create_session
+
 # Test configuration
 BASE_URL = "https://1203e6e9-e02a-436a-a857-1c91e1f5577f.preview.emergentagent.com"
 API_BASE_URL = f"{BASE_URL}/api"
 
-# Expected enum values after migration
-EXPECTED_ENUMS = {
-    "UserRole": {
-        "SUPER_ADMIN": "SUPER_ADMIN",
-        "ADMIN": "ADMIN", 
-        "DISPATCH": "DISPATCH",
-        "DRIVER": "DRIVER",
-        "INTERNAL_SUPPORT": "INTERNAL_SUPPORT",
-        "ACCOUNTANT": "ACCOUNTANT"
-    },
-    "UserStatus": {
-        "ACTIVE": "ACTIVE",
-        "INACTIVE": "INACTIVE",
-        "PENDING": "PENDING", 
-        "LOCKED": "LOCKED"
-    },
-    "CompanyStatus": {
-        "ACTIVE": "ACTIVE",
-        "INACTIVE": "INACTIVE",
-        "SUSPENDED": "SUSPENDED"
-    },
-    "SubscriptionPlan": {
-        "FREETRIAL": "FREETRIAL",
-        "ESSENTIAL": "ESSENTIAL",
-        "STANDARD": "STANDARD", 
-        "PREMIUM": "PREMIUM"
-    }
-}
+# Pause between tests in seconds (the warm runner daemon sets this to 0)
+TEST_DELAY = float(os.getenv('FERDI_TEST_DELAY', '0.5'))
+
+# Expected enum values after migration, parsed from lib/constants/enums.js
+ENUM_TABLES = load_enum_tables()
+EXPECTED_ENUMS = ENUM_TABLES.as_expected_enums()
 
 # Test credentials from mock data
 TEST_CREDENTIALS = {
@@ -68,7 +51,7 @@ TEST_CREDENTIALS = {
 
 class FerdiEnumTester:
     def __init__(self):
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'Content-Type': 'application/json',
             'Accept': 'application/json'
@@ -85,6 +68,8 @@ class FerdiEnumTester:
             "details": details or {}
         }
         self.test_results.append(result)
+        if log_test_event(self, result):
+            return
         
         status = "✅ PASS" if success else "❌ FAIL"
         print(f"{status} {test_name}: {message}")
@@ -314,27 +299,28 @@ class FerdiEnumTester:
                 users = users_data.get("data", []) if isinstance(users_data, dict) else users_data
                 
                 if users:
-                    # Check first user's role and status
-                    first_user = users[0]
-                    role = first_user.get("role")
-                    status = first_user.get("status")
-                    
-                    role_valid = role in EXPECTED_ENUMS["UserRole"].values()
-                    status_valid = status in EXPECTED_ENUMS["UserStatus"].values()
-                    
-                    if role_valid and status_valid:
+                    # Check role and status of every user in one pass
+                    report = validate_records(users, "user", tables=ENUM_TABLES)
+
+                    if report["conforming"]:
                         self.log_test(
                             "Users List Enum Values",
                             True,
                             f"Users list contains new enum values",
-                            {"sample_role": role, "sample_status": status, "total_users": len(users)}
+                            {"total_users": len(users), "checked_fields": list(report["fields"].keys())}
                         )
                     else:
                         self.log_test(
                             "Users List Enum Values",
                             False,
                             f"Users list contains old enum values",
-                            {"sample_role": role, "sample_status": status, "role_valid": role_valid, "status_valid": status_valid}
+                            {
+                                "total_users": len(users),
+                                "non_conforming_rows": len(report["invalid_rows"]),
+                                "invalid_roles": report["fields"]["role"]["invalid_values"],
+                                "invalid_statuses": report["fields"]["status"]["invalid_values"],
+                                "first_rows": report["invalid_rows"][:5]
+                            }
                         )
                 else:
                     self.log_test(
@@ -601,18 +587,13 @@ class FerdiEnumTester:
                     
                     if user_response.status_code == 200:
                         user_data = user_response.json()
-                        
-                        # Check for old numeric role values
-                        role = user_data.get("role")
-                        if role in ["1", "2", "3", "4", "5", "6"]:
-                            test_passed = False
-                            issues_found.append(f"User role still uses old numeric value: {role}")
-                        
-                        # Check for old numeric status values  
-                        status = user_data.get("status")
-                        if status in ["1", "2"]:
-                            test_passed = False
-                            issues_found.append(f"User status still uses old numeric value: {status}")
+
+                        # Check for old numeric role and status values
+                        report = validate_records([user_data], "user", tables=ENUM_TABLES)
+                        for field, field_report in report["fields"].items():
+                            for value in field_report["legacy_numeric"]:
+                                test_passed = False
+                                issues_found.append(f"User {field} still uses old numeric value: {value}")
             
             if test_passed:
                 self.log_test(
@@ -728,7 +709,7 @@ class FerdiEnumTester:
                 )
             
             # Small delay between tests
-            time.sleep(0.5)
+            time.sleep(TEST_DELAY)
         
         # Print summary
         self.print_summary()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+FERDI Response Compression Audit
+Requests every GET route of the route catalog three times over - with
+Accept-Encoding identity, gzip and br - and records, per encoding:
+- wire bytes (the body as it crossed the network, before decoding)
+- the Content-Encoding the server actually answered with
+- client-side decode time
+- end-to-end latency to the last byte
+
+The proxy rebuilds every response with only a Content-Type header, so
+upstream compression can be lost on the way. With --backend-url the audit
+also asks the backend directly and flags routes where the backend compresses
+but the proxy does not.
+
+For responses that arrive uncompressed, the body is compressed locally to
+show what gzip/br would have saved. The bandwidth summary covers the list
+and dashboard routes drivers poll, with transfer times on mobile links.
+
+br needs the optional brotli package (pip install brotli); without it, br is
+still requested and its wire bytes recorded, but not decoded.
+
+Usage:
+    python compression_audit.py
+    python compression_audit.py --repeat 5 --backend-url http://localhost:8000/api/v1
+    python compression_audit.py --output compression.json
+"""
+
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from ferdi_auth import MOCK_ACCESS_TOKEN, obtain_access_token
+from ferdi_route_catalog import build_workload, load_route_catalog
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Configuration
+BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
+API_BASE_URL = f"{BASE_URL}/api"
+
+AUDIT_CONFIG = {
+    'repeat': 3,
+    'gzip_level': 6,       # zlib default, what most servers use
+    'brotli_quality': 5,   # typical on-the-fly br quality
+    'timeout': 30
+}
+
+ENCODINGS = ('identity', 'gzip', 'br')
+
+# Effective downlink throughput of typical driver connections
+MOBILE_PROFILES = {
+    '3G': {'kbps': 750},
+    '4G': {'kbps': 9000},
+}
+
+
+def decode_body(body: bytes, content_encoding: str) -> Optional[bytes]:
+    """Decode a wire body; None when the encoding cannot be decoded here"""
+    encoding = (content_encoding or 'identity').strip().lower()
+    if encoding in ('identity', ''):
+        return body
+    if encoding in ('gzip', 'x-gzip'):
+        return gzip.decompress(body)
+    if encoding == 'deflate':
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    if encoding == 'br' and brotli is not None:
+        return brotli.decompress(body)
+    return None
+
+
+def compress_locally(body: bytes, encoding: str) -> Optional[int]:
+    """Size the body would have had with the given encoding"""
+    if encoding == 'gzip':
+        return len(gzip.compress(body, AUDIT_CONFIG['gzip_level']))
+    if encoding == 'br' and brotli is not None:
+        return len(brotli.compress(body, quality=AUDIT_CONFIG['brotli_quality']))
+    return None
+
+
+def is_polled_route(request: Dict[str, Any]) -> bool:
+    """List and dashboard routes - what the driver app fetches over and over"""
+    path = request['path']
+    return path.startswith('/dashboard/') or (path.endswith('/') and 'test-id' not in path)
+
+
+def fetch(session: requests.Session, url: str, params: Dict[str, Any], headers: Dict[str, str],
+          encoding: str, timeout: float) -> Dict[str, Any]:
+    """One request with the given Accept-Encoding, measured on the raw wire body"""
+    request_headers = dict(headers, **{'Accept-Encoding': encoding})
+    started = time.perf_counter()
+    try:
+        response = session.get(url, params=params or None, headers=request_headers, timeout=timeout, stream=True)
+        wire = response.raw.read(decode_content=False)
+        latency_ms = (time.perf_counter() - started) * 1000.0
+        status = response.status_code
+        content_encoding = response.headers.get('Content-Encoding', 'identity')
+        response.close()
+    except requests.exceptions.RequestException as e:
+        return {'status': type(e).__name__, 'wire_bytes': 0, 'latency_ms': 0.0, 'content_encoding': None,
+                'decode_ms': None, 'body': None}
+
+    decode_started = time.perf_counter()
+    try:
+        body = decode_body(wire, content_encoding)
+    except Exception:
+        body = None
+    decode_ms = (time.perf_counter() - decode_started) * 1000.0 if body is not None else None
+    return {
+        'status': status,
+        'wire_bytes': len(wire),
+        'latency_ms': latency_ms,
+        'content_encoding': content_encoding,
+        'decode_ms': decode_ms,
+        'body': body
+    }
+
+
+def audit_route(session: requests.Session, request: Dict[str, Any], headers: Dict[str, str], repeat: int,
+                backend_url: Optional[str] = None) -> Dict[str, Any]:
+    """Median measurements per encoding for one route"""
+    url = f"{API_BASE_URL}{request['path']}"
+    result = {'route': request['key'], 'path': request['path'], 'polled': is_polled_route(request), 'encodings': {}}
+    decoded_size = None
+    identity_body = None
+
+    for encoding in ENCODINGS:
+        samples = [fetch(session, url, request.get('params'), headers, encoding, AUDIT_CONFIG['timeout'])
+                   for _ in range(max(repeat, 1))]
+        last = samples[-1]
+        decode_times = [s['decode_ms'] for s in samples if s['decode_ms'] is not None]
+        result['encodings'][encoding] = {
+            'status': last['status'],
+            'content_encoding': last['content_encoding'],
+            'wire_bytes': int(statistics.median(s['wire_bytes'] for s in samples)),
+            'latency_ms': statistics.median(s['latency_ms'] for s in samples),
+            'decode_ms': statistics.median(decode_times) if decode_times else None
+        }
+        if last['body'] is not None:
+            decoded_size = len(last['body'])
+            if encoding == 'identity':
+                identity_body = last['body']
+
+    result['decoded_bytes'] = decoded_size or 0
+    if identity_body:
+        result['potential'] = {encoding: compress_locally(identity_body, encoding) for encoding in ('gzip', 'br')}
+    else:
+        result['potential'] = {}
+
+    if backend_url:
+        backend = fetch(session, f"{backend_url.rstrip('/')}{request['path']}", request.get('params'), headers,
+                        'gzip, br', AUDIT_CONFIG['timeout'])
+        result['backend_encoding'] = backend['content_encoding']
+        proxy_encoding = result['encodings']['gzip']['content_encoding']
+        result['dropped_by_proxy'] = (backend['content_encoding'] not in (None, 'identity')
+                                      and proxy_encoding in (None, 'identity'))
+    return result
+
+
+def best_wire_bytes(result: Dict[str, Any]) -> Dict[str, int]:
+    """Bytes actually served per encoding, and what the best available encoding could achieve"""
+    identity = result['encodings']['identity']['wire_bytes']
+    wire = [result['encodings'][e]['wire_bytes'] for e in ENCODINGS if result['encodings'][e]['wire_bytes']]
+    served = min(wire) if wire else identity
+    achievable = min([served] + [size for size in result['potential'].values() if size])
+    return {'identity': identity, 'served': served, 'achievable': achievable}
+
+
+def transfer_ms(size: int, profile: Dict[str, Any]) -> float:
+    """Time to move size bytes down a link, ignoring the round trip"""
+    return size * 8 / (profile['kbps'] * 1000.0) * 1000.0
+
+
+def print_audit_report(results: List[Dict[str, Any]]):
+    print("=" * 80)
+    print("📊 RESPONSE COMPRESSION AUDIT - wire bytes per Accept-Encoding")
+    print("=" * 80)
+    print(f"{'Route':<28}  {'identity':>8}  {'gzip':>9}  {'br':>9}  {'decode':>7}  {'latency id/gz':>14}  {'could be':>8}")
+    print("-" * 80)
+    for result in sorted(results, key=lambda r: r['decoded_bytes'], reverse=True):
+        cells = []
+        for encoding in ('gzip', 'br'):
+            measured = result['encodings'][encoding]
+            marker = '' if measured['content_encoding'] == encoding else '*'
+            cells.append(f"{measured['wire_bytes']}{marker}")
+        decode = [result['encodings'][e]['decode_ms'] for e in ('gzip', 'br')
+                  if result['encodings'][e]['decode_ms'] is not None
+                  and result['encodings'][e]['content_encoding'] not in (None, 'identity')]
+        sizes = best_wire_bytes(result)
+        route = result['route'] if len(result['route']) <= 28 else result['route'][:27] + "…"
+        latency = (f"{result['encodings']['identity']['latency_ms']:.1f}/"
+                   f"{result['encodings']['gzip']['latency_ms']:.1f}ms")
+        print(f"{route:<28}  {result['encodings']['identity']['wire_bytes']:>8}  {cells[0]:>9}  {cells[1]:>9}  "
+              f"{(f'{max(decode):.2f}ms' if decode else '-'):>7}  {latency:>14}  {sizes['achievable']:>8}")
+    print("-" * 80)
+    print("* = server answered without that encoding (sent identity or something else)")
+
+    dropped = [r['route'] for r in results if r.get('dropped_by_proxy')]
+    if dropped:
+        print(f"❌ Backend compresses but the proxy serves identity: {', '.join(dropped)}")
+    uncompressed = [r for r in results if all(r['encodings'][e]['content_encoding'] in (None, 'identity')
+                                              for e in ('gzip', 'br'))]
+    if uncompressed:
+        print(f"⚠️  {len(uncompressed)}/{len(results)} routes never compress, whatever the client accepts")
+    if brotli is None:
+        print("ℹ️  brotli not installed - br responses are not decoded and br savings are not estimated")
+    print()
+
+    polled = [r for r in results if r['polled']]
+    print("📱 LIST AND DASHBOARD ROUTES - bandwidth per refresh on mobile networks")
+    print("-" * 80)
+    if not polled:
+        print("No list or dashboard routes answered")
+        print("=" * 80)
+        return
+    totals = {'identity': 0, 'served': 0, 'achievable': 0}
+    for result in polled:
+        for key, value in best_wire_bytes(result).items():
+            totals[key] += value
+    saved_now = totals['identity'] - totals['served']
+    saved_possible = totals['served'] - totals['achievable']
+    print(f"One refresh of {len(polled)} routes: {totals['identity']} B uncompressed, "
+          f"{totals['served']} B as served today, {totals['achievable']} B with compression enabled")
+    print(f"Saved today: {saved_now} B, still available: {saved_possible} B per refresh")
+    for name, profile in MOBILE_PROFILES.items():
+        print(f"   {name} ({profile['kbps']} kbps): {transfer_ms(totals['served'], profile):.0f} ms of transfer "
+              f"per refresh today, {transfer_ms(totals['achievable'], profile):.0f} ms with compression")
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FERDI per-route response compression audit")
+    parser.add_argument("--repeat", type=int, default=AUDIT_CONFIG['repeat'], help="requests per route and encoding")
+    parser.add_argument("--backend-url", help="backend API root to compare against, e.g. http://localhost:8000/api/v1")
+    parser.add_argument("--output", help="write per-route results as JSON")
+    args = parser.parse_args()
+
+    session = requests.Session()
+    session.headers.update({'Accept': 'application/json', 'User-Agent': 'FERDI-Compression-Audit/1.0'})
+    token = obtain_access_token(session, API_BASE_URL) or MOCK_ACCESS_TOKEN
+    workload = build_workload(load_route_catalog())
+
+    print(f"🗜️  Compression audit of {len(workload)} GET routes against {API_BASE_URL}")
+    results = []
+    for request in workload:
+        headers = {'Authorization': f'Bearer {token}'} if request.get('auth') else {}
+        results.append(audit_route(session, request, headers, args.repeat, args.backend_url))
+
+    print_audit_report(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote report to {args.output}")
+    return not any(r.get('dropped_by_proxy') for r in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
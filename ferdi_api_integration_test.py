@@ -20,51 +20,63 @@ Configuration:
 import requests
 import json
 import time
+import os
 import sys
 from typing import Dict, Any, List
 
+from ferdi_data_factory import current_namespace
+from ferdi_event_log import log_test_event
+from ferdi_http import create_session
+
 # Test configuration from environment
 BASE_URL = "https://1203e6e9-e02a-436a-a857-1c91e1f5577f.preview.emergentagent.com"
 API_BASE_URL = f"{BASE_URL}/api/v1"
 
-# Test data for FERDI API testing
+# Pause between tests in seconds (the warm runner daemon sets this to 0)
+TEST_DELAY = float(os.getenv('FERDI_TEST_DELAY', '0.5'))
+
+# Test data for FERDI API testing, generated in this run's own namespace so parallel runs never collide
+TENANT = current_namespace()
+MANAGER_EMAIL = TENANT.email('jean.dupont')
+
 TEST_DATA = {
     "company_registration": {
-        "name": "Transport Bretagne FERDI",
-        "email": "admin@transport-bretagne-ferdi.fr",
+        "name": TENANT.name("Transport Bretagne FERDI"),
+        "email": TENANT.email('admin'),
+        "siret": TENANT.siret(),
         "phone": "+33123456789",
         "address": "123 Rue de la Logistique, 35000 Rennes",
         "manager_first_name": "Jean",
         "manager_last_name": "Dupont",
-        "manager_email": "jean.dupont@transport-bretagne-ferdi.fr",
+        "manager_email": MANAGER_EMAIL,
         "manager_password": "SecureManagerPass123!"
     },
     "user_signup": {
-        "email": "marie.martin@transport-bretagne-ferdi.fr",
+        "email": TENANT.email('marie.martin'),
         "password": "SecureUserPass123!",
         "first_name": "Marie",
         "last_name": "Martin",
         "company_code": "TB2024"
     },
     "login_credentials": {
-        "username": "jean.dupont@transport-bretagne-ferdi.fr",
+        "username": MANAGER_EMAIL,
         "password": "SecureManagerPass123!"
     },
     "invitation": {
-        "email": "pierre.bernard@transport-bretagne-ferdi.fr",
+        "email": TENANT.email('pierre.bernard'),
         "role": "DRIVER",
         "first_name": "Pierre",
         "last_name": "Bernard",
         "personal_message": "Bienvenue dans l'équipe FERDI!"
     },
     "password_recovery": {
-        "email": "jean.dupont@transport-bretagne-ferdi.fr"
+        "email": MANAGER_EMAIL
     }
 }
 
 class FerdiAPITester:
     def __init__(self):
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'Accept': 'application/json',
             'User-Agent': 'FERDI-API-Tester/1.0'
@@ -82,6 +94,8 @@ class FerdiAPITester:
             "details": details or {}
         }
         self.test_results.append(result)
+        if log_test_event(self, result):
+            return
         
         status = "✅ PASS" if success else "❌ FAIL"
         print(f"{status} {test_name}: {message}")
@@ -640,7 +654,7 @@ class FerdiAPITester:
                 headers['Authorization'] = f'Bearer {self.access_token}'
                 
             user_data = {
-                "email": "new.user@transport-bretagne-ferdi.fr",
+                "email": TENANT.email('new.user'),
                 "password": "NewUserPass123!",
                 "first_name": "Nouveau",
                 "last_name": "Utilisateur",
@@ -842,7 +856,7 @@ class FerdiAPITester:
                 )
             
             # Small delay between tests
-            time.sleep(0.5)
+            time.sleep(TEST_DELAY)
         
         # Print summary
         self.print_summary()
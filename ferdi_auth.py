@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+FERDI Authentication Helpers
+OAuth2 password-flow login shared by the FERDI harness scripts.
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import requests
+
+# Mock token accepted by the frontend mock API (see lib/mock-data.js)
+MOCK_ACCESS_TOKEN = 'mock-jwt-token-12345'
+
+# Default harness account - manager from the mock data set
+DEFAULT_CREDENTIALS = {
+    'email': os.getenv('FERDI_TEST_EMAIL', 'manager@transport-bretagne.fr'),
+    'password': os.getenv('FERDI_TEST_PASSWORD', 'SecurePass123!')
+}
+
+
+# Lifetime assumed for tokens whose expiry cannot be read from the JWT
+DEFAULT_TOKEN_TTL = 15 * 60
+# Tokens this close to expiry are refreshed instead of reused
+TOKEN_EXPIRY_MARGIN = 30
+
+
+def token_expiry(token: str) -> Optional[float]:
+    """Read the exp claim of a JWT without verifying it"""
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get('exp')
+        return float(exp) if exp is not None else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
+
+
+class TokenCache:
+    """Access tokens per (API base URL, email), reused until shortly before they expire"""
+
+    def __init__(self):
+        self._tokens: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, api_base_url: str, email: str) -> Optional[str]:
+        with self._lock:
+            cached = self._tokens.get((api_base_url, email))
+        if cached and cached[1] - TOKEN_EXPIRY_MARGIN > time.time():
+            return cached[0]
+        return None
+
+    def put(self, api_base_url: str, email: str, token: str):
+        expires_at = token_expiry(token) or time.time() + DEFAULT_TOKEN_TTL
+        with self._lock:
+            self._tokens[(api_base_url, email)] = (token, expires_at)
+
+    def invalidate(self, api_base_url: Optional[str] = None, email: Optional[str] = None):
+        with self._lock:
+            for key in list(self._tokens):
+                if (api_base_url is None or key[0] == api_base_url) and (email is None or key[1] == email):
+                    del self._tokens[key]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._tokens)
+
+
+TOKEN_CACHE = TokenCache()
+
+
+def build_login_form(email: str, password: str) -> Dict[str, str]:
+    """OAuth2PasswordRequestForm fields expected by POST /login/access-token"""
+    return {
+        'grant_type': 'password',
+        'username': email,
+        'password': password,
+        'scope': '',
+        'client_id': '',
+        'client_secret': ''
+    }
+
+
+# Body encodings the proxy's login/access-token branch accepts
+LOGIN_ENCODINGS = ('urlencoded', 'multipart', 'json')
+
+
+def login(session: requests.Session, api_base_url: str, email: str, password: str,
+          timeout: float = 10, encoding: str = 'urlencoded') -> requests.Response:
+    """Send a login request in the given body encoding and return the raw response"""
+    form = build_login_form(email, password)
+    url = f"{api_base_url}/login/access-token"
+    if encoding == 'multipart':
+        # (None, value) parts are plain form fields, not file uploads
+        return session.post(url, files={key: (None, value) for key, value in form.items()}, timeout=timeout)
+    if encoding == 'json':
+        return session.post(url, json=form, timeout=timeout)
+    if encoding != 'urlencoded':
+        raise ValueError(f"Unknown login encoding: {encoding}")
+    return session.post(
+        url,
+        data=form,
+        headers={'Content-Type': 'application/x-www-form-urlencoded'},
+        timeout=timeout
+    )
+
+
+def obtain_access_token(session: requests.Session, api_base_url: str,
+                        email: Optional[str] = None, password: Optional[str] = None,
+                        timeout: float = 10, use_cache: bool = True) -> Optional[str]:
+    """Log in and return the access token, or None when login is not possible.
+
+    FERDI_ACCESS_TOKEN short-circuits the login entirely. Tokens are cached per
+    process, so a long-lived runner only logs in again once the token expires.
+    """
+    env_token = os.getenv('FERDI_ACCESS_TOKEN')
+    if env_token:
+        return env_token
+
+    email = email or DEFAULT_CREDENTIALS['email']
+    if use_cache:
+        cached = TOKEN_CACHE.get(api_base_url, email)
+        if cached:
+            return cached
+
+    try:
+        response = login(
+            session, api_base_url, email,
+            password or DEFAULT_CREDENTIALS['password'],
+            timeout=timeout
+        )
+    except requests.exceptions.RequestException:
+        return None
+
+    if response.status_code != 200:
+        return None
+    try:
+        token = response.json().get('access_token')
+    except ValueError:
+        return None
+    if token and use_cache:
+        TOKEN_CACHE.put(api_base_url, email, token)
+    return token
@@ -0,0 +1,623 @@
+#!/usr/bin/env python3
+"""
+FERDI Benchmark Helpers
+Shared latency recording, concurrent workload execution and process
+sampling used by the FERDI benchmark scripts.
+
+Usage:
+    python ferdi_benchmark.py merge worker1.jsonl worker2.jsonl   # totals from snapshot files
+    python ferdi_benchmark.py windows soak.jsonl                   # p99 per snapshot window
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from ferdi_sketch import DEFAULT_RELATIVE_ACCURACY, DDSketch
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Return the pct-th percentile (0-100) of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (pct / 100.0) * (len(sorted_values) - 1)
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = rank - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def scaling_exponent(sizes: List[float], values: List[float]) -> Optional[float]:
+    """Least-squares slope of log(value) over log(size): ~0 flat, ~1 linear, ~2 quadratic"""
+    points = [(math.log(x), math.log(y)) for x, y in zip(sizes, values) if x > 0 and y > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var_x:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+# Candidate models for fit_growth, simplest first, with the class each one reports as
+GROWTH_MODELS = (
+    ('constant', 'constant', lambda n: 0.0),
+    ('log', 'log', lambda n: math.log(n)),
+    ('linear', 'linear', lambda n: float(n)),
+    ('n log n', 'superlinear', lambda n: n * math.log(n)),
+    ('quadratic', 'superlinear', lambda n: float(n) * n),
+)
+GROWTH_CLASSES = ('constant', 'log', 'linear', 'superlinear')
+
+
+def fit_growth(sizes: List[float], values: List[float], flat_ratio: float = 1.2,
+               min_increase: float = 0.0, tolerance: float = 0.1) -> Dict[str, Any]:
+    """Best-fitting model value = a + b * f(size) among GROWTH_MODELS.
+
+    The simplest growing model whose RMS error is within `tolerance` of the
+    best one, or within min_increase of it, wins - so jitter alone does not
+    push a route into a worse class. If that model predicts less than
+    flat_ratio growth, or less than min_increase in absolute terms, across
+    the sizes, the values are constant.
+    """
+    points = sorted((x, y) for x, y in zip(sizes, values) if x > 0 and y is not None and y > 0)
+    if len(points) < 2:
+        return {'model': None, 'growth': None, 'ratio': None, 'fits': {}}
+    mean_y = sum(y for _, y in points) / len(points)
+    fits = {}
+    for name, _, f in GROWTH_MODELS:
+        xs = [f(x) for x, _ in points]
+        scale = max(abs(x) for x in xs) or 1.0
+        xs = [x / scale for x in xs]
+        mean_x = sum(xs) / len(xs)
+        var_x = sum((x - mean_x) ** 2 for x in xs)
+        slope = sum((x - mean_x) * (y - mean_y) for x, (_, y) in zip(xs, points)) / var_x if var_x else 0.0
+        # A shrinking fit is no evidence of growth; it degrades to the mean
+        slope = max(slope, 0.0)
+        intercept = mean_y - slope * mean_x
+        residual = sum((y - intercept - slope * x) ** 2 for x, (_, y) in zip(xs, points))
+        fits[name] = {'intercept': intercept, 'slope': slope / scale, 'rms': math.sqrt(residual / len(points))}
+
+    models = {name: f for name, _, f in GROWTH_MODELS}
+    growing = [name for name, _, _ in GROWTH_MODELS[1:]]
+    best = min(fits[name]['rms'] for name in growing)
+    model = next(name for name in growing
+                 if fits[name]['rms'] <= max(best * (1 + tolerance), best + min_increase) + 1e-12)
+    first, last = (fits[model]['intercept'] + fits[model]['slope'] * models[model](x)
+                   for x in (points[0][0], points[-1][0]))
+    ratio = last / first if first > 0 else math.inf
+    if ratio < flat_ratio or last - first < min_increase:
+        model = 'constant'
+    growth = next(growth for name, growth, _ in GROWTH_MODELS if name == model)
+    return {'model': model, 'growth': growth, 'ratio': ratio, 'fits': fits}
+
+
+class LatencyRecorder:
+    """Thread-safe per-key recording of latencies, response sizes and statuses.
+
+    Latencies and sizes are aggregated into DDSketches, so memory stays flat
+    however long the run is and recorders from parallel workers merge exactly.
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self._lock = threading.Lock()
+        self.relative_accuracy = relative_accuracy
+        self.latencies: Dict[str, DDSketch] = {}
+        self.sizes: Dict[str, DDSketch] = {}
+        self.statuses: Dict[str, Dict[Any, int]] = {}
+        self.errors: Dict[str, int] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._window: Optional[Dict[str, Any]] = None
+
+    def _sketch(self, sketches: Dict[str, DDSketch], key: str) -> DDSketch:
+        sketch = sketches.get(key)
+        if sketch is None:
+            sketch = sketches[key] = DDSketch(self.relative_accuracy)
+        return sketch
+
+    def record(self, key: str, latency_ms: float, status: Any = None, size: int = 0, error: bool = False):
+        """Record one request outcome under the given key"""
+        now = time.monotonic()
+        with self._lock:
+            if self.started_at is None:
+                self.started_at = now - latency_ms / 1000.0
+            self.finished_at = now
+            self._sketch(self.latencies, key).add(latency_ms)
+            self._sketch(self.sizes, key).add(size)
+            statuses = self.statuses.setdefault(key, {})
+            statuses[status] = statuses.get(status, 0) + 1
+            if error:
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+            if self._window is not None:
+                window = self._window['keys'].setdefault(key, {
+                    'latency': DDSketch(self.relative_accuracy),
+                    'size': DDSketch(self.relative_accuracy),
+                    'statuses': {},
+                    'errors': 0
+                })
+                window['latency'].add(latency_ms)
+                window['size'].add(size)
+                window['statuses'][str(status)] = window['statuses'].get(str(status), 0) + 1
+                window['errors'] += 1 if error else 0
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self.latencies.keys())
+
+    def elapsed(self) -> float:
+        """Wall-clock seconds between the first and the last recorded request"""
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return max(self.finished_at - self.started_at, 1e-9)
+
+    def summary(self, key: str) -> Dict[str, Any]:
+        """Latency percentiles, throughput and status breakdown for one key"""
+        with self._lock:
+            latencies = self.latencies[key].copy() if key in self.latencies else DDSketch(self.relative_accuracy)
+            sizes = self.sizes[key].copy() if key in self.sizes else DDSketch(self.relative_accuracy)
+            statuses = dict(self.statuses.get(key, {}))
+            errors = self.errors.get(key, 0)
+        return _summarise(key, latencies, sizes, statuses, errors, self.elapsed())
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        return [self.summary(key) for key in self.keys()]
+
+    def merge(self, other: 'LatencyRecorder'):
+        """Fold another recorder (e.g. from a parallel worker) into this one"""
+        with other._lock:
+            state = other.to_dict()
+        self._merge_state(state)
+
+    def _merge_state(self, state: Dict[str, Any]):
+        with self._lock:
+            for key, data in state['keys'].items():
+                self._sketch(self.latencies, key).merge(DDSketch.from_dict(data['latency']))
+                self._sketch(self.sizes, key).merge(DDSketch.from_dict(data['size']))
+                statuses = self.statuses.setdefault(key, {})
+                for status, count in data['statuses'].items():
+                    status = int(status) if status.isdigit() else status
+                    statuses[status] = statuses.get(status, 0) + count
+                if data['errors']:
+                    self.errors[key] = self.errors.get(key, 0) + data['errors']
+            if state.get('started_at') is not None:
+                self.started_at = min(filter(None, (self.started_at, state['started_at'])))
+            if state.get('finished_at') is not None:
+                self.finished_at = max(filter(None, (self.finished_at, state['finished_at'])))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable state; monotonic timestamps are comparable across processes on one host"""
+        return {
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'keys': {
+                key: {
+                    'latency': self.latencies[key].to_dict(),
+                    'size': self.sizes[key].to_dict(),
+                    'statuses': {str(status): count for status, count in self.statuses.get(key, {}).items()},
+                    'errors': self.errors.get(key, 0)
+                } for key in self.latencies
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'LatencyRecorder':
+        recorder = cls()
+        recorder._merge_state(state)
+        return recorder
+
+    def start_windows(self):
+        """Start collecting a per-window copy of every record, for take_window()"""
+        with self._lock:
+            if self._window is None:
+                self._window = {'started_at': time.time(), 'keys': {}}
+
+    def take_window(self) -> Optional[Dict[str, Any]]:
+        """Return what was recorded since the previous call as a serialisable snapshot, and start a new window"""
+        with self._lock:
+            window = self._window
+            if window is None:
+                return None
+            now = time.time()
+            self._window = {'started_at': now, 'keys': {}}
+        return {
+            'window_start': window['started_at'],
+            'window_end': now,
+            'keys': {
+                key: {
+                    'latency': data['latency'].to_dict(),
+                    'size': data['size'].to_dict(),
+                    'statuses': data['statuses'],
+                    'errors': data['errors']
+                } for key, data in window['keys'].items()
+            }
+        }
+
+
+def _summarise(key: str, latencies: DDSketch, sizes: DDSketch, statuses: Dict[Any, int], errors: int,
+               elapsed: float) -> Dict[str, Any]:
+    count = latencies.count
+    return {
+        "key": key,
+        "count": count,
+        "errors": errors,
+        "error_rate": (errors / count) if count else 0.0,
+        "throughput_rps": (count / elapsed) if elapsed else 0.0,
+        "mean_ms": latencies.mean(),
+        "p50_ms": latencies.quantile(0.50),
+        "p95_ms": latencies.quantile(0.95),
+        "p99_ms": latencies.quantile(0.99),
+        "max_ms": latencies.max if count else 0.0,
+        "mean_bytes": sizes.mean(),
+        "statuses": {str(k): v for k, v in statuses.items()},
+    }
+
+
+class RecorderSnapshotter:
+    """Appends a recorder's windowed snapshots to a JSON-lines file every `interval` seconds"""
+
+    def __init__(self, recorder: LatencyRecorder, path: str, interval: float = 10.0):
+        self.recorder = recorder
+        self.path = path
+        self.interval = interval
+        self.windows_written = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def flush(self):
+        """Write the current window now (skipped when nothing was recorded)"""
+        window = self.recorder.take_window()
+        if not window or not window['keys']:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(window, separators=(',', ':')) + "\n")
+        self.windows_written += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def start(self) -> 'RecorderSnapshotter':
+        self.recorder.start_windows()
+        self._thread = threading.Thread(target=self._run, name="ferdi-recorder-snapshots", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+def load_snapshots(*paths: str) -> Iterator[Dict[str, Any]]:
+    """Yield every window from one or more snapshot files, oldest first per file"""
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def window_summaries(window: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per-key summaries of one snapshot window"""
+    elapsed = max(window['window_end'] - window['window_start'], 1e-9)
+    return [
+        _summarise(key, DDSketch.from_dict(data['latency']), DDSketch.from_dict(data['size']),
+                   data['statuses'], data['errors'], elapsed)
+        for key, data in window['keys'].items()
+    ]
+
+
+def merge_snapshots(*paths: str) -> LatencyRecorder:
+    """Rebuild run totals from snapshot files, e.g. one per parallel worker"""
+    recorder = LatencyRecorder()
+    started, finished = None, None
+    for window in load_snapshots(*paths):
+        recorder._merge_state({'keys': window['keys']})
+        started = window['window_start'] if started is None else min(started, window['window_start'])
+        finished = window['window_end'] if finished is None else max(finished, window['window_end'])
+    # Wall-clock window bounds stand in for the monotonic first/last request times
+    recorder.started_at, recorder.finished_at = started, finished
+    return recorder
+
+
+def run_workload(items: Iterable[Dict[str, Any]],
+                 send: Callable[[Dict[str, Any]], Tuple[Any, int]],
+                 recorder: LatencyRecorder,
+                 concurrency: int = 8,
+                 iterations: int = 1,
+                 duration: Optional[float] = None,
+                 is_error: Optional[Callable[[Any], bool]] = None) -> LatencyRecorder:
+    """Run workload items through send() from a closed-loop pool of worker threads.
+
+    send(item) must return (status, response_size). Each item is sent
+    `iterations` times, or repeatedly until `duration` seconds elapse when a
+    duration is given. Results are recorded under item["key"].
+    """
+    items = list(items)
+    if not items:
+        return recorder
+
+    is_error = is_error or (lambda status: not isinstance(status, int) or status >= 500)
+    deadline = time.monotonic() + duration if duration else None
+    total = None if deadline else len(items) * max(iterations, 1)
+    cursor = {"next": 0}
+    cursor_lock = threading.Lock()
+
+    def next_item() -> Optional[Dict[str, Any]]:
+        with cursor_lock:
+            index = cursor["next"]
+            if total is not None and index >= total:
+                return None
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            cursor["next"] = index + 1
+        return items[index % len(items)]
+
+    def worker():
+        while True:
+            item = next_item()
+            if item is None:
+                return
+            start = time.perf_counter()
+            try:
+                status, size = send(item)
+            except Exception as e:
+                status, size = type(e).__name__, 0
+            latency_ms = (time.perf_counter() - start) * 1000.0
+            recorder.record(item["key"], latency_ms, status, size, is_error(status))
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(concurrency, 1))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder
+
+
+def find_listening_pid(port: int) -> Optional[int]:
+    """PID of the local process listening on a TCP port (Linux /proc only)"""
+    inodes = set()
+    for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+        try:
+            with open(table, 'r', encoding='ascii') as f:
+                next(f)
+                for line in f:
+                    fields = line.split()
+                    # State 0A is LISTEN; local address is HEX_IP:HEX_PORT
+                    if fields[3] == '0A' and int(fields[1].rsplit(':', 1)[1], 16) == port:
+                        inodes.add(f"socket:[{fields[9]}]")
+        except (OSError, StopIteration, IndexError, ValueError):
+            continue
+    if not inodes:
+        return None
+
+    for pid in _proc_pids():
+        fd_dir = f"/proc/{pid}/fd"
+        try:
+            for fd in os.listdir(fd_dir):
+                if os.readlink(os.path.join(fd_dir, fd)) in inodes:
+                    return pid
+        except OSError:
+            continue
+    return None
+
+
+def local_server_pid(base_url: str, explicit: Optional[int] = None) -> Optional[int]:
+    """PID serving base_url: given explicitly, or whoever listens on its port on this host"""
+    if explicit:
+        return explicit
+    parsed = urlparse(base_url)
+    if parsed.hostname not in ('localhost', '127.0.0.1', '::1'):
+        return None
+    return find_listening_pid(parsed.port or (443 if parsed.scheme == 'https' else 80))
+
+
+def _proc_pids() -> List[int]:
+    try:
+        return [int(name) for name in os.listdir('/proc') if name.isdigit()]
+    except OSError:
+        return []
+
+
+def _proc_stat(pid: int) -> Optional[Tuple[int, float]]:
+    """(parent pid, user+system CPU seconds) from /proc/<pid>/stat"""
+    try:
+        with open(f"/proc/{pid}/stat", 'r', encoding='ascii', errors='replace') as f:
+            # The command name may contain spaces, so split after its closing parenthesis
+            fields = f.read().rsplit(')', 1)[1].split()
+    except (OSError, IndexError):
+        return None
+    return int(fields[1]), (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+
+
+def _proc_rss(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/statm", 'r', encoding='ascii') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+_CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+class ProcessSampler:
+    """Background sampling of a process tree's resident memory and CPU time.
+
+    Reads /proc, so it only works when the process runs on this Linux host.
+    Children are included because `next dev`/`next start` serve requests
+    from a forked worker process.
+    """
+
+    def __init__(self, pid: int, interval: float = 0.05, include_children: bool = True):
+        self.pid = pid
+        self.interval = interval
+        self.include_children = include_children
+        self.samples: List[Tuple[float, int, float]] = []  # (monotonic time, rss bytes, cpu seconds)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._tree: List[int] = [pid]
+        self._tree_refreshed = 0.0
+
+    @property
+    def available(self) -> bool:
+        return _proc_stat(self.pid) is not None
+
+    def _refresh_tree(self):
+        if not self.include_children:
+            return
+        children: Dict[int, List[int]] = {}
+        for pid in _proc_pids():
+            stat = _proc_stat(pid)
+            if stat:
+                children.setdefault(stat[0], []).append(pid)
+        tree, pending = [], [self.pid]
+        while pending:
+            pid = pending.pop()
+            tree.append(pid)
+            pending.extend(children.get(pid, []))
+        self._tree = tree
+        self._tree_refreshed = time.monotonic()
+
+    def sample(self) -> Tuple[float, int, float]:
+        """Take one sample now and keep it"""
+        if time.monotonic() - self._tree_refreshed > 1.0:
+            self._refresh_tree()
+        rss, cpu = 0, 0.0
+        for pid in self._tree:
+            stat = _proc_stat(pid)
+            if stat:
+                cpu += stat[1]
+                rss += _proc_rss(pid)
+        point = (time.monotonic(), rss, cpu)
+        with self._lock:
+            self.samples.append(point)
+        return point
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self) -> 'ProcessSampler':
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="ferdi-process-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.sample()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def mark(self) -> int:
+        """Take a sample and return its index, to delimit a window for window()"""
+        self.sample()
+        with self._lock:
+            return len(self.samples) - 1
+
+    def window(self, start_index: int, end_index: Optional[int] = None) -> Dict[str, Any]:
+        """RSS at the start, peak RSS and CPU seconds used between two marks"""
+        with self._lock:
+            points = self.samples[start_index:None if end_index is None else end_index + 1]
+        if not points:
+            return {'rss_start': 0, 'rss_peak': 0, 'rss_end': 0, 'rss_growth': 0, 'cpu_seconds': 0.0,
+                    'cpu_utilisation': 0.0}
+        elapsed = points[-1][0] - points[0][0]
+        cpu = points[-1][2] - points[0][2]
+        peak = max(point[1] for point in points)
+        return {
+            'rss_start': points[0][1],
+            'rss_peak': peak,
+            'rss_end': points[-1][1],
+            'rss_growth': peak - points[0][1],
+            'cpu_seconds': cpu,
+            'cpu_utilisation': cpu / elapsed if elapsed > 0 else 0.0
+        }
+
+
+def print_latency_table(summaries: List[Dict[str, Any]], title: str, sort_key: str = "p99_ms"):
+    """Print latency summaries as an aligned console table"""
+    print("=" * 80)
+    print(f"📊 {title}")
+    print("=" * 80)
+    if not summaries:
+        print("No requests recorded")
+        print("=" * 80)
+        return
+
+    rows = sorted(summaries, key=lambda s: s.get(sort_key, 0), reverse=True)
+    width = max(len(str(s["key"])) for s in rows)
+    width = min(max(width, 10), 48)
+    print(f"{'Route':<{width}}  {'count':>6}  {'err%':>5}  {'rps':>7}  {'p50':>8}  {'p95':>8}  {'p99':>8}  {'bytes':>8}")
+    print("-" * 80)
+    for s in rows:
+        key = str(s["key"])
+        if len(key) > width:
+            key = key[:width - 1] + "…"
+        print(f"{key:<{width}}  {s['count']:>6}  {s['error_rate'] * 100:>5.1f}  {s['throughput_rps']:>7.1f}  "
+              f"{s['p50_ms']:>7.1f}ms  {s['p95_ms']:>7.1f}ms  {s['p99_ms']:>7.1f}ms  {int(s['mean_bytes']):>8}")
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise FERDI latency snapshot files")
+    parser.add_argument("command", choices=("merge", "windows"))
+    parser.add_argument("paths", nargs="+", help="JSON-lines snapshot files")
+    args = parser.parse_args()
+
+    if args.command == "merge":
+        recorder = merge_snapshots(*args.paths)
+        print_latency_table(recorder.summaries(), f"MERGED SNAPSHOTS ({len(args.paths)} files)")
+        return True
+
+    print(f"{'window start':<20}  {'requests':>9}  {'rps':>8}  {'p50':>9}  {'p99':>9}  {'errors':>7}")
+    print("-" * 80)
+    for window in load_snapshots(*args.paths):
+        rows = window_summaries(window)
+        latency = DDSketch()
+        for data in window['keys'].values():
+            latency.merge(DDSketch.from_dict(data['latency']))
+        elapsed = max(window['window_end'] - window['window_start'], 1e-9)
+        started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(window['window_start']))
+        print(f"{started:<20}  {latency.count:>9}  {latency.count / elapsed:>8.1f}  {latency.quantile(0.5):>7.1f}ms  "
+              f"{latency.quantile(0.99):>7.1f}ms  {sum(r['errors'] for r in rows):>7}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+FERDI Test Time Budgets
+Gives every test a time budget derived from how long it took in earlier runs,
+and the whole run a deadline.
+
+- TimingHistory keeps one quantile sketch of durations per test
+  ("tester::test_method") in .ferdi_cache/test_timings.json.
+- A test's budget is its historical p99 times a safety factor plus some
+  slack, never less than a floor, and never more than what is left of the
+  suite deadline. Tests without history get the default budget.
+- While a test runs, ferdi_http.request_deadline caps every request to the
+  time left in its budget. A test that runs out is cancelled at its next
+  request with BudgetExceeded - Python threads cannot be killed, so a test
+  stuck outside the HTTP layer is only reported, not interrupted.
+- Tests reached after the suite deadline are skipped with a logged reason.
+
+Usage:
+    python ferdi_test_runner.py --deadline 300
+    python ferdi_test_runner.py api enum --deadline 60 --budget-factor 3
+"""
+
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ferdi_http import BudgetExceeded, request_deadline
+from ferdi_sketch import DDSketch
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+TIMINGS_PATH = os.path.join(ROOT_DIR, '.ferdi_cache', 'test_timings.json')
+
+BUDGET_CONFIG = {
+    'factor': 2.0,            # budget = p99 * factor + slack
+    'slack_seconds': 0.5,
+    'min_budget': 2.0,
+    'default_budget': 30.0,   # tests with no history yet
+    'min_samples': 3          # runs needed before the p99 is trusted
+}
+
+
+def budget_key(tester: str, test: str) -> str:
+    return f"{tester}::{test}"
+
+
+class TimingHistory:
+    """Per-test duration sketches persisted between runs"""
+
+    def __init__(self, path: str = TIMINGS_PATH):
+        self.path = path
+        self.sketches: Dict[str, DDSketch] = {}
+
+    def load(self) -> 'TimingHistory':
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.sketches = {key: DDSketch.from_dict(value) for key, value in data.items()}
+        except (OSError, ValueError, KeyError):
+            self.sketches = {}
+        return self
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({key: sketch.to_dict() for key, sketch in sorted(self.sketches.items())}, f)
+        os.replace(temporary, self.path)
+
+    def record(self, key: str, duration: float):
+        self.sketches.setdefault(key, DDSketch()).add(duration)
+
+    def p99(self, key: str) -> Optional[float]:
+        sketch = self.sketches.get(key)
+        if sketch is None or sketch.count < BUDGET_CONFIG['min_samples']:
+            return None
+        return sketch.quantile(0.99)
+
+
+class BudgetPlanner:
+    """Hands out per-test budgets inside a suite deadline and keeps the ledger of how they were used"""
+
+    def __init__(self, history: TimingHistory, deadline_seconds: Optional[float] = None,
+                 factor: float = BUDGET_CONFIG['factor']):
+        self.history = history
+        self.factor = factor
+        self.started = time.monotonic()
+        self.deadline = self.started + deadline_seconds if deadline_seconds is not None else None
+        self.ledger: List[Dict[str, Any]] = []
+
+    def remaining(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def budget_for(self, key: str) -> Dict[str, Any]:
+        p99 = self.history.p99(key)
+        if p99 is None:
+            budget, source = BUDGET_CONFIG['default_budget'], 'default'
+        else:
+            budget = max(BUDGET_CONFIG['min_budget'], p99 * self.factor + BUDGET_CONFIG['slack_seconds'])
+            source = 'p99'
+        remaining = self.remaining()
+        if remaining is not None and remaining < budget:
+            budget, source = remaining, 'deadline'
+        return {'budget': budget, 'p99': p99, 'source': source}
+
+    def run(self, tester: str, test: str, method: Callable, *args, **kwargs):
+        """Call one test method inside its budget and add it to the ledger"""
+        key = budget_key(tester, test)
+        if self.expired():
+            self.ledger.append({'key': key, 'status': 'skipped', 'duration': 0.0, 'budget': 0.0, 'p99': None})
+            raise BudgetExceeded(f"suite deadline reached - {test} not started")
+
+        plan = self.budget_for(key)
+        status = 'ok'
+        started = time.perf_counter()
+        try:
+            with request_deadline(plan['budget'], label=f"{test} budget ({plan['budget']:.1f}s)"):
+                return method(*args, **kwargs)
+        except BudgetExceeded:
+            status = 'cancelled'
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            if status == 'ok' and duration > plan['budget']:
+                status = 'over'
+            self.ledger.append({'key': key, 'status': status, 'duration': duration,
+                                'budget': plan['budget'], 'p99': plan['p99'], 'source': plan['source']})
+            if status == 'ok':
+                # Cancelled runs would drag the history down to the budget they were cut at
+                self.history.record(key, duration)
+
+
+def instrument(tester: Any, name: str, planner: BudgetPlanner) -> List[str]:
+    """Shadow each test_* method of a tester instance with a budgeted wrapper; returns the wrapped names"""
+    wrapped = []
+    for attribute in dir(type(tester)):
+        if not attribute.startswith('test_') or not callable(getattr(tester, attribute, None)):
+            continue
+        method = getattr(tester, attribute)
+
+        def budgeted(*args, _method=method, _test=attribute, **kwargs):
+            try:
+                return planner.run(name, _test, _method, *args, **kwargs)
+            except BudgetExceeded as e:
+                # Keep the tester's own flow going, with the cancellation recorded as a result
+                skipped = planner.ledger[-1]['status'] == 'skipped'
+                tester.log_test(_test, False, f"{'Skipped' if skipped else 'Cancelled'} - {str(e)}")
+                if skipped and tester.test_results:
+                    tester.test_results[-1]['skipped'] = True
+                return False
+
+        setattr(tester, attribute, budgeted)
+        wrapped.append(attribute)
+    return wrapped
+
+
+def print_budget_report(planner: BudgetPlanner, top: int = 10):
+    """Tests that used the most of their budget, with the suite deadline status"""
+    if not planner.ledger:
+        return
+    print("=" * 80)
+    print("⏳ TIME BUDGETS - tests by share of budget consumed")
+    print("=" * 80)
+    print(f"{'Test':<52}  {'took':>7}  {'budget':>7}  {'used':>6}  status")
+    print("-" * 80)
+    ranked = sorted(planner.ledger, key=lambda e: e['duration'] / e['budget'] if e['budget'] else 0.0, reverse=True)
+    for entry in ranked[:top]:
+        key = entry['key'] if len(entry['key']) <= 52 else entry['key'][:51] + "…"
+        used = f"{entry['duration'] / entry['budget'] * 100:.0f}%" if entry['budget'] else '-'
+        icon = {'ok': '✅', 'over': '⚠️ ', 'cancelled': '❌', 'skipped': '⏭️ '}[entry['status']]
+        print(f"{key:<52}  {entry['duration']:>6.2f}s  {entry['budget']:>6.1f}s  {used:>6}  {icon} {entry['status']}")
+    print("-" * 80)
+    counts = {status: sum(1 for e in planner.ledger if e['status'] == status)
+              for status in ('ok', 'over', 'cancelled', 'skipped')}
+    total = sum(e['duration'] for e in planner.ledger)
+    print(f"{len(planner.ledger)} budgeted tests, {total:.2f}s in tests - {counts['cancelled']} cancelled, "
+          f"{counts['over']} over budget, {counts['skipped']} skipped")
+    if planner.deadline is not None:
+        elapsed = time.monotonic() - planner.started
+        state = "reached" if planner.expired() else f"{planner.remaining():.1f}s to spare"
+        print(f"Suite deadline {planner.deadline - planner.started:.1f}s: {elapsed:.1f}s used, {state}")
+    print("=" * 80)
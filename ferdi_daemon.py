@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+FERDI Warm Runner Daemon
+Long-lived local process that keeps the tester instances (and with them their
+pooled HTTP connections), cached access tokens and the frontend source index
+warm between runs. A thin client submits runs over a Unix socket and streams
+the console output back, so repeated edit-and-check cycles skip interpreter
+startup, imports, TCP/TLS setup and the login round trip.
+
+Tester modules are reloaded automatically when their source file changes.
+
+Usage:
+    python ferdi_daemon.py serve                # run the daemon in the foreground
+    python ferdi_daemon.py run api enum         # submit a run (starts the daemon if needed)
+    python ferdi_daemon.py status
+    python ferdi_daemon.py stop
+"""
+
+# The client path only needs the standard library; the daemon imports the
+# testers lazily so submitting a run stays cheap.
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+SOCKET_PATH = os.getenv('FERDI_DAEMON_SOCKET', f"/tmp/ferdi-harness-{os.getuid()}.sock")
+SPAWN_TIMEOUT = 15
+
+
+class _StreamWriter:
+    """File-like object forwarding complete output lines to the client socket"""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+        self.buffer = ''
+        self.broken = False
+
+    def write(self, text: str) -> int:
+        self.buffer += text
+        if '\n' in self.buffer:
+            lines, self.buffer = self.buffer.rsplit('\n', 1)
+            self._send(lines + '\n')
+        return len(text)
+
+    def flush(self):
+        if self.buffer:
+            self._send(self.buffer)
+            self.buffer = ''
+
+    def _send(self, text: str):
+        if self.broken:
+            return
+        try:
+            _send_message(self.wfile, {'type': 'output', 'text': text})
+        except OSError:
+            self.broken = True  # Client went away - finish the run silently
+
+
+def _send_message(wfile, message: Dict[str, Any]):
+    wfile.write((json.dumps(message, default=str) + '\n').encode('utf-8'))
+    wfile.flush()
+
+
+class WarmRunner:
+    """Tester instances kept alive across runs, rebuilt when their module changes"""
+
+    def __init__(self):
+        self.testers: Dict[str, Any] = {}
+        self.module_mtimes: Dict[str, float] = {}
+        self.run_lock = threading.Lock()
+        self.started = time.time()
+        self.runs = 0
+
+    def _module_mtime(self, module) -> float:
+        try:
+            return os.stat(module.__file__).st_mtime
+        except (OSError, TypeError):
+            return 0.0
+
+    def get_tester(self, name: str):
+        """Return the warm tester instance, reloading its module if the file changed"""
+        from ferdi_test_runner import TESTERS
+
+        module_name, class_name = TESTERS[name]
+        module = importlib.import_module(module_name)
+        mtime = self._module_mtime(module)
+        if name in self.testers and self.module_mtimes.get(name) != mtime:
+            print(f"🔄 {module_name}.py changed - reloading")
+            module = importlib.reload(module)
+            self.testers.pop(name)
+        if name not in self.testers:
+            self.testers[name] = getattr(module, class_name)()
+            self.module_mtimes[name] = mtime
+        return self.testers[name], module
+
+    def prepare_tester(self, name: str, delay: float = 0.0):
+        """Warm tester with its results cleared and the inter-test pause set"""
+        tester, module = self.get_tester(name)
+        tester.test_results = []
+        if hasattr(module, 'TEST_DELAY'):
+            module.TEST_DELAY = delay
+        return tester
+
+    def run(self, testers: List[str], delay: float) -> List[Dict[str, Any]]:
+        from ferdi_test_runner import TESTERS, print_run_summary, run_tester
+
+        reports = []
+        for name in testers or list(TESTERS):
+            reports.append(run_tester(name, self.prepare_tester(name, delay)))
+        print_run_summary(reports)
+        self.runs += 1
+        return reports
+
+    def status(self) -> Dict[str, Any]:
+        from ferdi_auth import TOKEN_CACHE
+        from ferdi_sources import SOURCE_INDEX
+
+        return {
+            'pid': os.getpid(),
+            'socket': SOCKET_PATH,
+            'uptime_seconds': time.time() - self.started,
+            'runs': self.runs,
+            'busy': self.run_lock.locked(),
+            'warm_testers': sorted(self.testers),
+            'cached_tokens': len(TOKEN_CACHE),
+            'source_index': SOURCE_INDEX.stats()
+        }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return  # Readiness probe from spawn_daemon
+        try:
+            request = json.loads(line.decode('utf-8'))
+        except ValueError:
+            _send_message(self.wfile, {'type': 'error', 'message': 'Invalid request'})
+            return
+
+        runner: WarmRunner = self.server.runner
+        command = request.get('command')
+
+        if command == 'status':
+            _send_message(self.wfile, {'type': 'result', 'status': runner.status()})
+        elif command == 'stop':
+            _send_message(self.wfile, {'type': 'result', 'stopped': True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif command == 'run':
+            self._run(runner, request)
+        else:
+            _send_message(self.wfile, {'type': 'error', 'message': f"Unknown command: {command}"})
+
+    def _run(self, runner: 'WarmRunner', request: Dict[str, Any]):
+        from ferdi_test_runner import TESTERS
+
+        unknown = [name for name in request.get('testers', []) if name not in TESTERS]
+        if unknown:
+            _send_message(self.wfile, {'type': 'error', 'message': f"Unknown testers: {', '.join(unknown)}"})
+            return
+
+        writer = _StreamWriter(self.wfile)
+        started = time.perf_counter()
+        # Runs are serialised: stdout is process-wide while a run is redirected
+        with runner.run_lock:
+            with contextlib.redirect_stdout(writer):
+                try:
+                    reports = runner.run(request.get('testers', []), float(request.get('delay', 0.0)))
+                except Exception as e:
+                    print(f"❌ FAIL daemon: Run failed: {str(e)}")
+                    reports = []
+            writer.flush()
+
+        results = [r for report in reports for r in report['results']]
+        try:
+            _send_message(self.wfile, {
+                'type': 'result',
+                'success': bool(results) and all(r.get('success') for r in results),
+                'duration': time.perf_counter() - started,
+                'reports': reports
+            })
+        except OSError:
+            pass
+
+
+class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, runner: WarmRunner):
+        self.runner = runner
+        super().__init__(socket_path, _RequestHandler)
+
+
+def _connect(socket_path: str = SOCKET_PATH) -> Optional[socket.socket]:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        return sock
+    except OSError:
+        sock.close()
+        return None
+
+
+def serve(socket_path: str = SOCKET_PATH) -> bool:
+    """Run the daemon in the foreground until it is stopped"""
+    if os.path.exists(socket_path):
+        existing = _connect(socket_path)
+        if existing:
+            existing.close()
+            print(f"⚠️  A FERDI daemon is already listening on {socket_path}")
+            return False
+        os.unlink(socket_path)  # Stale socket from a daemon that died
+
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+
+    # Warm the imports before accepting the first run
+    runner = WarmRunner()
+    import ferdi_test_runner  # noqa: F401
+
+    server = _DaemonServer(socket_path, runner)
+    print(f"🔥 FERDI daemon listening on {socket_path} (pid {os.getpid()})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(OSError):
+            os.unlink(socket_path)
+    print("👋 FERDI daemon stopped")
+    return True
+
+
+def spawn_daemon(socket_path: str = SOCKET_PATH, timeout: float = SPAWN_TIMEOUT) -> bool:
+    """Start the daemon in the background and wait until it accepts connections"""
+    log_path = os.path.join(ROOT_DIR, '.ferdi_cache', 'daemon.log')
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    with open(log_path, 'ab') as log:
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--socket', socket_path, 'serve'],
+            stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+            cwd=ROOT_DIR, start_new_session=True
+        )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        sock = _connect(socket_path)
+        if sock:
+            sock.close()
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def request_daemon(message: Dict[str, Any], socket_path: str = SOCKET_PATH,
+                   spawn: bool = False) -> Optional[Dict[str, Any]]:
+    """Send one request, echo streamed output and return the final message"""
+    sock = _connect(socket_path)
+    if sock is None and spawn:
+        print("🚀 Starting FERDI daemon...", file=sys.stderr)
+        if spawn_daemon(socket_path):
+            sock = _connect(socket_path)
+    if sock is None:
+        return None
+
+    with sock, sock.makefile('rwb') as stream:
+        stream.write((json.dumps(message) + '\n').encode('utf-8'))
+        stream.flush()
+        for line in stream:
+            reply = json.loads(line.decode('utf-8'))
+            if reply['type'] == 'output':
+                sys.stdout.write(reply['text'])
+                sys.stdout.flush()
+            else:
+                return reply
+    return None
+
+
+def main(argv: Optional[List[str]] = None) -> bool:
+    parser = argparse.ArgumentParser(description="Warm FERDI test runner daemon")
+    parser.add_argument("--socket", default=SOCKET_PATH, help="Unix socket path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("serve", help="run the daemon in the foreground")
+    run_parser = subparsers.add_parser("run", help="run testers in the daemon")
+    run_parser.add_argument("testers", nargs="*", metavar="TESTER", help="testers to run (default: all)")
+    run_parser.add_argument("--delay", type=float, default=0.0, help="pause between tests in seconds")
+    run_parser.add_argument("--no-spawn", action="store_true", help="fail instead of starting the daemon")
+    subparsers.add_parser("status", help="show the daemon state")
+    subparsers.add_parser("stop", help="stop the daemon")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        return serve(args.socket)
+
+    started = time.perf_counter()
+    if args.command == "run":
+        reply = request_daemon({'command': 'run', 'testers': args.testers, 'delay': args.delay},
+                               args.socket, spawn=not args.no_spawn)
+    else:
+        reply = request_daemon({'command': args.command}, args.socket)
+
+    if reply is None:
+        print(f"❌ No FERDI daemon listening on {args.socket}")
+        return False
+    if reply['type'] == 'error':
+        print(f"❌ {reply['message']}")
+        return False
+
+    if args.command == "status":
+        print(json.dumps(reply['status'], indent=2))
+    elif args.command == "stop":
+        print("👋 FERDI daemon stopping")
+    else:
+        print(f"⚡ Daemon run finished in {time.perf_counter() - started:.2f}s "
+              f"(tests {reply['duration']:.2f}s)")
+        return reply['success']
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
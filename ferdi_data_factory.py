@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+FERDI Test Data Factories - Tenant-Isolated Identities
+Every run (and every worker inside a run) gets its own tenant namespace, and
+everything a test creates is generated inside it:
+- emails tagged with the tenant in the local part
+- Luhn-valid SIRETs under a SIREN derived from the tenant
+- company codes in the backend's XXX-00000-XXX format with a tenant prefix
+- license plates, mobile numbers and company names
+- complete request bodies for companies, users, invitations, vehicles,
+  maintenance records and missions
+
+Two namespaces never hand out the same value, so any number of runs can
+write to one backend at the same time. The mock accounts the testers log in
+with (manager@transport-bretagne.fr and friends) are seeded data and stay fixed.
+
+The tenant id is built from FERDI_RUN_ID (shared by the shards of one CI run,
+random otherwise) and FERDI_WORKER (the process id otherwise). FERDI_TENANT
+pins the whole id, e.g. to reproduce a run.
+
+Usage:
+    from ferdi_data_factory import current_namespace
+    tenant = current_namespace()
+    payload = tenant.company_registration()
+    email = tenant.email('pierre.bernard')
+"""
+
+import hashlib
+import itertools
+import os
+import re
+import threading
+import uuid
+from typing import Any, Dict, Optional
+
+EMAIL_DOMAIN = os.getenv('FERDI_TEST_EMAIL_DOMAIN', 'example.com')
+
+# Same rule as mockHelpers.isValidCompanyCodeFormat in lib/mock-data.js
+COMPANY_CODE_PATTERN = re.compile(r'^[A-Z]{3}-\d{5}-[A-Z0-9]{3}$')
+
+BASE36 = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def luhn_check_digit(digits: str) -> str:
+    """Check digit that makes digits + check pass the Luhn test (SIREN/SIRET rule)"""
+    total = 0
+    for index, char in enumerate(reversed(digits)):
+        value = int(char)
+        if index % 2 == 0:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return str((10 - total % 10) % 10)
+
+
+def is_valid_siret(siret: str) -> bool:
+    return len(siret) == 14 and siret.isdigit() and luhn_check_digit(siret[:-1]) == siret[-1]
+
+
+def _digest(text: str) -> int:
+    return int.from_bytes(hashlib.sha256(text.encode('utf-8')).digest()[:8], 'big')
+
+
+def _base36(value: int, width: int) -> str:
+    chars = []
+    for _ in range(width):
+        value, remainder = divmod(value, 36)
+        chars.append(BASE36[remainder])
+    return ''.join(reversed(chars))
+
+
+class TenantNamespace:
+    """Unique identities for one run or worker"""
+
+    def __init__(self, tenant: Optional[str] = None):
+        self.tenant = (tenant or uuid.uuid4().hex[:10]).lower()
+        if not re.fullmatch(r'[a-z0-9-]{1,32}', self.tenant):
+            raise ValueError(f"Tenant id '{self.tenant}' must be 1-32 lowercase letters, digits or dashes")
+        seed = self._seed = _digest(self.tenant)
+        self.siren = self._siren(0)
+        letters = ''.join(chr(ord('A') + (seed >> (5 * i)) % 26) for i in range(3))
+        self.code_prefix = f"{letters}-{(seed >> 16) % 10 ** 5:05d}"
+        self.mobile_prefix = f"0{6 + seed % 2}{(seed >> 24) % 10 ** 4:04d}"
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def next_index(self) -> int:
+        with self._lock:
+            return next(self._counter)
+
+    def email(self, local: str = 'user', domain: str = EMAIL_DOMAIN) -> str:
+        return f"{local}.{self.tenant}.{self.next_index()}@{domain}"
+
+    def owns_email(self, email: str) -> bool:
+        """Was this email handed out by this namespace?"""
+        local = email.split('@', 1)[0]
+        return re.search(rf'\.{re.escape(self.tenant)}\.\d+$', local) is not None
+
+    def _siren(self, block: int) -> str:
+        # 8 tenant digits + check digit; a new SIREN every 10,000 establishments
+        base = f"{(self._seed + block * 7919) % 10 ** 8:08d}"
+        return base + luhn_check_digit(base)
+
+    def siret(self) -> str:
+        block, nic = divmod(self.next_index(), 10 ** 4)
+        base = self._siren(block) + f"{nic:04d}"
+        return base + luhn_check_digit(base)
+
+    def company_code(self) -> str:
+        return f"{self.code_prefix}-{_base36(self.next_index(), 3)}"
+
+    def mobile(self) -> str:
+        return f"{self.mobile_prefix}{self.next_index() % 10 ** 4:04d}"
+
+    def name(self, label: str) -> str:
+        return f"{label} {self.tenant}-{self.next_index()}"
+
+    def company(self, **overrides) -> Dict[str, Any]:
+        company = {
+            "name": self.name("Transport Test"),
+            "siret": self.siret(),
+            "address": "15 Rue de la Gare",
+            "city": "Quimper",
+            "postal_code": "29000",
+            "country": "France",
+            "phone": "0298554433",
+            "email": self.email('contact')
+        }
+        company.update(overrides)
+        return company
+
+    def company_registration(self, **overrides) -> Dict[str, Any]:
+        """POST /companies/register body: a new company and its manager"""
+        registration = {
+            "company": self.company(),
+            "manager_email": self.email('manager'),
+            "manager_password": "SecurePass123!",
+            "manager_first_name": "Jean",
+            "manager_last_name": "Test",
+            "manager_mobile": self.mobile()
+        }
+        registration.update(overrides)
+        return registration
+
+    def user(self, role: str = 'DRIVER', **overrides) -> Dict[str, Any]:
+        """POST /users/ body for a new user of the given role"""
+        user = {
+            "first_name": "Test",
+            "last_name": self.name("Utilisateur"),
+            "email": self.email(role.lower()),
+            "mobile": self.mobile(),
+            "role": role,
+            "password": "TempPass123!"
+        }
+        user.update(overrides)
+        return user
+
+    def invitation(self, role: str = 'DRIVER', **overrides) -> Dict[str, Any]:
+        """POST /invitations/ body"""
+        invitation = {
+            "email": self.email(f"invite.{role.lower()}"),
+            "role": role,
+            "first_name": "Test",
+            "last_name": self.name("Invitation"),
+            "mobile": self.mobile(),
+            "personal_message": "Bienvenue dans l'équipe FERDI!"
+        }
+        invitation.update(overrides)
+        return invitation
+
+    def license_plate(self) -> str:
+        """SIV-format plate (AA-123-AA), unique within the namespace"""
+        index = self.next_index()
+        # First two letters from the tenant, the rest counts up every 1000 plates
+        value = (self._seed % 26 ** 2) * 26 ** 2 + index // 1000
+        letters = ''.join(chr(ord('A') + value // 26 ** power % 26) for power in (3, 2, 1, 0))
+        return f"{letters[:2]}-{index % 1000:03d}-{letters[2:]}"
+
+    def vehicle(self, **overrides) -> Dict[str, Any]:
+        """POST /vehicles/ body"""
+        vehicle = {
+            "license_plate": self.license_plate(),
+            "brand": "Mercedes",
+            "model": "Travego",
+            "vehicle_type": "autocar",
+            "capacity": 55,
+            "year": 2020,
+            "color": "Blanc",
+            "fuel_type": "diesel",
+            "insurance_expiry": "2027-12-31T00:00:00Z",
+            "technical_control_expiry": "2027-06-30T00:00:00Z"
+        }
+        vehicle.update(overrides)
+        return vehicle
+
+    def maintenance_record(self, sequence: int, **overrides) -> Dict[str, Any]:
+        """POST /vehicles/{id}/maintenance body; sequence spaces the records a month apart"""
+        year, month = divmod(sequence, 12)
+        record = {
+            "date": f"{2010 + year:04d}-{month + 1:02d}-15T09:00:00Z",
+            "type": "Révision complète" if sequence % 4 == 0 else "Vidange",
+            "description": f"Entretien {self.tenant}-{sequence}",
+            "cost": 180.0 + (sequence % 7) * 95.0,
+            "mileage": 15000 * (sequence + 1),
+            "next_maintenance_mileage": 15000 * (sequence + 2)
+        }
+        record.update(overrides)
+        return record
+
+    def mission(self, departure: str = "2026-03-02T07:30:00Z", arrival: str = "2026-03-02T12:00:00Z",
+                **overrides) -> Dict[str, Any]:
+        """POST /missions/ body"""
+        mission = {
+            "title": self.name("Transport scolaire Quimper - Rennes"),
+            "departure_location": "Quimper, Place de la Résistance",
+            "destination": "Rennes, Gare SNCF",
+            "departure_date": departure,
+            "return_date": arrival,
+            "passenger_count": 45,
+            "client_name": self.name("Lycée"),
+            "client_phone": "02 98 12 34 56",
+            "client_email": self.email('client'),
+            "special_instructions": "Mission de test",
+            "estimated_cost": 850.0
+        }
+        mission.update(overrides)
+        return mission
+
+    def __repr__(self):
+        return f"TenantNamespace({self.tenant!r})"
+
+
+_namespace: Optional[TenantNamespace] = None
+_namespace_lock = threading.Lock()
+
+
+def worker_tenant_id() -> str:
+    """Tenant id for this process: FERDI_TENANT, or FERDI_RUN_ID + worker"""
+    if os.getenv('FERDI_TENANT'):
+        return os.environ['FERDI_TENANT']
+    run_id = os.getenv('FERDI_RUN_ID') or uuid.uuid4().hex[:6]
+    worker = os.getenv('FERDI_WORKER') or str(os.getpid())
+    return f"{run_id}-w{worker}".lower()
+
+
+def current_namespace() -> TenantNamespace:
+    """The namespace shared by every tester in this process"""
+    global _namespace
+    with _namespace_lock:
+        if _namespace is None:
+            _namespace = TenantNamespace(worker_tenant_id())
+        return _namespace
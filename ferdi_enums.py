@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+FERDI Enum Tables - Bulk Enum Conformance Validation
+Parses the enums exported by lib/constants/enums.js into precomputed lookup
+tables (cached on disk by file hash) and validates whole columns of
+role/status/plan values across user, company and invitation records in one pass.
+
+Usage:
+    python ferdi_enums.py tables
+    python ferdi_enums.py validate records.json --type user
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+ENUMS_PATH = os.path.join(ROOT_DIR, 'lib', 'constants', 'enums.js')
+CACHE_DIR = os.getenv('FERDI_CACHE_DIR', os.path.join(ROOT_DIR, '.ferdi_cache'))
+
+# Enum-typed fields per record type
+RECORD_ENUM_FIELDS = {
+    'user': {'role': 'UserRole', 'status': 'UserStatus'},
+    'company': {'status': 'CompanyStatus', 'subscription_plan': 'SubscriptionPlan'},
+    'invitation': {'role': 'UserRole'}
+}
+
+# Numeric codes used before the enum migration (see API_ROUTES_SPECIFICATION.md)
+LEGACY_NUMERIC_VALUES = {
+    'UserRole': {'1', '2', '3', '4', '5', '6'},
+    'UserStatus': {'1', '2'},
+    'SubscriptionPlan': {'1', '2', '3', '4'}
+}
+
+_ENUM_OBJECT_RE = re.compile(r'export const (\w+)\s*=\s*\{([^{}]*)\}')
+_ENUM_MEMBER_RE = re.compile(r'^\s*(\w+)\s*:\s*([\'"])(.*?)\2\s*,?\s*$')
+
+_tables_cache: Dict[str, 'EnumTables'] = {}
+
+
+class EnumTables:
+    """Precomputed lookup tables for the frontend enums"""
+
+    def __init__(self, enums: Dict[str, Dict[str, str]], source_hash: str):
+        self.enums = enums
+        self.source_hash = source_hash
+        self.values = {name: frozenset(members.values()) for name, members in enums.items()}
+        self.upper_values = {
+            name: {value.upper(): value for value in values} for name, values in self.values.items()
+        }
+
+    def as_expected_enums(self) -> Dict[str, Dict[str, str]]:
+        """Same shape as the EXPECTED_ENUMS dictionaries used by the testers"""
+        return {name: dict(members) for name, members in self.enums.items()}
+
+    def allowed(self, enum_name: str) -> frozenset:
+        return self.values[enum_name]
+
+
+def parse_enums_source(source: str) -> Dict[str, Dict[str, str]]:
+    """Extract flat `export const Name = { KEY: 'VALUE' }` objects from enums.js"""
+    enums = {}
+    for match in _ENUM_OBJECT_RE.finditer(source):
+        members = {}
+        flat = True
+        for line in match.group(2).splitlines():
+            stripped = line.strip()
+            if not stripped or stripped.startswith('//'):
+                continue
+            member = _ENUM_MEMBER_RE.match(line)
+            if not member:
+                flat = False
+                break
+            members[member.group(1)] = member.group(3)
+        if flat and members:
+            enums[match.group(1)] = members
+    return enums
+
+
+def load_enum_tables(enums_path: str = ENUMS_PATH) -> EnumTables:
+    """Return lookup tables for enums.js, reusing cached tables while its hash is unchanged"""
+    with open(enums_path, 'rb') as f:
+        content = f.read()
+    source_hash = hashlib.sha256(content).hexdigest()
+
+    if source_hash in _tables_cache:
+        return _tables_cache[source_hash]
+
+    cache_file = os.path.join(CACHE_DIR, f"enums-{source_hash[:16]}.json")
+    enums = None
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('source_hash') == source_hash:
+            enums = cached['enums']
+    except (OSError, ValueError, KeyError):
+        enums = None
+
+    if enums is None:
+        enums = parse_enums_source(content.decode('utf-8'))
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'source_hash': source_hash, 'enums': enums}, f, indent=2)
+        except OSError:
+            pass  # Read-only checkout - keep the in-memory tables only
+
+    tables = EnumTables(enums, source_hash)
+    _tables_cache[source_hash] = tables
+    return tables
+
+
+def _column(records: List[Any], field: str) -> List[Any]:
+    """Extract one field for every record, keeping values hashable"""
+    column = [record.get(field) if isinstance(record, dict) else None for record in records]
+    try:
+        set(column)
+    except TypeError:
+        column = [json.dumps(v, sort_keys=True) if isinstance(v, (dict, list)) else v for v in column]
+    return column
+
+
+def validate_records(records: Iterable[Any], record_type: str = 'user',
+                     field_map: Optional[Dict[str, str]] = None,
+                     tables: Optional[EnumTables] = None) -> Dict[str, Any]:
+    """Check every enum-typed column of a batch of records in one pass per column.
+
+    Distinct values are compared against the lookup tables with a single set
+    difference, so the per-row work is limited to extracting the column and,
+    only when something is wrong, locating the offending rows.
+    """
+    records = list(records)
+    tables = tables or load_enum_tables()
+    field_map = field_map or RECORD_ENUM_FIELDS[record_type]
+
+    report = {
+        'record_type': record_type,
+        'records': len(records),
+        'conforming': True,
+        'fields': {},
+        'invalid_rows': []
+    }
+
+    for field, enum_name in field_map.items():
+        allowed = tables.allowed(enum_name)
+        column = _column(records, field)
+        bad_values = set(column) - allowed
+
+        field_report = {
+            'enum': enum_name,
+            'checked': len(column),
+            'invalid': 0,
+            'invalid_values': {},
+            'legacy_numeric': {},
+            'case_mismatch': {}
+        }
+
+        if bad_values:
+            report['conforming'] = False
+            counts = Counter(value for value in column if value in bad_values)
+            legacy = LEGACY_NUMERIC_VALUES.get(enum_name, set())
+            upper = tables.upper_values[enum_name]
+
+            field_report['invalid'] = sum(counts.values())
+            field_report['invalid_values'] = {str(value): count for value, count in counts.items()}
+            field_report['legacy_numeric'] = {
+                str(value): count for value, count in counts.items() if str(value) in legacy
+            }
+            field_report['case_mismatch'] = {
+                str(value): count for value, count in counts.items()
+                if isinstance(value, str) and value.upper() in upper
+            }
+
+            for row, value in enumerate(column):
+                if value in bad_values:
+                    record = records[row]
+                    report['invalid_rows'].append({
+                        'row': row,
+                        'id': record.get('id') if isinstance(record, dict) else None,
+                        'field': field,
+                        'value': value
+                    })
+
+        report['fields'][field] = field_report
+
+    return report
+
+
+def print_validation_report(report: Dict[str, Any], max_rows: int = 20):
+    """Print a bulk conformance report"""
+    status = "✅ CONFORMING" if report['conforming'] else "❌ NON-CONFORMING"
+    print(f"{status} {report['records']} {report['record_type']} records")
+    for field, field_report in report['fields'].items():
+        print(f"    {field} ({field_report['enum']}): {field_report['invalid']}/{field_report['checked']} invalid")
+        if field_report['invalid_values']:
+            print(f"      values: {field_report['invalid_values']}")
+        if field_report['legacy_numeric']:
+            print(f"      legacy numeric: {field_report['legacy_numeric']}")
+        if field_report['case_mismatch']:
+            print(f"      case mismatch: {field_report['case_mismatch']}")
+    rows = report['invalid_rows']
+    for row in rows[:max_rows]:
+        print(f"      row {row['row']} (id={row['id']}): {row['field']}={row['value']!r}")
+    if len(rows) > max_rows:
+        print(f"      … {len(rows) - max_rows} more non-conforming rows")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FERDI enum lookup tables and bulk record validation")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("tables", help="print the enum tables parsed from lib/constants/enums.js")
+    validate_parser = subparsers.add_parser("validate", help="validate a JSON export of records")
+    validate_parser.add_argument("records", help="JSON file with a list of records or a {'data': [...]} page")
+    validate_parser.add_argument("--type", choices=sorted(RECORD_ENUM_FIELDS), default="user")
+    args = parser.parse_args()
+
+    tables = load_enum_tables()
+    if args.command == "tables":
+        print(json.dumps({'source_hash': tables.source_hash, 'enums': tables.enums}, indent=2))
+        return True
+
+    with open(args.records, 'r', encoding='utf-8') as f:
+        payload = json.load(f)
+    records = payload.get('data', []) if isinstance(payload, dict) else payload
+    report = validate_records(records, args.type, tables=tables)
+    print_validation_report(report)
+    return report['conforming']
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+FERDI Structured Event Log
+Test results as JSON lines, written by a background thread in batches so a
+tester never waits on stdout or the disk. While an event log is active the
+testers' log_test stops printing each result; the console only shows a
+rate-limited live summary line instead.
+
+Verbosity levels decide what reaches the log:
+    error   failed tests only
+    info    every result, without details
+    debug   every result with its details (response bodies included)
+
+Activate it with the test runner (--event-log PATH) or for any script with
+FERDI_EVENT_LOG=PATH (and FERDI_EVENT_LOG_LEVEL). PATH may be a regular
+file, a named pipe, or '-' for stdout.
+
+Usage:
+    python ferdi_test_runner.py api --event-log .ferdi_cache/events.jsonl --log-level debug
+    FERDI_EVENT_LOG=/tmp/ferdi.fifo python invitation_backend_test.py
+"""
+
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, TextIO
+
+LEVELS = {'error': 40, 'info': 20, 'debug': 10}
+DEFAULT_LEVEL = 'info'
+
+EVENT_LOG_CONFIG = {
+    'batch_size': 512,
+    'flush_interval': 0.2,     # seconds a batch may wait before it is written
+    'console_interval': 1.0,   # seconds between live summary lines
+    'max_queue': 100000        # events beyond this are dropped and counted, never blocked on
+}
+
+
+class EventLog:
+    """Non-blocking JSON-lines event sink with a background batch writer"""
+
+    def __init__(self, path: str, level: str = DEFAULT_LEVEL, console: Optional[TextIO] = sys.stdout,
+                 batch_size: int = EVENT_LOG_CONFIG['batch_size'],
+                 flush_interval: float = EVENT_LOG_CONFIG['flush_interval'],
+                 console_interval: float = EVENT_LOG_CONFIG['console_interval']):
+        if level not in LEVELS:
+            raise ValueError(f"Unknown log level '{level}' - choose from {', '.join(LEVELS)}")
+        self.path = path
+        self.level = level
+        self.console = console
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.console_interval = console_interval
+        self.counts = {'events': 0, 'passed': 0, 'failed': 0, 'dropped': 0, 'written': 0}
+        self.last_failure: Optional[str] = None
+        self._queue: 'queue.Queue[Optional[Dict[str, Any]]]' = queue.Queue(EVENT_LOG_CONFIG['max_queue'])
+        self._counts_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = time.monotonic()
+        self._last_console = 0.0
+
+    def enabled_for(self, level: str) -> bool:
+        return LEVELS[level] >= LEVELS[self.level]
+
+    def emit(self, event: Dict[str, Any], level: str = 'info'):
+        """Queue one event; never blocks, drops (and counts) when the writer falls behind"""
+        if not self.enabled_for(level):
+            return
+        event.setdefault('ts', time.time())
+        event.setdefault('level', level)
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._counts_lock:
+                self.counts['dropped'] += 1
+
+    def test_result(self, tester: str, result: Dict[str, Any]):
+        """Count a tester result and log it at the level its outcome warrants"""
+        success = bool(result.get('success'))
+        with self._counts_lock:
+            self.counts['events'] += 1
+            self.counts['passed' if success else 'failed'] += 1
+            if not success:
+                self.last_failure = f"{result.get('test')}: {result.get('message')}"
+
+        level = 'info' if success else 'error'
+        if not self.enabled_for(level):
+            return
+        event = {'type': 'test', 'tester': tester, 'test': result.get('test'), 'success': success,
+                 'message': result.get('message')}
+        if self.enabled_for('debug'):
+            event['details'] = result.get('details') or result.get('response_data') or {}
+        self.emit(event, level)
+
+    def _open(self) -> TextIO:
+        if self.path == '-':
+            return sys.stdout
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Opening a named pipe blocks until a reader attaches - only ever done on the writer thread
+        return open(self.path, 'a', encoding='utf-8', buffering=1024 * 1024)
+
+    def _write_batch(self, stream: TextIO, batch: List[Dict[str, Any]]):
+        lines = [json.dumps(event, default=str, ensure_ascii=False, separators=(',', ':')) for event in batch]
+        try:
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+        except (BrokenPipeError, OSError):
+            with self._counts_lock:
+                self.counts['dropped'] += len(batch)
+            return
+        with self._counts_lock:
+            self.counts['written'] += len(batch)
+
+    def _run(self):
+        stream = self._open()
+        try:
+            while True:
+                batch, stopping = [], False
+                try:
+                    event = self._queue.get(timeout=self.flush_interval)
+                    if event is None:
+                        stopping = True
+                    else:
+                        batch.append(event)
+                        while len(batch) < self.batch_size:
+                            event = self._queue.get_nowait()
+                            if event is None:
+                                stopping = True
+                                break
+                            batch.append(event)
+                except queue.Empty:
+                    pass
+                if batch:
+                    self._write_batch(stream, batch)
+                if stopping:
+                    return
+                self._print_live_summary()
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+
+    def _print_live_summary(self, force: bool = False):
+        now = time.monotonic()
+        if self.console is None or (not force and now - self._last_console < self.console_interval):
+            return
+        with self._counts_lock:
+            counts = dict(self.counts)
+            last_failure = self.last_failure
+        if not force and not counts['events']:
+            return
+        self._last_console = now
+        line = (f"⏱️  {now - self._started_at:6.1f}s  results {counts['events']}  "
+                f"✅ {counts['passed']}  ❌ {counts['failed']}")
+        if counts['dropped']:
+            line += f"  ⚠️ dropped {counts['dropped']}"
+        if last_failure:
+            line += f"  last failure - {last_failure[:80]}"
+        try:
+            self.console.write(line + "\n")
+            self.console.flush()
+        except (BrokenPipeError, OSError):
+            pass
+
+    def start(self) -> 'EventLog':
+        self._thread = threading.Thread(target=self._run, name="ferdi-event-log", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        """Write everything still queued and print the final summary line"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self._print_live_summary(force=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+_active_log: Optional[EventLog] = None
+_active_lock = threading.Lock()
+
+
+def activate(log: Optional[EventLog]):
+    """Route tester results to log (None restores per-result console printing)"""
+    global _active_log
+    with _active_lock:
+        _active_log = log
+
+
+def active_log() -> Optional[EventLog]:
+    """The active event log, started from FERDI_EVENT_LOG on first use when set"""
+    global _active_log
+    if _active_log is None and os.getenv('FERDI_EVENT_LOG'):
+        with _active_lock:
+            if _active_log is None:
+                log = EventLog(os.environ['FERDI_EVENT_LOG'], os.getenv('FERDI_EVENT_LOG_LEVEL', DEFAULT_LEVEL))
+                _active_log = log.start()
+                atexit.register(log.close)
+    return _active_log
+
+
+def log_test_event(tester: Any, result: Dict[str, Any]) -> bool:
+    """Send a tester result to the active event log; False when none is active and the caller should print"""
+    log = active_log()
+    if log is None:
+        return False
+    log.test_result(type(tester).__name__, result)
+    return True
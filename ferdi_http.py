@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+FERDI HTTP Layer - Circuit Breaker, Backend Preflight and Deadlines
+Lets a run with no backend fail fast instead of waiting on every request.
+
+- CircuitBreakerAdapter: a requests transport adapter that counts
+  connection failures and gateway errors per host. After a few in a row the
+  host's circuit opens and further requests fail immediately with
+  BackendUnavailable until a cool-down passes and one trial request
+  gets through.
+- preflight(): the FerdiAPITester health check (GET /utils/health-check/)
+  with a short timeout, cached for a few seconds in memory and in
+  .ferdi_cache/ so parallel shards share it. A failed preflight opens the
+  circuit right away.
+- request_deadline(): while active, every request's timeout is capped at
+  the time left, and requests past the deadline raise BudgetExceeded -
+  the runner uses it to enforce per-test budgets.
+
+Usage:
+    session = create_session()            # requests.Session with the breaker mounted
+    check = preflight(API_BASE_URL)
+    if not check['available']:
+        print(check['reason'])
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+PREFLIGHT_CACHE_PATH = os.path.join(ROOT_DIR, '.ferdi_cache', 'preflight.json')
+
+HTTP_CONFIG = {
+    'failure_threshold': 3,     # consecutive failures that open a circuit
+    'cooldown_seconds': 30.0,   # time an open circuit waits before letting one trial request through
+    'preflight_timeout': 2.0,
+    'preflight_ttl': 15.0
+}
+
+# Gateway answers meaning the backend behind the proxy is not there
+GATEWAY_ERROR_STATUSES = (502, 503, 504)
+# forwardRequest answers 500 with this message when fetch() to the backend fails
+PROXY_CONNECTION_ERROR = 'Erreur de connexion au serveur'
+
+
+class BackendUnavailable(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+
+class BudgetExceeded(requests.exceptions.Timeout):
+    """Raised instead of sending a request once the active deadline has passed"""
+
+
+_deadline: Optional[float] = None
+_deadline_label: Optional[str] = None
+
+
+class request_deadline:
+    """Cap every request made while active (from any thread) to finish within `seconds`"""
+
+    def __init__(self, seconds: Optional[float], label: str = 'time budget'):
+        self.seconds = seconds
+        self.label = label
+        self._previous = None
+
+    def __enter__(self):
+        global _deadline, _deadline_label
+        self._previous = (_deadline, _deadline_label)
+        if self.seconds is not None:
+            candidate = time.monotonic() + max(self.seconds, 0.0)
+            # A nested deadline can only tighten the outer one
+            if _deadline is None or candidate < _deadline:
+                _deadline, _deadline_label = candidate, self.label
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _deadline, _deadline_label
+        _deadline, _deadline_label = self._previous
+        return False
+
+
+def _apply_deadline(timeout):
+    """The request timeout, shortened to the time left before the active deadline"""
+    if _deadline is None:
+        return timeout
+    remaining = _deadline - time.monotonic()
+    if remaining <= 0:
+        raise BudgetExceeded(f"{_deadline_label} exhausted - request not sent")
+    if timeout is None:
+        return remaining
+    if isinstance(timeout, tuple):
+        return tuple(remaining if part is None else min(part, remaining) for part in timeout)
+    return min(timeout, remaining)
+
+
+class CircuitBreaker:
+    """Per-host closed / open / half-open state"""
+
+    def __init__(self, failure_threshold: int = HTTP_CONFIG['failure_threshold'],
+                 cooldown_seconds: float = HTTP_CONFIG['cooldown_seconds']):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+
+    def _state(self, host: str) -> Dict[str, Any]:
+        return self._hosts.setdefault(host, {'failures': 0, 'opened_at': None, 'reason': None, 'trial': False})
+
+    def before_request(self, host: str):
+        """Raise BackendUnavailable while the circuit is open; let one trial through after the cool-down"""
+        with self._lock:
+            state = self._state(host)
+            if state['opened_at'] is None:
+                return
+            if time.monotonic() - state['opened_at'] >= self.cooldown_seconds and not state['trial']:
+                state['trial'] = True
+                return
+            reason = state['reason']
+        raise BackendUnavailable(f"Circuit open for {host} - backend unreachable ({reason}), request skipped")
+
+    def record_success(self, host: str):
+        with self._lock:
+            self._hosts[host] = {'failures': 0, 'opened_at': None, 'reason': None, 'trial': False}
+
+    def record_failure(self, host: str, reason: str):
+        with self._lock:
+            state = self._state(host)
+            state['failures'] += 1
+            state['trial'] = False
+            if state['opened_at'] is not None or state['failures'] >= self.failure_threshold:
+                state['opened_at'] = time.monotonic()
+                state['reason'] = reason
+
+    def trip(self, host: str, reason: str):
+        """Open the circuit immediately, e.g. after a failed preflight"""
+        with self._lock:
+            state = self._state(host)
+            state.update(failures=self.failure_threshold, opened_at=time.monotonic(), reason=reason, trial=False)
+
+    def reset(self, host: Optional[str] = None):
+        with self._lock:
+            if host is None:
+                self._hosts.clear()
+            else:
+                self._hosts.pop(host, None)
+
+    def is_open(self, host: str) -> bool:
+        with self._lock:
+            return self._state(host)['opened_at'] is not None
+
+
+BREAKER = CircuitBreaker()
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc
+
+
+def _failure_reason(response: requests.Response) -> Optional[str]:
+    if response.status_code in GATEWAY_ERROR_STATUSES:
+        return f"{response.status_code} from gateway"
+    if response.status_code == 500 and PROXY_CONNECTION_ERROR.encode('utf-8') in response.content[:512]:
+        return "proxy could not reach the backend"
+    return None
+
+
+class CircuitBreakerAdapter(HTTPAdapter):
+    """HTTPAdapter that consults and feeds the per-host circuit breaker"""
+
+    def __init__(self, breaker: CircuitBreaker = BREAKER, **kwargs):
+        self.breaker = breaker
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        host = host_of(request.url)
+        self.breaker.before_request(host)
+        kwargs['timeout'] = _apply_deadline(kwargs.get('timeout'))
+        try:
+            response = super().send(request, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if isinstance(e, requests.exceptions.Timeout) and _deadline is not None \
+                    and time.monotonic() >= _deadline - 0.05:
+                # Cut short by the budget, not a sign the backend is down
+                raise BudgetExceeded(f"{_deadline_label} exhausted while waiting for {host}") from e
+            self.breaker.record_failure(host, type(e).__name__)
+            raise
+        reason = None if kwargs.get('stream') else _failure_reason(response)
+        if reason:
+            self.breaker.record_failure(host, reason)
+        else:
+            self.breaker.record_success(host)
+        return response
+
+
+def create_session(breaker: CircuitBreaker = BREAKER, track_entities: bool = True) -> requests.Session:
+    """requests.Session whose http/https traffic goes through the circuit breaker.
+
+    With track_entities, what the session creates is recorded for ferdi_teardown.
+    """
+    session = requests.Session()
+    adapter = CircuitBreakerAdapter(breaker)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if track_entities:
+        from ferdi_teardown import track_session
+        track_session(session)
+    return session
+
+
+_preflight_cache: Dict[str, Dict[str, Any]] = {}
+_preflight_lock = threading.Lock()
+
+
+def _load_shared_cache() -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(PREFLIGHT_CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _store_shared_cache(api_base_url: str, check: Dict[str, Any]):
+    cache = _load_shared_cache()
+    cache[api_base_url] = check
+    try:
+        os.makedirs(os.path.dirname(PREFLIGHT_CACHE_PATH), exist_ok=True)
+        temporary = f"{PREFLIGHT_CACHE_PATH}.{os.getpid()}"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(temporary, PREFLIGHT_CACHE_PATH)
+    except OSError:
+        pass
+
+
+def preflight(api_base_url: str, ttl: float = HTTP_CONFIG['preflight_ttl'],
+              breaker: CircuitBreaker = BREAKER) -> Dict[str, Any]:
+    """Is the backend behind api_base_url answering its health check? Cached for ttl seconds"""
+    now = time.time()
+    with _preflight_lock:
+        check = _preflight_cache.get(api_base_url) or _load_shared_cache().get(api_base_url)
+        if check and now - check['checked_at'] < ttl:
+            if not check['available']:
+                breaker.trip(host_of(api_base_url), check['reason'])
+            return check
+
+        started = time.perf_counter()
+        try:
+            response = requests.get(f"{api_base_url}/utils/health-check/", timeout=HTTP_CONFIG['preflight_timeout'])
+            reason = _failure_reason(response)
+            if reason is None and response.status_code != 200:
+                reason = f"health check answered {response.status_code}"
+            status = response.status_code
+        except requests.exceptions.RequestException as e:
+            reason, status = f"{type(e).__name__} on health check", None
+
+        check = {
+            'available': reason is None,
+            'reason': reason or 'healthy',
+            'status': status,
+            'latency_ms': (time.perf_counter() - started) * 1000.0,
+            'checked_at': now
+        }
+        _preflight_cache[api_base_url] = check
+        _store_shared_cache(api_base_url, check)
+
+    if check['available']:
+        breaker.record_success(host_of(api_base_url))
+    else:
+        breaker.trip(host_of(api_base_url), check['reason'])
+    return check
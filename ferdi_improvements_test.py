@@ -16,10 +16,17 @@ import sys
 import time
 from urllib.parse import urljoin
 
+from ferdi_data_factory import current_namespace
+from ferdi_event_log import log_test_event
+from ferdi_http import create_session
+
 # Test configuration
 BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
 API_BASE_URL = f"{BASE_URL}/api"
 
+# Everything the tests create lives in this run's own namespace
+TENANT = current_namespace()
+
 # Mock test credentials from mock-data.js
 MOCK_CREDENTIALS = {
     'admin': {
@@ -41,7 +48,7 @@ MOCK_CREDENTIALS = {
 
 class FerdiImprovementsTester:
     def __init__(self):
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'User-Agent': 'FERDI-Improvements-Test/1.0',
             'Accept': 'application/json'
@@ -51,9 +58,6 @@ class FerdiImprovementsTester:
         
     def log_test(self, test_name, success, message, details=None):
         """Log test results"""
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name}: {message}")
-        
         result = {
             'test': test_name,
             'success': success,
@@ -61,6 +65,11 @@ class FerdiImprovementsTester:
             'details': details or {}
         }
         self.test_results.append(result)
+        if log_test_event(self, result):
+            return
+
+        status = "✅ PASS" if success else "❌ FAIL"
+        print(f"{status} {test_name}: {message}")
         
         if details:
             for key, value in details.items():
@@ -183,8 +192,8 @@ class FerdiImprovementsTester:
             new_user_data = {
                 'first_name': 'Test',
                 'last_name': 'User',
-                'email': 'test.user@transport-bretagne.fr',
-                'mobile': '0612345678',
+                'email': TENANT.email('test.user'),
+                'mobile': TENANT.mobile(),
                 'role': '4',  # Driver role
                 'company_code': 'BRE-12345-ABC'
             }
@@ -415,20 +424,7 @@ class FerdiImprovementsTester:
                 'company_registration': {
                     'endpoint': '/companies/register',
                     'method': 'POST',
-                    'data': {
-                        'company': {
-                            'name': 'Test Transport',
-                            'siret': '98765432109876',
-                            'address': '123 Test Street',
-                            'city': 'Test City',
-                            'postal_code': '12345',
-                            'phone': '0123456789',
-                            'email': 'test@testtransport.fr'
-                        },
-                        'manager_email': 'manager@testtransport.fr',
-                        'manager_first_name': 'Test',
-                        'manager_last_name': 'Manager'
-                    }
+                    'data': TENANT.company_registration()
                 },
                 'user_registration': {
                     'endpoint': '/users/signup',
@@ -436,10 +432,10 @@ class FerdiImprovementsTester:
                     'data': {
                         'first_name': 'Test',
                         'last_name': 'User',
-                        'email': 'testuser@testtransport.fr',
-                        'mobile': '0612345678',
+                        'email': TENANT.email('testuser'),
+                        'mobile': TENANT.mobile(),
                         'role': '4',
-                        'company_code': 'BRE-12345-ABC'
+                        'company_code': 'BRE-12345-ABC'  # replaced by the registered company's code when known
                     }
                 },
                 'user_list': {
@@ -463,6 +459,10 @@ class FerdiImprovementsTester:
                         headers=headers,
                         timeout=10
                     )
+                    if test_name_key == 'company_registration' and response.status_code in (200, 201):
+                        company_code = response.json().get('company_code')
+                        if company_code:
+                            mock_api_tests['user_registration']['data']['company_code'] = company_code
                 else:
                     response = self.session.get(
                         f"{API_BASE_URL}{test_config['endpoint']}",
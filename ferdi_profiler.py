@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+FERDI Harness Profiler
+Sampling profiler for the harness itself. Samples the Python stacks of every
+harness thread at a fixed interval and emits folded stacks, an SVG flame graph
+and a top-N hot-function table, together with the harness CPU time spent per
+HTTP request.
+"""
+
+import html
+import json
+import linecache
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+# Source lines whose leaf frame is blocked rather than burning harness CPU
+_BLOCKING_CALL_RE = re.compile(r'\b(sleep|recv_into|recv|readinto|select|poll|wait|acquire|accept|connect|join)\(')
+
+
+class SamplingProfiler:
+    """Wall-clock stack sampler for all threads except its own"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.waiting_samples = 0
+        self.samples = 0
+        self.overhead_cpu = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ferdi-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                leaf = frame
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.reverse()
+                if self._is_waiting(leaf):
+                    self.waiting_samples += 1
+                    stack.append("[waiting]")
+                self.stacks[tuple(stack)] += 1
+                self.samples += 1
+        # CPU burnt by the sampler itself, excluded from the harness CPU figures
+        self.overhead_cpu = time.thread_time()
+
+    @staticmethod
+    def _is_waiting(frame) -> bool:
+        line = linecache.getline(frame.f_code.co_filename, frame.f_lineno)
+        return bool(_BLOCKING_CALL_RE.search(line))
+
+    def folded(self) -> List[str]:
+        """Stacks in the folded format used by flamegraph.pl and speedscope"""
+        return [f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common()]
+
+    def hot_functions(self, top: int = 20, include_waiting: bool = False) -> List[Dict[str, Any]]:
+        """Top functions by self samples, with inclusive sample counts"""
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in self.stacks.items():
+            waiting = stack[-1] == "[waiting]"
+            if waiting and not include_waiting:
+                continue
+            frames = stack[:-1] if waiting else stack
+            if not frames:
+                continue
+            self_counts[frames[-1]] += count
+            for name in set(frames):
+                total_counts[name] += count
+
+        samples = sum(self_counts.values()) or 1
+        return [
+            {
+                "function": name,
+                "self_samples": count,
+                "self_pct": count * 100.0 / samples,
+                "total_samples": total_counts[name],
+                "total_pct": total_counts[name] * 100.0 / samples
+            }
+            for name, count in self_counts.most_common(top)
+        ]
+
+    def write_folded(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(self.folded()) + "\n")
+
+    def write_flamegraph(self, path: str, title: str = "FERDI harness", width: int = 1200):
+        """Render the sampled stacks as a self-contained SVG flame graph"""
+        tree: Dict[str, Any] = {"name": "all", "count": 0, "children": {}}
+        for stack, count in self.stacks.items():
+            node = tree
+            node["count"] += count
+            for name in stack:
+                node = node["children"].setdefault(name, {"name": name, "count": 0, "children": {}})
+                node["count"] += count
+
+        frame_height = 16
+        rects: List[Tuple[float, int, float, Dict[str, Any]]] = []
+
+        def layout(node, x, depth):
+            rects.append((x, depth, node["count"], node))
+            child_x = x
+            for child in sorted(node["children"].values(), key=lambda c: c["name"]):
+                layout(child, child_x, depth + 1)
+                child_x += child["count"]
+
+        layout(tree, 0, 0)
+        total = tree["count"] or 1
+        max_depth = max(depth for _, depth, _, _ in rects)
+        height = (max_depth + 2) * frame_height + 24
+        scale = width / total
+
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="monospace" font-size="11">',
+            f'<text x="4" y="14">{html.escape(title)} - {total} samples</text>'
+        ]
+        for x, depth, count, node in rects:
+            rect_width = count * scale
+            if rect_width < 0.5:
+                continue
+            y = height - (depth + 1) * frame_height
+            waiting = node["name"] == "[waiting]"
+            hue = 210 if waiting else 20 + (zlib.crc32(node["name"].encode()) % 40)
+            label = html.escape(node["name"])
+            pct = count * 100.0 / total
+            parts.append(
+                f'<g><title>{label} ({count} samples, {pct:.1f}%)</title>'
+                f'<rect x="{x * scale:.2f}" y="{y}" width="{rect_width:.2f}" height="{frame_height - 1}" '
+                f'fill="hsl({hue},80%,60%)"/>'
+            )
+            max_chars = int(rect_width / 7)
+            if max_chars >= 4:
+                text = label if len(label) <= max_chars else label[:max_chars - 1] + "…"
+                parts.append(f'<text x="{x * scale + 2:.2f}" y="{y + frame_height - 4}">{text}</text>')
+            parts.append('</g>')
+        parts.append('</svg>')
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(parts))
+
+
+class RequestCpuMeter:
+    """Counts HTTP requests sent through requests.Session and the harness CPU they cost"""
+
+    def __init__(self):
+        self.requests = 0
+        self.send_cpu = 0.0
+        self.send_wall = 0.0
+        self.cpu_start = 0.0
+        self.wall_start = 0.0
+        self.cpu_total = 0.0
+        self.wall_total = 0.0
+        self._lock = threading.Lock()
+        self._original_send = None
+
+    def start(self):
+        meter = self
+        original_send = requests.Session.send
+        self._original_send = original_send
+
+        def send(session, request, **kwargs):
+            cpu_before = time.thread_time()
+            wall_before = time.perf_counter()
+            try:
+                return original_send(session, request, **kwargs)
+            finally:
+                cpu = time.thread_time() - cpu_before
+                wall = time.perf_counter() - wall_before
+                with meter._lock:
+                    meter.requests += 1
+                    meter.send_cpu += cpu
+                    meter.send_wall += wall
+
+        requests.Session.send = send
+        self.cpu_start = time.process_time()
+        self.wall_start = time.perf_counter()
+
+    def stop(self):
+        self.cpu_total = time.process_time() - self.cpu_start
+        self.wall_total = time.perf_counter() - self.wall_start
+        if self._original_send is not None:
+            requests.Session.send = self._original_send
+            self._original_send = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def report(self, exclude_cpu: float = 0.0) -> Dict[str, Any]:
+        """CPU figures per request; exclude_cpu removes profiler overhead from the total"""
+        n = self.requests or 1
+        cpu_total = max(self.cpu_total - exclude_cpu, 0.0)
+        return {
+            "requests": self.requests,
+            "wall_seconds": self.wall_total,
+            "harness_cpu_seconds": cpu_total,
+            "harness_cpu_pct": (cpu_total / self.wall_total * 100.0) if self.wall_total else 0.0,
+            "cpu_ms_per_request": cpu_total * 1000.0 / n,
+            "http_client_cpu_ms_per_request": self.send_cpu * 1000.0 / n,
+            "outside_http_cpu_ms_per_request": max(cpu_total - self.send_cpu, 0.0) * 1000.0 / n,
+            "http_wall_ms_per_request": self.send_wall * 1000.0 / n
+        }
+
+
+def print_profile_report(name: str, profiler: SamplingProfiler, meter: RequestCpuMeter, top: int = 15):
+    """Print the hot-function table and CPU-per-request figures for one profiled run"""
+    cpu = meter.report(exclude_cpu=profiler.overhead_cpu)
+    print("=" * 80)
+    print(f"🔥 HARNESS PROFILE - {name}")
+    print("=" * 80)
+    print(f"Samples: {profiler.samples} ({profiler.waiting_samples} waiting on I/O or sleep)")
+    print(f"HTTP requests: {cpu['requests']}")
+    print(f"Harness CPU: {cpu['harness_cpu_seconds']:.3f}s over {cpu['wall_seconds']:.3f}s wall "
+          f"({cpu['harness_cpu_pct']:.1f}% of one core)")
+    print(f"CPU per request: {cpu['cpu_ms_per_request']:.2f} ms "
+          f"(HTTP client {cpu['http_client_cpu_ms_per_request']:.2f} ms, "
+          f"harness code {cpu['outside_http_cpu_ms_per_request']:.2f} ms)")
+    print(f"HTTP wall per request: {cpu['http_wall_ms_per_request']:.2f} ms")
+    print()
+    print(f"{'self%':>6}  {'total%':>6}  function")
+    print("-" * 80)
+    for row in profiler.hot_functions(top):
+        print(f"{row['self_pct']:>5.1f}%  {row['total_pct']:>5.1f}%  {row['function']}")
+    print("=" * 80)
+    print()
+
+
+def write_profile_artifacts(directory: str, name: str, profiler: SamplingProfiler,
+                            meter: RequestCpuMeter, top: int = 15) -> Dict[str, str]:
+    """Write folded stacks, flame graph and a JSON summary for one profiled run"""
+    os.makedirs(directory, exist_ok=True)
+    paths = {
+        "folded": os.path.join(directory, f"{name}.folded"),
+        "flamegraph": os.path.join(directory, f"{name}.svg"),
+        "summary": os.path.join(directory, f"{name}.json")
+    }
+    profiler.write_folded(paths["folded"])
+    profiler.write_flamegraph(paths["flamegraph"], title=f"FERDI harness - {name}")
+    with open(paths["summary"], 'w', encoding='utf-8') as f:
+        json.dump({
+            "samples": profiler.samples,
+            "waiting_samples": profiler.waiting_samples,
+            "profiler_overhead_cpu_seconds": profiler.overhead_cpu,
+            "cpu": meter.report(exclude_cpu=profiler.overhead_cpu),
+            "hot_functions": profiler.hot_functions(top)
+        }, f, indent=2)
+    return paths
@@ -0,0 +1,567 @@
+#!/usr/bin/env python3
+"""
+FERDI Route Catalog - Spec-Driven Probes and Benchmark Workloads
+Parses API_ROUTES_SPECIFICATION.md and lib/api-client.js into a machine-readable
+route catalog (method, path params, query params, body) and derives from it:
+1. A functional probe for every route (RouteProbeTester)
+2. A benchmark workload covering every route
+
+Usage:
+    python ferdi_route_catalog.py catalog [--output routes.json]
+    python ferdi_route_catalog.py probe [--include-writes]
+    python ferdi_route_catalog.py bench [--include-writes] [--concurrency 8] [--iterations 20]
+    python ferdi_route_catalog.py bench --duration 3600 --snapshots soak.jsonl
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+import requests
+
+from ferdi_auth import MOCK_ACCESS_TOKEN, obtain_access_token
+from ferdi_benchmark import LatencyRecorder, RecorderSnapshotter, print_latency_table, run_workload
+from ferdi_event_log import log_test_event
+from ferdi_http import create_session
+
+# Test configuration
+BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
+API_BASE_URL = f"{BASE_URL}/api"
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+SPEC_PATH = os.path.join(ROOT_DIR, 'API_ROUTES_SPECIFICATION.md')
+API_CLIENT_PATH = os.path.join(ROOT_DIR, 'lib', 'api-client.js')
+
+HTTP_METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+# Placeholder values for path parameters, taken from the specification examples
+PATH_PARAM_VALUES = {
+    'user_id': 'user-admin-001',
+    'vehicle_id': 'vehicle-001',
+    'mission_id': 'mission-001',
+    'driver_id': 'user-driver-001',
+    'invitation_id': 'test-invitation-id',
+    'company_id': 'comp-12345-67890',
+    'company_code': 'BRE-12345-ABC',
+    'session_id': 'session-001',
+    'permission': 'fleet_view',
+    'email': 'manager@transport-bretagne.fr'
+}
+
+# Defaults for query parameters the API client builds itself
+QUERY_PARAM_DEFAULTS = {
+    'start_date': '2025-01-01',
+    'end_date': '2025-01-31',
+    'limit': 10,
+    'days': 30,
+    'email_to': 'test@example.com',
+    'permission': 'fleet_view'
+}
+
+# Request bodies for routes that only appear in the API client (no spec example)
+BODY_EXAMPLES = {
+    'POST /invitations/': {
+        'email': 'pierre.bernard@transport-bretagne.fr',
+        'role': 'DRIVER',
+        'first_name': 'Pierre',
+        'last_name': 'Bernard',
+        'personal_message': "Bienvenue dans l'équipe FERDI!"
+    },
+    'POST /invitations/accept': {
+        'invitation_token': 'test-token-123',
+        'first_name': 'Pierre',
+        'last_name': 'Bernard',
+        'mobile': '0601234567',
+        'password': 'SecurePassword123!'
+    },
+    'POST /sessions/refresh': {'refresh_token': 'test-refresh-token'},
+    'POST /reset-password/': {'token': 'test-reset-token', 'new_password': 'NewSecurePass456!'},
+    'PATCH /users/me': {'first_name': 'Jean', 'last_name': 'Dupont', 'mobile': '0612345678'},
+    'PATCH /users/me/password': {'current_password': 'SecurePass123!', 'new_password': 'NewSecurePass456!'},
+    'PATCH /users/{user_id}/role': {'role': 'DISPATCH'},
+    'PATCH /users/{user_id}/status': {'status': 'ACTIVE'}
+}
+
+READ_METHODS = ('GET',)
+
+_SPEC_ROUTE_RE = re.compile(r'^###\s+(GET|POST|PUT|PATCH|DELETE)\s+(/\S*)\s*$')
+_SECTION_RE = re.compile(r'^##\s+(?!#)(.*)$')
+_CLIENT_GROUP_RE = re.compile(r'^export const (\w+API)\s*=\s*\{', re.MULTILINE)
+_CLIENT_FUNCTION_RE = re.compile(r'^\s{2}(\w+):\s*(?:async\s*)?\(([^)]*)\)\s*=>', re.MULTILINE)
+_CLIENT_CALL_RE = re.compile(r'api\.(get|post|put|patch|delete)\(\s*([`\'])(.*?)\2')
+_CLIENT_INLINE_BODY_RE = re.compile(r'api\.(?:post|put|patch)\(\s*[`\'][^`\']*[`\']\s*,\s*\{([^}]*)\}')
+_CLIENT_PARAMS_RE = re.compile(r'params:\s*\{([^}]*)\}')
+_TEMPLATE_VAR_RE = re.compile(r'\$\{(\w+)\}')
+_PATH_PARAM_RE = re.compile(r'\{(\w+)\}')
+
+_catalog_cache: Dict[Tuple[float, float], List[Dict[str, Any]]] = {}
+
+
+def _snake_case(name: str) -> str:
+    return re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', name).lower()
+
+
+def _clean_section_title(title: str) -> str:
+    """Strip emoji and numbering from '## 🔐 1. AUTHENTICATION & USERS'"""
+    return re.sub(r'^[^A-Za-z0-9]*(\d+\.\s*)?', '', title).strip()
+
+
+def _new_route(method: str, path: str, category: str) -> Dict[str, Any]:
+    return {
+        'name': f"{method} {path}",
+        'method': method,
+        'path': path,
+        'category': category,
+        'description': '',
+        'auth': False,
+        'path_params': _PATH_PARAM_RE.findall(path),
+        'query_params': {},
+        'body': None,
+        'body_format': None,
+        'sources': [],
+        'client_functions': []
+    }
+
+
+def parse_spec(spec_path: str = SPEC_PATH) -> List[Dict[str, Any]]:
+    """Parse the markdown route specification into route records"""
+    with open(spec_path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+
+    routes = []
+    category = ''
+    route = None
+    pending_block = None  # 'json' or 'form' while waiting for an Input code block
+    block_lines = None
+
+    for line in lines:
+        if block_lines is not None:
+            if line.strip().startswith('```'):
+                text = '\n'.join(block_lines)
+                if pending_block == 'form':
+                    route['body'] = dict(
+                        item.split('=', 1) for item in block_lines if '=' in item
+                    )
+                    route['body_format'] = 'form'
+                else:
+                    try:
+                        route['body'] = json.loads(text)
+                        route['body_format'] = 'json'
+                    except ValueError:
+                        route['body'] = None
+                block_lines = None
+                pending_block = None
+            else:
+                block_lines.append(line.strip())
+            continue
+
+        route_match = _SPEC_ROUTE_RE.match(line)
+        if route_match:
+            route = _new_route(route_match.group(1), route_match.group(2), category)
+            route['sources'].append('spec')
+            routes.append(route)
+            pending_block = None
+            continue
+
+        section_match = _SECTION_RE.match(line)
+        if section_match:
+            category = _clean_section_title(section_match.group(1))
+            route = None
+            continue
+
+        if route is None:
+            continue
+
+        if line.startswith('**Description**:'):
+            route['description'] = line.split(':', 1)[1].strip()
+        elif line.startswith('**Headers**:'):
+            headers = line.split(':', 1)[1]
+            route['auth'] = 'Authorization' in headers
+            if 'x-www-form-urlencoded' in headers:
+                route['body_format'] = 'form'
+        elif line.startswith('**Query Parameters**:'):
+            query = line.split(':', 1)[1].strip().strip('`')
+            route['query_params'] = dict(parse_qsl(query, keep_blank_values=True))
+        elif line.startswith('**Input (Form Data)**'):
+            pending_block = 'form'
+        elif line.startswith('**Input**'):
+            pending_block = 'json'
+        elif line.startswith('**Output**'):
+            pending_block = None
+        elif pending_block and line.strip().startswith('```'):
+            block_lines = []
+
+    return routes
+
+
+def parse_api_client(client_path: str = API_CLIENT_PATH) -> List[Dict[str, Any]]:
+    """Extract the routes called by the exported *API objects in lib/api-client.js"""
+    with open(client_path, 'r', encoding='utf-8') as f:
+        source = f.read()
+
+    groups = [(m.start(), m.group(1)) for m in _CLIENT_GROUP_RE.finditer(source)]
+    functions = list(_CLIENT_FUNCTION_RE.finditer(source))
+    routes = []
+
+    for index, match in enumerate(functions):
+        end = functions[index + 1].start() if index + 1 < len(functions) else len(source)
+        next_group = [start for start, _ in groups if start > match.start()]
+        if next_group:
+            end = min(end, next_group[0])
+        body = source[match.start():end]
+
+        call = _CLIENT_CALL_RE.search(body)
+        if not call:
+            continue
+        group = ''
+        for start, name in groups:
+            if start < match.start():
+                group = name
+
+        method = call.group(1).upper()
+        path = _TEMPLATE_VAR_RE.sub(lambda m: '{' + _snake_case(m.group(1)) + '}', call.group(3))
+        route = _new_route(method, path, group)
+        route['sources'].append('api-client')
+        route['client_functions'].append(f"{group}.{match.group(1)}")
+        route['auth'] = 'Authorization' not in body
+
+        signature_defaults = dict(
+            (name.strip(), value.strip().strip('\'"'))
+            for name, value in re.findall(r'(\w+)\s*=\s*([^,]+)', match.group(2))
+        )
+        params_match = _CLIENT_PARAMS_RE.search(body)
+        if params_match:
+            for entry in params_match.group(1).split(','):
+                key = entry.split(':', 1)[0].strip()
+                if not key or key.startswith('...'):
+                    continue
+                default = signature_defaults.get(key, QUERY_PARAM_DEFAULTS.get(key, ''))
+                route['query_params'][key] = default
+
+        if 'URLSearchParams' in body:
+            route['body_format'] = 'form'
+        elif method in ('POST', 'PUT', 'PATCH'):
+            inline_body = _CLIENT_INLINE_BODY_RE.search(body)
+            if inline_body:
+                fields = {}
+                for entry in inline_body.group(1).split(','):
+                    key = entry.split(':', 1)[0].strip()
+                    if key:
+                        fields[key] = PATH_PARAM_VALUES.get(key, 'test')
+                route['body'] = fields
+                route['body_format'] = 'json'
+            elif re.search(r',\s*data\s*[,)]', body):
+                route['body'] = {}
+                route['body_format'] = 'json'
+
+        routes.append(route)
+
+    return routes
+
+
+def build_route_catalog(spec_path: str = SPEC_PATH, client_path: str = API_CLIENT_PATH) -> List[Dict[str, Any]]:
+    """Merge spec and API client routes into one catalog keyed by method and path"""
+    catalog: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    for route in parse_spec(spec_path):
+        catalog.setdefault((route['method'], route['path']), route)
+
+    for route in parse_api_client(client_path):
+        key = (route['method'], route['path'])
+        existing = catalog.get(key)
+        if existing is None:
+            catalog[key] = route
+            continue
+        if 'api-client' not in existing['sources']:
+            existing['sources'].append('api-client')
+        existing['client_functions'].extend(route['client_functions'])
+        for name, value in route['query_params'].items():
+            existing['query_params'].setdefault(name, value)
+        if existing['body'] is None and route['body'] is not None:
+            existing['body'] = route['body']
+            existing['body_format'] = route['body_format']
+
+    for route in catalog.values():
+        if not route['body'] and route['name'] in BODY_EXAMPLES:
+            route['body'] = BODY_EXAMPLES[route['name']]
+            route['body_format'] = 'json'
+
+    return sorted(catalog.values(), key=lambda r: (r['path'], HTTP_METHODS.index(r['method'])))
+
+
+def load_route_catalog() -> List[Dict[str, Any]]:
+    """Return the route catalog, re-parsing only when a source file changed"""
+    key = (os.path.getmtime(SPEC_PATH), os.path.getmtime(API_CLIENT_PATH))
+    if key not in _catalog_cache:
+        _catalog_cache.clear()
+        _catalog_cache[key] = build_route_catalog()
+    return _catalog_cache[key]
+
+
+def build_request(route: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a catalog route into concrete request arguments for requests.Session.request"""
+    path = _PATH_PARAM_RE.sub(lambda m: str(PATH_PARAM_VALUES.get(m.group(1), 'test-id')), route['path'])
+    params = {k: v for k, v in route['query_params'].items() if v not in ('', None)}
+    request = {
+        'key': route['name'],
+        'method': route['method'],
+        'path': path,
+        'params': params,
+        'auth': route['auth']
+    }
+    if route['method'] in ('POST', 'PUT', 'PATCH'):
+        if route['body_format'] == 'form':
+            request['data'] = route['body'] or {}
+        elif route['body'] is not None:
+            request['json'] = route['body']
+    return request
+
+
+def build_workload(catalog: List[Dict[str, Any]], include_writes: bool = False) -> List[Dict[str, Any]]:
+    """One request per route; write routes only when explicitly requested"""
+    return [
+        build_request(route) for route in catalog
+        if include_writes or route['method'] in READ_METHODS
+    ]
+
+
+def send_request(session: requests.Session, request: Dict[str, Any], access_token: Optional[str] = None,
+                 api_base_url: str = API_BASE_URL, timeout: float = 10) -> requests.Response:
+    """Send one catalog request through the /api proxy"""
+    headers = {}
+    if request.get('auth') and access_token:
+        headers['Authorization'] = f'Bearer {access_token}'
+    if 'data' in request:
+        headers['Content-Type'] = 'application/x-www-form-urlencoded'
+    return session.request(
+        request['method'],
+        f"{api_base_url}{request['path']}",
+        params=request.get('params') or None,
+        json=request.get('json'),
+        data=request.get('data'),
+        headers=headers,
+        timeout=timeout
+    )
+
+
+class RouteProbeTester:
+    def __init__(self, catalog: Optional[List[Dict[str, Any]]] = None, include_writes: bool = False):
+        self.session = create_session()
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'User-Agent': 'FERDI-Route-Prober/1.0'
+        })
+        self.test_results = []
+        self.access_token = None
+        self.catalog = catalog if catalog is not None else load_route_catalog()
+        self.follow_sources = catalog is None
+        self.include_writes = include_writes
+
+    def log_test(self, test_name: str, success: bool, message: str, details: Dict = None):
+        """Log test results with detailed information"""
+        result = {
+            "test": test_name,
+            "success": success,
+            "message": message,
+            "details": details or {}
+        }
+        self.test_results.append(result)
+        if log_test_event(self, result):
+            return
+
+        status = "✅ PASS" if success else "❌ FAIL"
+        print(f"{status} {test_name}: {message}")
+        if details:
+            for key, value in details.items():
+                print(f"    {key}: {value}")
+        print()
+
+    def authenticate(self):
+        """Obtain a bearer token for authenticated routes, falling back to the mock token"""
+        self.access_token = obtain_access_token(self.session, API_BASE_URL) or MOCK_ACCESS_TOKEN
+
+    def probe_route(self, route: Dict[str, Any]):
+        """Send the catalog request for one route and classify the response"""
+        test_name = f"Probe {route['name']}"
+        request = build_request(route)
+
+        try:
+            response = send_request(self.session, request, self.access_token)
+            status_code = response.status_code
+            details = {"status_code": status_code, "sources": ", ".join(route['sources'])}
+
+            if 200 <= status_code < 300:
+                self.log_test(test_name, True, "Route responded successfully", details)
+            elif status_code in (401, 403):
+                self.log_test(test_name, True, "Route reachable - access control enforced", details)
+            elif status_code in (400, 409, 422):
+                self.log_test(test_name, True, "Route reachable - input validation active", details)
+            elif status_code == 404:
+                # FastAPI answers unknown routes with a bare {"detail": "Not Found"}
+                try:
+                    detail = response.json().get("detail")
+                except (ValueError, AttributeError):
+                    detail = None
+                if route['path_params'] and detail != "Not Found":
+                    self.log_test(test_name, True, "Route reachable - placeholder resource not found", details)
+                else:
+                    self.log_test(test_name, False, "Route not implemented by backend", details)
+            elif status_code == 502:
+                details["error"] = "No FastAPI backend server running"
+                self.log_test(test_name, False, "Backend server not available - 502 Bad Gateway", details)
+            else:
+                details["response"] = response.text[:200]
+                self.log_test(test_name, False, f"Unexpected response", details)
+
+        except Exception as e:
+            self.log_test(test_name, False, f"Probe failed: {str(e)}")
+
+    def run_all_tests(self):
+        """Probe every cataloged route"""
+        if self.follow_sources:
+            # Long-lived instances pick up edits to the spec or api-client.js
+            self.catalog = load_route_catalog()
+
+        print("🧪 FERDI ROUTE CATALOG PROBES")
+        print("=" * 80)
+        print(f"Testing against: {BASE_URL}")
+        print(f"API Base URL: {API_BASE_URL}")
+        print(f"Cataloged routes: {len(self.catalog)}")
+        print(f"Write routes: {'probed' if self.include_writes else 'skipped (use --include-writes)'}")
+        print("=" * 80)
+        print()
+
+        self.authenticate()
+
+        self.skipped_routes = []
+        for route in self.catalog:
+            if not self.include_writes and route['method'] not in READ_METHODS:
+                self.skipped_routes.append(route['name'])
+                continue
+            self.probe_route(route)
+
+        self.print_summary()
+
+    def print_summary(self):
+        """Print probe summary with per-category coverage"""
+        print("=" * 80)
+        print("📊 ROUTE PROBE SUMMARY")
+        print("=" * 80)
+
+        total_tests = len(self.test_results)
+        passed_tests = sum(1 for result in self.test_results if result["success"])
+        failed_tests = total_tests - passed_tests
+
+        print(f"Cataloged Routes: {len(self.catalog)}")
+        print(f"Probed: {total_tests}")
+        print(f"Skipped (writes): {len(getattr(self, 'skipped_routes', []))}")
+        print(f"✅ Passed: {passed_tests}")
+        print(f"❌ Failed: {failed_tests}")
+        if total_tests:
+            print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+        print()
+
+        print("📋 RESULTS BY CATEGORY:")
+        by_name = {f"Probe {route['name']}": route for route in self.catalog}
+        categories: Dict[str, List[bool]] = {}
+        for result in self.test_results:
+            route = by_name.get(result["test"])
+            if route:
+                categories.setdefault(route['category'] or 'Other', []).append(result["success"])
+        for category, outcomes in categories.items():
+            print(f"  {category}: {sum(outcomes)}/{len(outcomes)} passed")
+        print()
+
+        if failed_tests > 0:
+            print("❌ FAILED PROBES:")
+            for result in self.test_results:
+                if not result["success"]:
+                    print(f"  • {result['test']}: {result['message']}")
+            print()
+
+        print("=" * 80)
+
+
+def run_route_benchmark(catalog: List[Dict[str, Any]], include_writes: bool = False, concurrency: int = 8,
+                        iterations: int = 20, duration: Optional[float] = None,
+                        snapshot_path: Optional[str] = None, snapshot_interval: float = 10.0) -> LatencyRecorder:
+    """Drive the generated workload for every route and return the recorder"""
+    session = requests.Session()
+    session.headers.update({'Accept': 'application/json', 'User-Agent': 'FERDI-Route-Benchmark/1.0'})
+    adapter = requests.adapters.HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    access_token = obtain_access_token(session, API_BASE_URL) or MOCK_ACCESS_TOKEN
+
+    def send(request):
+        response = send_request(session, request, access_token)
+        return response.status_code, len(response.content)
+
+    recorder = LatencyRecorder()
+    snapshotter = RecorderSnapshotter(recorder, snapshot_path, snapshot_interval).start() if snapshot_path else None
+    try:
+        run_workload(build_workload(catalog, include_writes), send, recorder,
+                     concurrency=concurrency, iterations=iterations, duration=duration)
+    finally:
+        if snapshotter:
+            snapshotter.stop()
+    return recorder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FERDI spec-driven route catalog, probes and benchmark")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    catalog_parser = subparsers.add_parser("catalog", help="print or write the machine-readable route catalog")
+    catalog_parser.add_argument("--output", help="write the catalog JSON to this file")
+
+    probe_parser = subparsers.add_parser("probe", help="run a functional probe against every route")
+    probe_parser.add_argument("--include-writes", action="store_true", help="also probe POST/PUT/PATCH/DELETE routes")
+
+    bench_parser = subparsers.add_parser("bench", help="run the generated benchmark workload")
+    bench_parser.add_argument("--include-writes", action="store_true", help="also load POST/PUT/PATCH/DELETE routes")
+    bench_parser.add_argument("--concurrency", type=int, default=8)
+    bench_parser.add_argument("--iterations", type=int, default=20, help="requests per route")
+    bench_parser.add_argument("--duration", type=float, help="run for N seconds instead of a fixed iteration count")
+    bench_parser.add_argument("--output", help="write per-route summaries as JSON")
+    bench_parser.add_argument("--snapshots", help="append windowed latency sketches to this JSON-lines file")
+    bench_parser.add_argument("--snapshot-interval", type=float, default=10.0, help="seconds per snapshot window")
+
+    args = parser.parse_args()
+    catalog = load_route_catalog()
+
+    if args.command == "catalog":
+        payload = json.dumps(catalog, indent=2, ensure_ascii=False)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            print(f"Wrote {len(catalog)} routes to {args.output}")
+        else:
+            print(payload)
+        return True
+
+    if args.command == "probe":
+        tester = RouteProbeTester(catalog, include_writes=args.include_writes)
+        tester.run_all_tests()
+        return all(result["success"] for result in tester.test_results)
+
+    print(f"Benchmarking {len(build_workload(catalog, args.include_writes))} routes against {API_BASE_URL}")
+    started = time.monotonic()
+    recorder = run_route_benchmark(catalog, args.include_writes, args.concurrency, args.iterations, args.duration,
+                                   args.snapshots, args.snapshot_interval)
+    summaries = recorder.summaries()
+    print_latency_table(summaries, f"ROUTE BENCHMARK ({time.monotonic() - started:.1f}s)")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summaries, f, indent=2)
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+FERDI Test Sharding
+Splits the checks of every tester into N shards balanced by how long each
+check took in previous runs, so CI nodes finish at about the same time.
+
+Checks are planned as units:
+- testers whose tests are independent are split per test method
+  (or per route for the route probes)
+- testers whose tests share state (a token obtained by one test, an
+  invitation created by another) stay together as one unit
+
+Every node computes the same plan from the same durations file
+(longest-processing-time-first assignment, ties broken by unit id), runs its
+own shard and writes a report; the reports merge into one summary and feed
+the durations file for the next run.
+
+Usage:
+    python ferdi_shards.py plan --shards 4
+    python ferdi_shards.py run --shard 2/4 --output shard-2.json
+    python ferdi_shards.py merge shard-*.json --update-durations
+"""
+
+import argparse
+import heapq
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ferdi_test_runner import (REQUIRES_BACKEND, ROOT_DIR, TESTERS, backend_preflight, create_tester,
+                               print_run_summary, run_tester, skipped_report)
+from ferdi_watch import _test_methods
+
+DEFAULT_DURATIONS_PATH = os.path.join(ROOT_DIR, '.ferdi_cache', 'durations.json')
+DEFAULT_UNIT_SECONDS = 1.0
+DURATION_SMOOTHING = 0.3  # weight of the newest run in the moving average
+
+# Testers whose test methods do not depend on each other and can run on different nodes
+SPLIT_BY_METHOD = {'improvements', 'invitation-frontend'}
+SPLIT_BY_ROUTE = {'routes'}
+
+
+def load_durations(path: str = DEFAULT_DURATIONS_PATH) -> Dict[str, Dict[str, float]]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(durations: Dict[str, Dict[str, float]], path: str = DEFAULT_DURATIONS_PATH):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+
+
+def update_durations(durations: Dict[str, Dict[str, float]], measured: Dict[str, float]):
+    """Fold measured unit durations into the moving averages"""
+    for unit_id, seconds in measured.items():
+        entry = durations.get(unit_id)
+        if entry is None:
+            durations[unit_id] = {'seconds': seconds, 'runs': 1}
+        else:
+            entry['seconds'] = (1 - DURATION_SMOOTHING) * entry['seconds'] + DURATION_SMOOTHING * seconds
+            entry['runs'] += 1
+
+
+def plan_units(testers: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Every schedulable unit of work, in tester and source order"""
+    units = []
+    for name in testers or list(TESTERS):
+        if name in SPLIT_BY_ROUTE:
+            from ferdi_route_catalog import READ_METHODS, load_route_catalog
+            for route in load_route_catalog():
+                if route['method'] in READ_METHODS:
+                    units.append({'id': f"{name}::{route['name']}", 'tester': name, 'route': route['name']})
+        elif name in SPLIT_BY_METHOD:
+            tester = create_tester(name)
+            for method in _test_methods(type(tester)):
+                units.append({'id': f"{name}::{method}", 'tester': name, 'method': method})
+        else:
+            units.append({'id': name, 'tester': name})
+    return units
+
+
+def estimate(unit: Dict[str, Any], durations: Dict[str, Dict[str, float]], default: float) -> float:
+    entry = durations.get(unit['id'])
+    return entry['seconds'] if entry else default
+
+
+def assign_shards(units: List[Dict[str, Any]], shard_count: int,
+                  durations: Dict[str, Dict[str, float]]) -> List[Dict[str, Any]]:
+    """Longest-processing-time-first: each unit goes to the shard with the least estimated time so far"""
+    known = [entry['seconds'] for entry in durations.values()]
+    default = statistics.median(known) if known else DEFAULT_UNIT_SECONDS
+
+    shards = [{'index': i + 1, 'units': [], 'estimated_seconds': 0.0} for i in range(shard_count)]
+    heap: List[Tuple[float, int]] = [(0.0, i) for i in range(shard_count)]
+    ordered = sorted(units, key=lambda unit: (-estimate(unit, durations, default), unit['id']))
+    for unit in ordered:
+        load, index = heapq.heappop(heap)
+        seconds = estimate(unit, durations, default)
+        shards[index]['units'].append(dict(unit, estimated_seconds=seconds))
+        shards[index]['estimated_seconds'] = load + seconds
+        heapq.heappush(heap, (load + seconds, index))
+
+    # Run each shard's units in the usual tester/source order
+    position = {unit['id']: i for i, unit in enumerate(units)}
+    for shard in shards:
+        shard['units'].sort(key=lambda unit: position[unit['id']])
+    return shards
+
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """'2/4' -> (2, 4)"""
+    index, _, total = text.partition('/')
+    index, total = int(index), int(total)
+    if not 1 <= index <= total:
+        raise ValueError(f"Shard {text} is out of range")
+    return index, total
+
+
+def _run_units(name: str, units: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Run the method or route units of one splittable tester on a single instance"""
+    check = backend_preflight(name)
+    if check and not check['available'] and name in REQUIRES_BACKEND:
+        results = skipped_report(name, f"backend unavailable ({check['reason']})")['results']
+        return [{'id': unit['id'], 'tester': name, 'duration': 0.0, 'results': results} for unit in units]
+
+    tester = create_tester(name)
+    delay = getattr(sys.modules.get(type(tester).__module__), 'TEST_DELAY', 0.0)
+    if any('route' in unit for unit in units):
+        tester.authenticate()
+        routes = {route['name']: route for route in tester.catalog}
+
+    outcomes = []
+    for unit in units:
+        before = len(tester.test_results)
+        started = time.perf_counter()
+        try:
+            if 'route' in unit:
+                if unit['route'] in routes:
+                    tester.probe_route(routes[unit['route']])
+                else:
+                    tester.log_test(unit['id'], False, "Route no longer in the catalog")
+            else:
+                getattr(tester, unit['method'])()
+        except Exception as e:
+            tester.log_test(unit['id'], False, f"Test execution failed: {str(e)}")
+        outcomes.append({'id': unit['id'], 'tester': name, 'duration': time.perf_counter() - started,
+                         'results': tester.test_results[before:]})
+        if delay and 'method' in unit:
+            time.sleep(delay)
+    return outcomes
+
+
+def run_shard(index: int, total: int, durations_path: str = DEFAULT_DURATIONS_PATH,
+              testers: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run one shard of the plan and return its report"""
+    durations = load_durations(durations_path)
+    units = plan_units(testers)
+    shard = assign_shards(units, total, durations)[index - 1]
+    print(f"🧩 Shard {index}/{total}: {len(shard['units'])} of {len(units)} units, "
+          f"~{shard['estimated_seconds']:.1f}s estimated")
+
+    started = time.perf_counter()
+    outcomes = []
+    pending: Dict[str, List[Dict[str, Any]]] = {}
+    for unit in shard['units']:
+        if 'method' in unit or 'route' in unit:
+            pending.setdefault(unit['tester'], []).append(unit)
+            continue
+        report = run_tester(unit['tester'])
+        outcomes.append({'id': unit['id'], 'tester': unit['tester'], 'duration': report['duration'],
+                         'results': report['results']})
+    for name, tester_units in pending.items():
+        outcomes.extend(_run_units(name, tester_units))
+
+    return {
+        'shard': index,
+        'total': total,
+        'planned': [unit['id'] for unit in shard['units']],
+        'all_units': [unit['id'] for unit in units],
+        'estimated_seconds': shard['estimated_seconds'],
+        'duration': time.perf_counter() - started,
+        'units': outcomes
+    }
+
+
+def merge_reports(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine shard reports into per-tester reports plus coverage and balance figures"""
+    by_tester: Dict[str, Dict[str, Any]] = {}
+    ran, measured = set(), {}
+    for report in sorted(reports, key=lambda r: r['shard']):
+        for unit in report['units']:
+            ran.add(unit['id'])
+            measured[unit['id']] = unit['duration']
+            tester = by_tester.setdefault(unit['tester'], {'tester': unit['tester'], 'duration': 0.0, 'results': []})
+            tester['duration'] += unit['duration']
+            tester['results'].extend(unit['results'])
+
+    expected = set(reports[0]['all_units']) if reports else set()
+    totals = {report['total'] for report in reports}
+    shards_seen = {report['shard'] for report in reports}
+    durations = [report['duration'] for report in reports]
+    return {
+        'testers': [by_tester[name] for name in TESTERS if name in by_tester],
+        'missing_units': sorted(expected - ran),
+        'missing_shards': sorted(set(range(1, max(totals) + 1)) - shards_seen) if totals else [],
+        'inconsistent_totals': len(totals) > 1,
+        'shard_durations': durations,
+        'measured': measured
+    }
+
+
+def print_merge_summary(merged: Dict[str, Any]):
+    print_run_summary(merged['testers'])
+    durations = merged['shard_durations']
+    if durations:
+        print(f"🧩 Shards: {len(durations)}, slowest {max(durations):.1f}s, fastest {min(durations):.1f}s, "
+              f"imbalance {max(durations) - min(durations):.1f}s")
+    if merged['inconsistent_totals']:
+        print("⚠️  Reports come from plans with different shard counts")
+    if merged['missing_shards']:
+        print(f"❌ Missing shard reports: {', '.join(map(str, merged['missing_shards']))}")
+    if merged['missing_units']:
+        print(f"❌ Units not run by any shard: {', '.join(merged['missing_units'][:10])}"
+              + (f" (+{len(merged['missing_units']) - 10} more)" if len(merged['missing_units']) > 10 else ""))
+
+
+def print_plan(shards: List[Dict[str, Any]]):
+    print("=" * 80)
+    print(f"🧩 SHARD PLAN - {len(shards)} shards")
+    print("=" * 80)
+    for shard in shards:
+        print(f"Shard {shard['index']}: {len(shard['units'])} units, ~{shard['estimated_seconds']:.1f}s")
+        for unit in shard['units']:
+            print(f"    {unit['estimated_seconds']:>7.2f}s  {unit['id']}")
+    print("=" * 80)
+
+
+def main(argv: Optional[List[str]] = None) -> bool:
+    parser = argparse.ArgumentParser(description="Run the FERDI checks as duration-balanced shards")
+    parser.add_argument("--durations", default=DEFAULT_DURATIONS_PATH, help="historical durations file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    plan_parser = subparsers.add_parser("plan", help="show which units each shard would run")
+    plan_parser.add_argument("--shards", type=int, required=True)
+    plan_parser.add_argument("testers", nargs="*", metavar="TESTER")
+
+    run_parser = subparsers.add_parser("run", help="run one shard and write its report")
+    run_parser.add_argument("--shard", required=True, help="shard to run, e.g. 2/4")
+    run_parser.add_argument("--output", help="report path (default: .ferdi_cache/shards/shard-I-of-N.json)")
+    run_parser.add_argument("testers", nargs="*", metavar="TESTER")
+
+    merge_parser = subparsers.add_parser("merge", help="merge shard reports into one summary")
+    merge_parser.add_argument("reports", nargs="+")
+    merge_parser.add_argument("--update-durations", action="store_true",
+                              help="fold the measured durations into the durations file")
+    args = parser.parse_args(argv)
+    unknown = [name for name in getattr(args, 'testers', []) if name not in TESTERS]
+    if unknown:
+        parser.error(f"unknown testers: {', '.join(unknown)} (choose from {', '.join(TESTERS)})")
+
+    if args.command == "plan":
+        print_plan(assign_shards(plan_units(args.testers), args.shards, load_durations(args.durations)))
+        return True
+
+    if args.command == "run":
+        index, total = parse_shard(args.shard)
+        report = run_shard(index, total, args.durations, args.testers)
+        output = args.output or os.path.join(ROOT_DIR, '.ferdi_cache', 'shards', f"shard-{index}-of-{total}.json")
+        directory = os.path.dirname(output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"🧩 Shard {index}/{total} finished in {report['duration']:.1f}s - report: {output}")
+        return all(r.get('success') for unit in report['units'] for r in unit['results'])
+
+    reports = []
+    for path in args.reports:
+        with open(path, 'r', encoding='utf-8') as f:
+            reports.append(json.load(f))
+    merged = merge_reports(reports)
+    print_merge_summary(merged)
+    if args.update_durations:
+        durations = load_durations(args.durations)
+        update_durations(durations, merged['measured'])
+        save_durations(durations, args.durations)
+        print(f"⏱️  Updated {len(merged['measured'])} unit durations in {args.durations}")
+    complete = not merged['missing_units'] and not merged['missing_shards']
+    return complete and all(r.get('success') for tester in merged['testers'] for r in tester['results'])
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+FERDI SMTP Sink
+Local SMTP stand-in the backend can be pointed at (e.g. SMTP_HOST=127.0.0.1,
+SMTP_PORT=2525, no TLS, no auth). Every message is accepted, timestamped on
+arrival and kept in memory so the harness can correlate invitations with the
+email that was actually delivered.
+
+Usage:
+    python ferdi_smtp_sink.py --port 2525        # print messages as they arrive
+"""
+
+import argparse
+import email
+import email.policy
+import re
+import socketserver
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 2525
+MAX_MESSAGE_BYTES = 10 * 1024 * 1024
+
+# Invitation links point at /invitations/accept?token=...
+_INVITATION_TOKEN_RE = re.compile(r'invitations/accept\?(?:[^"\s<>]*&)?token=([A-Za-z0-9._~%-]+)')
+
+
+def extract_invitation_token(text: str) -> Optional[str]:
+    match = _INVITATION_TOKEN_RE.search(text or '')
+    return match.group(1) if match else None
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    """Just enough of RFC 5321 for a backend mailer: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT"""
+
+    def _reply(self, line: str):
+        self.wfile.write((line + '\r\n').encode('ascii'))
+
+    def handle(self):
+        sink: 'SmtpSink' = self.server.sink
+        mail_from, recipients = None, []
+        self._reply(f"220 {sink.hostname} FERDI SMTP sink ready")
+
+        while True:
+            raw = self.rfile.readline(4096)
+            if not raw:
+                return
+            line = raw.decode('utf-8', 'replace').rstrip('\r\n')
+            verb = line[:4].upper()
+
+            if verb == 'EHLO':
+                self._reply(f"250-{sink.hostname}")
+                self._reply(f"250-SIZE {MAX_MESSAGE_BYTES}")
+                self._reply("250-8BITMIME")
+                self._reply("250 SMTPUTF8")
+            elif verb == 'HELO':
+                self._reply(f"250 {sink.hostname}")
+            elif verb == 'MAIL':
+                mail_from, recipients = _address(line), []
+                self._reply("250 OK")
+            elif verb == 'RCPT':
+                recipients.append(_address(line))
+                self._reply("250 OK")
+            elif verb == 'DATA':
+                if not recipients:
+                    self._reply("503 RCPT first")
+                    continue
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                data = self._read_data()
+                sink.deliver(mail_from, recipients, data)
+                mail_from, recipients = None, []
+                self._reply("250 OK queued")
+            elif verb == 'RSET':
+                mail_from, recipients = None, []
+                self._reply("250 OK")
+            elif verb == 'NOOP':
+                self._reply("250 OK")
+            elif verb == 'QUIT':
+                self._reply("221 Bye")
+                return
+            elif verb in ('STAR', 'AUTH'):
+                self._reply("502 Not implemented")  # Plain-text sink: no STARTTLS or AUTH
+            else:
+                self._reply("500 Unrecognised command")
+
+    def _read_data(self) -> bytes:
+        lines = []
+        size = 0
+        while True:
+            raw = self.rfile.readline(MAX_MESSAGE_BYTES)
+            if not raw or raw in (b'.\r\n', b'.\n'):
+                break
+            if raw.startswith(b'..'):
+                raw = raw[1:]  # Dot-stuffing
+            size += len(raw)
+            if size <= MAX_MESSAGE_BYTES:
+                lines.append(raw)
+        return b''.join(lines)
+
+
+def _address(line: str) -> str:
+    match = re.search(r'<([^>]*)>', line)
+    value = match.group(1) if match else line.split(':', 1)[-1].strip()
+    return value.lower()
+
+
+class _SmtpServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 256
+
+
+class SmtpSink:
+    """In-process SMTP server collecting every delivered message"""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 on_message: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.host = host
+        self.port = port
+        self.hostname = 'ferdi-smtp-sink'
+        self.on_message = on_message
+        self.messages: List[Dict[str, Any]] = []
+        self._condition = threading.Condition()
+        self._server: Optional[_SmtpServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'SmtpSink':
+        self._server = _SmtpServer((self.host, self.port), _SmtpHandler)
+        self._server.sink = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="ferdi-smtp-sink", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def deliver(self, mail_from: Optional[str], recipients: List[str], data: bytes):
+        received_at = time.time()
+        parsed = email.message_from_bytes(data, policy=email.policy.default)
+        body_parts = []
+        for part in parsed.walk():
+            if part.get_content_maintype() == 'text':
+                try:
+                    body_parts.append(part.get_content())
+                except (LookupError, ValueError):
+                    body_parts.append(part.get_payload(decode=True).decode('utf-8', 'replace'))
+        body = "\n".join(body_parts)
+
+        message = {
+            'received_at': received_at,
+            'mail_from': mail_from,
+            'recipients': recipients,
+            'subject': str(parsed.get('Subject', '')),
+            'headers': {k.lower(): str(v) for k, v in parsed.items()},
+            'body': body,
+            'invitation_token': extract_invitation_token(body),
+            'size': len(data)
+        }
+        with self._condition:
+            self.messages.append(message)
+            self._condition.notify_all()
+        if self.on_message:
+            self.on_message(message)
+
+    def clear(self):
+        with self._condition:
+            self.messages = []
+
+    def find(self, recipient: Optional[str] = None, token: Optional[str] = None,
+             since: float = 0.0) -> List[Dict[str, Any]]:
+        recipient = recipient.lower() if recipient else None
+        with self._condition:
+            return [m for m in self.messages
+                    if m['received_at'] >= since
+                    and (recipient is None or recipient in m['recipients'])
+                    and (token is None or m['invitation_token'] == token)]
+
+    def wait_for(self, predicate: Callable[[List[Dict[str, Any]]], bool], timeout: float) -> bool:
+        """Block until predicate(messages) holds or the timeout expires"""
+        with self._condition:
+            return self._condition.wait_for(lambda: predicate(self.messages), timeout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local SMTP sink for FERDI email testing")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    def show(message):
+        token = f" token={message['invitation_token']}" if message['invitation_token'] else ""
+        print(f"📧 {time.strftime('%H:%M:%S')} {', '.join(message['recipients'])}: {message['subject']}{token}")
+
+    sink = SmtpSink(args.host, args.port, on_message=show).start()
+    print(f"📮 SMTP sink listening on {args.host}:{sink.port} - point the backend mailer here (no TLS, no auth)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sink.stop()
+    print(f"👋 Received {len(sink.messages)} messages")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+FERDI Frontend Source Index
+Cached reads of the frontend sources checked by the file-based testers.
+Contents are kept in memory and only re-read when a file's mtime or size
+changes, so a long-lived runner does not re-read the tree on every run.
+"""
+
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The testers reference sources under the container path /app; outside the
+# container they are resolved against FERDI_APP_ROOT (default: this checkout)
+CONTAINER_APP_ROOT = '/app'
+_IN_CONTAINER = os.path.isfile(os.path.join(CONTAINER_APP_ROOT, 'lib', 'api-client.js'))
+APP_ROOT = os.getenv('FERDI_APP_ROOT', CONTAINER_APP_ROOT if _IN_CONTAINER else ROOT_DIR)
+
+
+def resolve_source_path(path: str) -> str:
+    """Map a /app/... path used by the testers onto APP_ROOT"""
+    if APP_ROOT != CONTAINER_APP_ROOT and (path == CONTAINER_APP_ROOT or path.startswith(CONTAINER_APP_ROOT + '/')):
+        return APP_ROOT + path[len(CONTAINER_APP_ROOT):]
+    return path
+
+
+class SourceIndex:
+    """mtime-validated cache of frontend source files"""
+
+    def __init__(self):
+        self._files: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _stat(self, path: str) -> Optional[os.stat_result]:
+        try:
+            return os.stat(path)
+        except OSError:
+            return None
+
+    def exists(self, path: str) -> bool:
+        return self._stat(resolve_source_path(path)) is not None
+
+    def read(self, path: str) -> str:
+        """Return the file contents, re-reading only when the file changed"""
+        resolved = resolve_source_path(path)
+        stat = self._stat(resolved)
+        if stat is None:
+            raise FileNotFoundError(f"No such file: '{path}'")
+
+        with self._lock:
+            cached = self._files.get(resolved)
+            if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                self.hits += 1
+                return cached[2]
+
+        with open(resolved, 'r', encoding='utf-8') as f:
+            content = f.read()
+        with self._lock:
+            self._files[resolved] = (stat.st_mtime_ns, stat.st_size, content)
+            self.misses += 1
+        return content
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'files': len(self._files), 'hits': self.hits, 'misses': self.misses}
+
+
+SOURCE_INDEX = SourceIndex()
+
+
+def read_source(path: str) -> str:
+    return SOURCE_INDEX.read(path)
+
+
+def source_exists(path: str) -> bool:
+    return SOURCE_INDEX.exists(path)
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+FERDI Test Entity Teardown
+Every entity a run creates through a create_session() session is recorded:
+successful POSTs to the create routes below are matched and their ids
+kept, together with the API root they were created on. Teardown then deletes
+them with bounded concurrency, in batches, children before parents:
+
+    missions     DELETE /missions/{id}
+    vehicles     DELETE /vehicles/{id}
+    invitations  DELETE /invitations/{id}   (cancels a pending invitation)
+    users        DELETE /users/{id}
+    companies    no delete route in the API - reported, left in place
+
+Tracked entities are also journaled per tenant in .ferdi_cache/entities/,
+so a run that crashed before its teardown is cleaned up by the next
+`python ferdi_teardown.py`.
+
+Usage:
+    python ferdi_test_runner.py api races            # tears down after the run
+    python ferdi_test_runner.py api --keep-data      # leave the data for inspection
+    python ferdi_teardown.py --concurrency 16        # clean up leftovers of earlier runs
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+
+from ferdi_auth import MOCK_ACCESS_TOKEN, obtain_access_token
+from ferdi_benchmark import percentile
+from ferdi_data_factory import current_namespace
+from ferdi_http import BREAKER, CircuitBreakerAdapter
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+JOURNAL_DIR = os.path.join(ROOT_DIR, '.ferdi_cache', 'entities')
+
+TEARDOWN_CONFIG = {
+    'concurrency': 8,
+    'batch_size': 50,
+    'timeout': 10
+}
+
+# Create route (on the API root) -> kind of entity it creates
+CREATE_ROUTES = [
+    (re.compile(r'^(?P<base>.*)/users/(?:signup)?$'), 'users'),
+    (re.compile(r'^(?P<base>.*)/invitations/accept$'), 'users'),
+    (re.compile(r'^(?P<base>.*)/invitations/$'), 'invitations'),
+    (re.compile(r'^(?P<base>.*)/vehicles/$'), 'vehicles'),
+    (re.compile(r'^(?P<base>.*)/missions/$'), 'missions'),
+    (re.compile(r'^(?P<base>.*)/companies/register$'), 'companies'),
+]
+
+DELETE_ROUTES = {
+    'missions': '/missions/{id}',
+    'vehicles': '/vehicles/{id}',
+    'invitations': '/invitations/{id}',
+    'users': '/users/{id}'
+}
+
+# Children first, so no delete is refused because something still points at the entity
+TEARDOWN_ORDER = ('missions', 'vehicles', 'invitations', 'users', 'companies')
+
+DELETED_STATUSES = (200, 202, 204)
+GONE_STATUSES = (404, 410)
+
+
+def created_entities(kind: str, body: Any) -> List[Tuple[str, str]]:
+    """(kind, id) pairs a create response reports"""
+    if not isinstance(body, dict):
+        return []
+    entities = []
+    if kind == 'companies':
+        company = body.get('company') if isinstance(body.get('company'), dict) else {}
+        company_id = company.get('id') or body.get('company_id') or body.get('id')
+        if company_id:
+            entities.append(('companies', str(company_id)))
+        for key in ('manager', 'user'):
+            if isinstance(body.get(key), dict) and body[key].get('id'):
+                entities.append(('users', str(body[key]['id'])))
+        return entities
+    if kind == 'users' and isinstance(body.get('user'), dict):
+        body = body['user']
+    entity_id = body.get('id') or body.get('user_id')
+    if entity_id:
+        entities.append((kind, str(entity_id)))
+    return entities
+
+
+class EntityTracker:
+    """Entities created during a run, optionally journaled to disk"""
+
+    def __init__(self, journal_path: Optional[str] = None):
+        self.journal_path = journal_path
+        self.entities: List[Dict[str, Any]] = []
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def track(self, kind: str, entity_id: str, api_base: str):
+        entity = {'kind': kind, 'id': entity_id, 'api_base': api_base, 'created_at': time.time()}
+        with self._lock:
+            key = (kind, entity_id, api_base)
+            if key in self._seen:
+                return
+            self._seen.add(key)
+            self.entities.append(entity)
+            if self.journal_path:
+                try:
+                    os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+                    with open(self.journal_path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(entity) + "\n")
+                except OSError:
+                    pass
+
+    def record_response(self, response: requests.Response, *args, **kwargs):
+        """requests response hook: track what a successful POST to a create route created"""
+        if response.request.method != 'POST' or response.status_code not in (200, 201):
+            return
+        parts = urlsplit(response.url)
+        for pattern, kind in CREATE_ROUTES:
+            match = pattern.match(parts.path)
+            if match:
+                break
+        else:
+            return
+        try:
+            body = response.json()
+        except ValueError:
+            return
+        api_base = urlunsplit((parts.scheme, parts.netloc, match.group('base'), '', ''))
+        for entity_kind, entity_id in created_entities(kind, body):
+            self.track(entity_kind, entity_id, api_base)
+
+    def forget(self, entities: List[Dict[str, Any]]):
+        """Drop entities that no longer need deleting and rewrite the journal"""
+        drop = {(e['kind'], e['id'], e['api_base']) for e in entities}
+        with self._lock:
+            self.entities = [e for e in self.entities if (e['kind'], e['id'], e['api_base']) not in drop]
+            if not self.journal_path:
+                return
+            try:
+                if self.entities:
+                    with open(self.journal_path, 'w', encoding='utf-8') as f:
+                        f.writelines(json.dumps(e) + "\n" for e in self.entities)
+                elif os.path.exists(self.journal_path):
+                    os.remove(self.journal_path)
+            except OSError:
+                pass
+
+    @classmethod
+    def from_journal(cls, path: str) -> 'EntityTracker':
+        tracker = cls(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entity = json.loads(line)
+                    except ValueError:
+                        continue
+                    key = (entity['kind'], entity['id'], entity['api_base'])
+                    if key not in tracker._seen:
+                        tracker._seen.add(key)
+                        tracker.entities.append(entity)
+        except OSError:
+            pass
+        return tracker
+
+    def __len__(self):
+        return len(self.entities)
+
+
+_tracker: Optional[EntityTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def current_tracker() -> EntityTracker:
+    """The tracker of this process, journaled under the data factory's tenant id"""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = EntityTracker(os.path.join(JOURNAL_DIR, f"{current_namespace().tenant}.jsonl"))
+        return _tracker
+
+
+def track_session(session: requests.Session, tracker: Optional[EntityTracker] = None) -> requests.Session:
+    """Record what the session creates in tracker (the process tracker by default)"""
+    tracker = tracker or current_tracker()
+    session.hooks['response'].append(tracker.record_response)
+    return session
+
+
+def _delete(session: requests.Session, entity: Dict[str, Any], token: str, timeout: float) -> Dict[str, Any]:
+    url = entity['api_base'] + DELETE_ROUTES[entity['kind']].format(id=entity['id'])
+    started = time.perf_counter()
+    try:
+        response = session.delete(url, headers={'Authorization': f'Bearer {token}'}, timeout=timeout)
+        status = response.status_code
+    except requests.exceptions.RequestException as e:
+        status = type(e).__name__
+    latency_ms = (time.perf_counter() - started) * 1000.0
+    if status in DELETED_STATUSES:
+        outcome = 'deleted'
+    elif status in GONE_STATUSES:
+        outcome = 'gone'
+    else:
+        outcome = 'failed'
+    return {'entity': entity, 'status': status, 'outcome': outcome, 'latency_ms': latency_ms}
+
+
+def teardown(tracker: EntityTracker, concurrency: int = TEARDOWN_CONFIG['concurrency'],
+             batch_size: int = TEARDOWN_CONFIG['batch_size'],
+             timeout: float = TEARDOWN_CONFIG['timeout']) -> Dict[str, Any]:
+    """Delete every tracked entity and report per kind how it went"""
+    started = time.perf_counter()
+    session = requests.Session()
+    adapter = CircuitBreakerAdapter(BREAKER, pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    tokens: Dict[str, str] = {}
+    for api_base in sorted({e['api_base'] for e in tracker.entities}):
+        tokens[api_base] = obtain_access_token(session, api_base) or MOCK_ACCESS_TOKEN
+
+    kinds: Dict[str, Dict[str, Any]] = {}
+    finished: List[Dict[str, Any]] = []
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1), thread_name_prefix="ferdi-teardown") as pool:
+        for kind in TEARDOWN_ORDER:
+            entities = [e for e in tracker.entities if e['kind'] == kind]
+            if not entities:
+                continue
+            summary = kinds[kind] = {'tracked': len(entities), 'deleted': 0, 'gone': 0, 'failed': 0,
+                                     'skipped': 0, 'latencies': [], 'statuses': {}}
+            if kind not in DELETE_ROUTES:
+                # Nothing to retry later either - reported once, then dropped from the journal
+                summary['skipped'] = len(entities)
+                finished.extend(entities)
+                continue
+            for offset in range(0, len(entities), max(batch_size, 1)):
+                batch = entities[offset:offset + batch_size]
+                for outcome in pool.map(lambda e: _delete(session, e, tokens[e['api_base']], timeout), batch):
+                    summary[outcome['outcome']] += 1
+                    summary['latencies'].append(outcome['latency_ms'])
+                    summary['statuses'][str(outcome['status'])] = summary['statuses'].get(str(outcome['status']), 0) + 1
+                    if outcome['outcome'] != 'failed':
+                        finished.append(outcome['entity'])
+
+    tracker.forget(finished)
+    for summary in kinds.values():
+        latencies = sorted(summary.pop('latencies'))
+        summary['p50_ms'] = percentile(latencies, 50) if latencies else 0.0
+        summary['p95_ms'] = percentile(latencies, 95) if latencies else 0.0
+    duration = time.perf_counter() - started
+    requests_sent = sum(s['deleted'] + s['gone'] + s['failed'] for s in kinds.values())
+    return {
+        'kinds': kinds,
+        'duration': duration,
+        'requests': requests_sent,
+        'requests_per_second': requests_sent / duration if duration > 0 else 0.0,
+        'remaining': len(tracker),
+        'concurrency': concurrency
+    }
+
+
+def print_teardown_report(report: Dict[str, Any]):
+    print("=" * 80)
+    print("🧹 TEST DATA TEARDOWN")
+    print("=" * 80)
+    if not report['kinds']:
+        print("Nothing was created - nothing to delete")
+        print("=" * 80)
+        return
+    print(f"{'Kind':<12}  {'tracked':>7}  {'deleted':>7}  {'gone':>5}  {'failed':>6}  {'kept':>5}  {'p50':>8}  {'p95':>8}")
+    print("-" * 80)
+    for kind, summary in report['kinds'].items():
+        print(f"{kind:<12}  {summary['tracked']:>7}  {summary['deleted']:>7}  {summary['gone']:>5}  "
+              f"{summary['failed']:>6}  {summary['skipped']:>5}  {summary['p50_ms']:>6.1f}ms  {summary['p95_ms']:>6.1f}ms")
+    print("-" * 80)
+    print(f"Cleanup took {report['duration']:.2f}s - {report['requests']} DELETE calls, "
+          f"{report['requests_per_second']:.1f}/s at concurrency {report['concurrency']}")
+    failed = {kind: s['statuses'] for kind, s in report['kinds'].items() if s['failed']}
+    if failed:
+        print(f"❌ Failed deletes by status: {failed}")
+    if 'companies' in report['kinds']:
+        print("ℹ️  The API has no company delete route - registered companies are kept")
+    if report['remaining']:
+        print(f"⚠️  {report['remaining']} entities remain in the journal for the next cleanup")
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete test entities left behind by earlier FERDI runs")
+    parser.add_argument("--tenant", help="only clean up this tenant's journal (default: every journal)")
+    parser.add_argument("--concurrency", type=int, default=TEARDOWN_CONFIG['concurrency'])
+    parser.add_argument("--batch-size", type=int, default=TEARDOWN_CONFIG['batch_size'])
+    args = parser.parse_args()
+
+    pattern = f"{args.tenant}.jsonl" if args.tenant else "*.jsonl"
+    journals = sorted(glob.glob(os.path.join(JOURNAL_DIR, pattern)))
+    if not journals:
+        print("🧹 No entity journals found - nothing to clean up")
+        return True
+
+    remaining = 0
+    for journal in journals:
+        tracker = EntityTracker.from_journal(journal)
+        print(f"🧹 {os.path.basename(journal)}: {len(tracker)} tracked entities")
+        report = teardown(tracker, args.concurrency, args.batch_size)
+        print_teardown_report(report)
+        remaining += sum(s['failed'] for s in report['kinds'].values())
+    return remaining == 0
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
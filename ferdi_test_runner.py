@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+FERDI Test Runner
+Runs the FERDI tester classes from one entry point and prints a combined summary.
+
+Usage:
+    python ferdi_test_runner.py                      # every tester
+    python ferdi_test_runner.py api enum             # selected testers
+    python ferdi_test_runner.py api --profile        # profile the harness while it runs
+    python ferdi_test_runner.py --event-log .ferdi_cache/events.jsonl   # results to a JSON-lines log
+    python ferdi_test_runner.py --deadline 300       # whole run within 5 minutes, per-test budgets from history
+    python ferdi_test_runner.py api --keep-data      # skip deleting the users, invitations... the run created
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from ferdi_budgets import BUDGET_CONFIG, BudgetPlanner, TimingHistory, instrument, print_budget_report
+from ferdi_event_log import DEFAULT_LEVEL, LEVELS, EventLog, activate, active_log
+from ferdi_http import preflight, request_deadline
+from ferdi_teardown import TEARDOWN_CONFIG, current_tracker, print_teardown_report, teardown
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PROFILE_DIR = os.path.join(ROOT_DIR, '.ferdi_cache', 'profiles')
+
+# Runner name -> (module, tester class)
+TESTERS = {
+    'enum': ('backend_test', 'FerdiEnumTester'),
+    'api': ('ferdi_api_integration_test', 'FerdiAPITester'),
+    'improvements': ('ferdi_improvements_test', 'FerdiImprovementsTester'),
+    'invitation-api': ('invitation_backend_test', 'InvitationAPITester'),
+    'invitation-frontend': ('invitation_frontend_test', 'InvitationFrontendTester'),
+    'routes': ('ferdi_route_catalog', 'RouteProbeTester'),
+    'session-storm': ('session_refresh_storm_test', 'SessionRefreshStormTester'),
+    'races': ('race_condition_test', 'RaceConditionTester'),
+}
+
+# Testers with nothing to check without a backend are skipped when the preflight fails;
+# testers that mix backend and source checks still run, with their HTTP calls failing fast
+REQUIRES_BACKEND = {'api', 'routes', 'session-storm', 'races'}
+USES_BACKEND = {'enum', 'improvements', 'invitation-api'}
+
+
+def create_tester(name: str):
+    """Import the tester module and instantiate its tester class"""
+    module_name, class_name = TESTERS[name]
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)()
+
+
+def backend_preflight(name: str) -> Optional[Dict[str, Any]]:
+    """Cached health check of the backend a tester talks to; None for testers that need none"""
+    if name not in REQUIRES_BACKEND and name not in USES_BACKEND:
+        return None
+    module = importlib.import_module(TESTERS[name][0])
+    api_base_url = getattr(module, 'API_BASE_URL', None)
+    return preflight(api_base_url) if api_base_url else None
+
+
+def skipped_report(name: str, reason: str) -> Dict[str, Any]:
+    print(f"⏭️  SKIP {name}: {reason}")
+    return {
+        'tester': name,
+        'duration': 0.0,
+        'results': [{'test': f"{name} checks", 'success': False, 'skipped': True,
+                     'message': f"Skipped - {reason}"}]
+    }
+
+
+def run_tester(name: str, tester=None, planner: Optional[BudgetPlanner] = None) -> Dict[str, Any]:
+    """Run every test of one tester, each within its time budget when a planner is given"""
+    if planner and planner.expired():
+        return skipped_report(name, "suite deadline reached")
+    check = backend_preflight(name)
+    if check and not check['available'] and name in REQUIRES_BACKEND:
+        return skipped_report(name, f"backend unavailable ({check['reason']})")
+
+    tester = tester if tester is not None else create_tester(name)
+    if planner:
+        instrument(tester, name, planner)
+    module = sys.modules.get(type(tester).__module__)
+    delay = getattr(module, 'TEST_DELAY', None)
+    if check and not check['available'] and delay is not None:
+        # Requests fail fast on the open circuit, so pacing between tests only adds time
+        module.TEST_DELAY = 0.0
+    event_log = active_log()
+    if event_log:
+        event_log.emit({'type': 'tester_start', 'tester': name})
+    started = time.perf_counter()
+    try:
+        # Testers without test_* methods (the route probe) are still held to the suite deadline
+        with request_deadline(planner.remaining() if planner else None, label="suite deadline"):
+            tester.run_all_tests()
+    except Exception as e:
+        print(f"❌ FAIL {name}: Tester execution failed: {str(e)}")
+        if event_log:
+            event_log.emit({'type': 'tester_error', 'tester': name, 'error': str(e)}, 'error')
+    finally:
+        if delay is not None:
+            module.TEST_DELAY = delay
+    report = {
+        'tester': name,
+        'duration': time.perf_counter() - started,
+        'results': list(tester.test_results)
+    }
+    if event_log:
+        event_log.emit({'type': 'tester_end', 'tester': name, 'duration': report['duration'],
+                        'passed': sum(1 for r in report['results'] if r.get('success')),
+                        'total': len(report['results'])})
+    return report
+
+
+def run_tester_profiled(name: str, profile_dir: str = DEFAULT_PROFILE_DIR,
+                        interval: float = 0.005, top: int = 15, tester=None,
+                        planner: Optional[BudgetPlanner] = None) -> Dict[str, Any]:
+    """Run one tester under the sampling profiler and write its flame graph"""
+    from ferdi_profiler import RequestCpuMeter, SamplingProfiler, print_profile_report, write_profile_artifacts
+
+    tester = tester if tester is not None else create_tester(name)
+    profiler = SamplingProfiler(interval=interval)
+    meter = RequestCpuMeter()
+    with meter, profiler:
+        report = run_tester(name, tester, planner)
+
+    print_profile_report(name, profiler, meter, top)
+    report['profile'] = write_profile_artifacts(profile_dir, name, profiler, meter, top)
+    report['cpu'] = meter.report(exclude_cpu=profiler.overhead_cpu)
+    print(f"🔥 Flame graph: {report['profile']['flamegraph']}")
+    print()
+    return report
+
+
+def print_run_summary(reports: List[Dict[str, Any]]):
+    """Print per-tester and overall pass counts"""
+    print("=" * 80)
+    print("📊 FERDI TEST RUNNER SUMMARY")
+    print("=" * 80)
+
+    total = passed = skipped = 0
+    for report in reports:
+        results = report['results']
+        tester_passed = sum(1 for r in results if r.get('success'))
+        total += len(results)
+        passed += tester_passed
+        skipped += sum(1 for r in results if r.get('skipped'))
+        if results and all(r.get('skipped') for r in results):
+            print(f"  {report['tester']}: skipped - {results[0]['message']}")
+            continue
+        line = f"  {report['tester']}: {tester_passed}/{len(results)} passed in {report['duration']:.2f}s"
+        if 'cpu' in report:
+            line += f" - harness CPU {report['cpu']['cpu_ms_per_request']:.2f} ms/request"
+        print(line)
+
+    print()
+    print(f"Total Tests: {total}")
+    print(f"✅ Passed: {passed}")
+    print(f"❌ Failed: {total - passed - skipped}")
+    if skipped:
+        print(f"⏭️  Skipped: {skipped}")
+    if total:
+        print(f"Success Rate: {(passed/total)*100:.1f}%")
+    print("=" * 80)
+
+
+def main(argv: Optional[List[str]] = None) -> bool:
+    parser = argparse.ArgumentParser(description="Run the FERDI tester classes")
+    parser.add_argument("testers", nargs="*", metavar="TESTER",
+                        help=f"testers to run (default: all) - {', '.join(TESTERS)}")
+    parser.add_argument("--profile", action="store_true",
+                        help="sample the harness while it runs and write flame graphs")
+    parser.add_argument("--profile-dir", default=DEFAULT_PROFILE_DIR)
+    parser.add_argument("--profile-interval", type=float, default=0.005, help="sampling interval in seconds")
+    parser.add_argument("--top", type=int, default=15, help="rows in the hot-function table")
+    parser.add_argument("--event-log", metavar="PATH",
+                        help="write results as JSON lines to PATH (file, named pipe or '-') instead of printing each")
+    parser.add_argument("--log-level", choices=sorted(LEVELS, key=LEVELS.get), default=DEFAULT_LEVEL,
+                        help="event log verbosity")
+    parser.add_argument("--deadline", type=float, metavar="SECONDS",
+                        help="total time for the run; tests not reached in time are skipped")
+    parser.add_argument("--budget-factor", type=float, default=BUDGET_CONFIG['factor'],
+                        help="per-test budget as a multiple of the test's historical p99")
+    parser.add_argument("--no-budgets", action="store_true",
+                        help="run tests without time budgets and leave the timing history untouched")
+    parser.add_argument("--keep-data", action="store_true",
+                        help="do not delete the entities the run created (they stay journaled for ferdi_teardown.py)")
+    parser.add_argument("--teardown-concurrency", type=int, default=TEARDOWN_CONFIG['concurrency'],
+                        help="parallel DELETE calls during teardown")
+    args = parser.parse_args(argv)
+    # argparse rejects an empty nargs="*" list when choices are set, so validate by hand
+    unknown = [name for name in args.testers if name not in TESTERS]
+    if unknown:
+        parser.error(f"unknown testers: {', '.join(unknown)} (choose from {', '.join(TESTERS)})")
+
+    event_log = EventLog(args.event_log, args.log_level).start() if args.event_log else None
+    if event_log:
+        activate(event_log)
+    history = TimingHistory().load()
+    planner = None if args.no_budgets else BudgetPlanner(history, args.deadline, args.budget_factor)
+    reports = []
+    try:
+        for name in args.testers or list(TESTERS):
+            if args.profile:
+                reports.append(run_tester_profiled(name, args.profile_dir, args.profile_interval, args.top,
+                                                   planner=planner))
+            else:
+                reports.append(run_tester(name, planner=planner))
+    finally:
+        if event_log:
+            activate(None)
+            event_log.close()
+        if planner:
+            try:
+                history.save()
+            except OSError as e:
+                print(f"⚠️  Could not save test timings: {str(e)}")
+
+    if planner:
+        print_budget_report(planner)
+    tracker = current_tracker()
+    if len(tracker) and not args.keep_data:
+        print_teardown_report(teardown(tracker, args.teardown_concurrency))
+    elif len(tracker):
+        print(f"📌 Kept {len(tracker)} created entities - journaled in {tracker.journal_path}")
+    print_run_summary(reports)
+    return all(r.get('success') for report in reports for r in report['results'])
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
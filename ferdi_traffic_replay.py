@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+FERDI Traffic Record & Replay
+Captures real request/response pairs going to the /api proxy - through a
+local recording proxy or from a browser HAR export - into a compact capture
+file. Replays that traffic against a target at 1x, 10x or 100x speed,
+preserving inter-arrival timing and the request order of every user.
+
+Capture file layout (.ferdicap):
+    header   b'FERDICAP' + u16 version
+    blocks   u32 compressed length, u32 record count, zlib(JSON lines)
+    index    zlib(JSON list of {offset, count, first_ts, last_ts})
+    trailer  u64 index offset + b'FCAPIDX1'
+A capture without a trailer (recorder killed) is still readable by scanning
+the blocks sequentially.
+
+Usage:
+    python ferdi_traffic_replay.py record --listen 127.0.0.1:8080 --out capture.ferdicap
+    python ferdi_traffic_replay.py import-har session.har --out capture.ferdicap
+    python ferdi_traffic_replay.py info capture.ferdicap
+    python ferdi_traffic_replay.py replay capture.ferdicap --speed 10
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import re
+import struct
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from ferdi_auth import MOCK_ACCESS_TOKEN, obtain_access_token
+from ferdi_benchmark import LatencyRecorder, percentile, print_latency_table
+
+# Configuration
+BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
+API_BASE_URL = f"{BASE_URL}/api"
+API_PREFIX = '/api'
+
+MAGIC = b'FERDICAP'
+INDEX_MAGIC = b'FCAPIDX1'
+FORMAT_VERSION = 1
+BLOCK_RECORDS = 256
+BLOCK_BYTES = 256 * 1024
+
+_HEADER = struct.Struct('<8sH')
+_BLOCK = struct.Struct('<II')
+_TRAILER = struct.Struct('<Q8s')
+
+# Request headers worth keeping for replay; the rest is browser noise
+KEPT_HEADERS = {'content-type', 'accept', 'authorization', 'x-company-id'}
+HOP_BY_HOP_HEADERS = {'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization', 'te',
+                      'trailers', 'transfer-encoding', 'upgrade', 'host', 'content-length',
+                      'content-encoding'}
+
+_ID_SEGMENT_RE = re.compile(r'^(\d+|[0-9a-fA-F-]{16,}|[A-Z]{2,5}-\d+-[A-Z0-9]+)$')
+
+
+def user_key(headers: Dict[str, str]) -> str:
+    """Stable pseudonymous user id derived from the bearer token"""
+    auth = next((v for k, v in headers.items() if k.lower() == 'authorization'), '')
+    if not auth:
+        return 'anonymous'
+    return 'user-' + hashlib.sha1(auth.encode('utf-8')).hexdigest()[:10]
+
+
+def make_record(ts: float, method: str, path: str, query: str, headers: Dict[str, str],
+                body: Optional[bytes], status: Optional[int] = None, response_size: int = 0,
+                latency_ms: Optional[float] = None) -> Dict[str, Any]:
+    record = {
+        'ts': ts,
+        'user': user_key(headers),
+        'method': method.upper(),
+        'path': path,
+        'query': query,
+        'headers': {k.lower(): v for k, v in headers.items() if k.lower() in KEPT_HEADERS},
+        'status': status,
+        'response_size': response_size,
+        'latency_ms': latency_ms
+    }
+    if body:
+        try:
+            record['body'] = body.decode('utf-8')
+        except UnicodeDecodeError:
+            record['body'] = base64.b64encode(body).decode('ascii')
+            record['body_b64'] = True
+    return record
+
+
+def record_body(record: Dict[str, Any]) -> Optional[bytes]:
+    body = record.get('body')
+    if body is None:
+        return None
+    return base64.b64decode(body) if record.get('body_b64') else body.encode('utf-8')
+
+
+class CaptureWriter:
+    """Appends records to a capture file in compressed blocks"""
+
+    def __init__(self, path: str, block_records: int = BLOCK_RECORDS):
+        self.path = path
+        self.block_records = block_records
+        self.file = open(path, 'wb')
+        self.file.write(_HEADER.pack(MAGIC, FORMAT_VERSION))
+        self.pending: List[bytes] = []
+        self.pending_bytes = 0
+        self.pending_ts: List[float] = []
+        self.index: List[Dict[str, Any]] = []
+        self.records = 0
+        self._lock = threading.Lock()
+
+    def write(self, record: Dict[str, Any]):
+        line = json.dumps(record, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        with self._lock:
+            self.pending.append(line)
+            self.pending_bytes += len(line)
+            self.pending_ts.append(record['ts'])
+            self.records += 1
+            if len(self.pending) >= self.block_records or self.pending_bytes >= BLOCK_BYTES:
+                self._flush_block()
+
+    def _flush_block(self):
+        if not self.pending:
+            return
+        payload = zlib.compress(b'\n'.join(self.pending), 6)
+        offset = self.file.tell()
+        self.file.write(_BLOCK.pack(len(payload), len(self.pending)))
+        self.file.write(payload)
+        self.file.flush()
+        self.index.append({
+            'offset': offset,
+            'count': len(self.pending),
+            'first_ts': min(self.pending_ts),
+            'last_ts': max(self.pending_ts)
+        })
+        self.pending, self.pending_bytes, self.pending_ts = [], 0, []
+
+    def close(self):
+        with self._lock:
+            if self.file.closed:
+                return
+            self._flush_block()
+            index_offset = self.file.tell()
+            self.file.write(zlib.compress(json.dumps(self.index).encode('utf-8')))
+            self.file.write(_TRAILER.pack(index_offset, INDEX_MAGIC))
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class CaptureReader:
+    """Reads a capture file through its block index"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic, self.version = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a FERDI capture file")
+            self.index = self._read_index(f)
+
+    def _read_index(self, f) -> List[Dict[str, Any]]:
+        size = f.seek(0, os.SEEK_END)
+        if size >= _HEADER.size + _TRAILER.size:
+            f.seek(size - _TRAILER.size)
+            index_offset, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+            if magic == INDEX_MAGIC:
+                f.seek(index_offset)
+                return json.loads(zlib.decompress(f.read(size - _TRAILER.size - index_offset)))
+
+        # No trailer - recover the index by walking the blocks
+        index = []
+        offset = _HEADER.size
+        while offset + _BLOCK.size <= size:
+            f.seek(offset)
+            length, count = _BLOCK.unpack(f.read(_BLOCK.size))
+            if offset + _BLOCK.size + length > size:
+                break  # Truncated last block
+            index.append({'offset': offset, 'count': count, 'first_ts': None, 'last_ts': None})
+            offset += _BLOCK.size + length
+        return index
+
+    @property
+    def records(self) -> int:
+        return sum(block['count'] for block in self.index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with open(self.path, 'rb') as f:
+            for block in self.index:
+                f.seek(block['offset'])
+                length, _ = _BLOCK.unpack(f.read(_BLOCK.size))
+                for line in zlib.decompress(f.read(length)).split(b'\n'):
+                    yield json.loads(line)
+
+    def load(self) -> List[Dict[str, Any]]:
+        """All records ordered by timestamp"""
+        return sorted(self, key=lambda r: r['ts'])
+
+
+def import_har(har_path: str, out_path: str, api_prefix: str = API_PREFIX) -> int:
+    """Convert the /api entries of a browser HAR export into a capture file"""
+    with open(har_path, 'r', encoding='utf-8') as f:
+        har = json.load(f)
+
+    count = 0
+    with CaptureWriter(out_path) as writer:
+        for entry in har.get('log', {}).get('entries', []):
+            request = entry.get('request', {})
+            url = urlsplit(request.get('url', ''))
+            if not url.path.startswith(api_prefix + '/'):
+                continue
+            headers = {h['name']: h['value'] for h in request.get('headers', []) if not h['name'].startswith(':')}
+            post = request.get('postData') or {}
+            if post.get('mimeType') and not any(k.lower() == 'content-type' for k in headers):
+                headers['Content-Type'] = post['mimeType']
+            body = post.get('text', '').encode('utf-8') if post.get('text') else None
+            response = entry.get('response', {})
+            content = response.get('content', {})
+            ts = datetime.fromisoformat(entry['startedDateTime'].replace('Z', '+00:00')).timestamp()
+            writer.write(make_record(
+                ts, request.get('method', 'GET'), url.path, url.query, headers, body,
+                status=response.get('status'),
+                response_size=max(content.get('size') or 0, response.get('bodySize') or 0),
+                latency_ms=entry.get('time')
+            ))
+            count += 1
+    return count
+
+
+class _RecordingHandler(BaseHTTPRequestHandler):
+    """Forwards every request to the target and records the /api ones"""
+
+    def _forward(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else None
+        headers = {k: v for k, v in self.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS}
+        url = urlsplit(self.path)
+
+        session = getattr(server.local, 'session', None)
+        if session is None:
+            session = server.local.session = requests.Session()
+
+        ts = time.time()
+        started = time.perf_counter()
+        try:
+            response = session.request(self.command, f"{server.target}{self.path}", headers=headers,
+                                       data=body, allow_redirects=False, timeout=60)
+        except requests.exceptions.RequestException as e:
+            self.send_error(502, f"Upstream error: {str(e)}")
+            return
+        latency_ms = (time.perf_counter() - started) * 1000.0
+        content = response.content
+
+        self.send_response(response.status_code)
+        for key, value in response.headers.items():
+            if key.lower() not in HOP_BY_HOP_HEADERS:
+                self.send_header(key, value)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(content)
+
+        if url.path.startswith(server.api_prefix + '/'):
+            server.writer.write(make_record(ts, self.command, url.path, url.query, headers, body,
+                                            response.status_code, len(content), latency_ms))
+            server.recorded += 1
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _forward
+
+    def log_message(self, format, *args):
+        pass
+
+
+def record_proxy(listen: str, target: str, out_path: str, api_prefix: str = API_PREFIX):
+    """Run the recording proxy until Ctrl+C"""
+    host, port = listen.rsplit(':', 1)
+    server = ThreadingHTTPServer((host, int(port)), _RecordingHandler)
+    server.daemon_threads = True
+    server.target = target.rstrip('/')
+    server.api_prefix = api_prefix
+    server.local = threading.local()
+    server.recorded = 0
+    server.writer = CaptureWriter(out_path)
+
+    print(f"🎙️  Recording proxy on http://{listen} -> {server.target}")
+    print(f"   Point the browser or NEXT_PUBLIC_BASE_URL at the proxy; Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.writer.close()
+    print(f"💾 Recorded {server.recorded} requests to {out_path}")
+
+
+def _route_matchers(api_prefix: str) -> List[Any]:
+    """Regexes for the cataloged route templates, used to group replayed requests"""
+    try:
+        from ferdi_route_catalog import load_route_catalog
+        catalog = load_route_catalog()
+    except Exception:
+        return []
+    matchers = []
+    for route in catalog:
+        pattern = re.sub(r'\\\{\w+\\\}', r'[^/]+', re.escape(route['path'].rstrip('/')))
+        matchers.append((route['method'], re.compile(f"^{re.escape(api_prefix)}{pattern}/?$"), route['name']))
+    return matchers
+
+
+def route_key(record: Dict[str, Any], matchers: List[Any]) -> str:
+    """Catalog route name for a record, or its path with id-like segments collapsed"""
+    for method, regex, name in matchers:
+        if method == record['method'] and regex.match(record['path']):
+            return name
+    segments = ['{id}' if _ID_SEGMENT_RE.match(s) else s for s in record['path'].split('/')]
+    return f"{record['method']} {'/'.join(segments)}"
+
+
+def replay(records: List[Dict[str, Any]], target: str, speed: float = 1.0, read_only: bool = False,
+           access_token: Optional[str] = None, api_prefix: str = API_PREFIX,
+           timeout: float = 30) -> Dict[str, Any]:
+    """Re-issue captured traffic, one thread per user, at `speed` times the recorded pace.
+
+    Each user's requests are sent in capture order; when a user falls behind
+    schedule the next request goes out immediately, and the lag is reported.
+    """
+    if read_only:
+        records = [r for r in records if r['method'] in ('GET', 'HEAD', 'OPTIONS')]
+    if not records:
+        return {'recorder': LatencyRecorder(), 'lag_ms': [], 'status_mismatches': 0, 'users': 0}
+
+    target = target.rstrip('/')
+    matchers = _route_matchers(api_prefix)
+    by_user: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        by_user.setdefault(record['user'], []).append(record)
+
+    recorder = LatencyRecorder()
+    lags: List[float] = []
+    mismatches = [0]
+    lock = threading.Lock()
+    first_ts = records[0]['ts']
+    start = time.perf_counter() + 0.05
+
+    def run_user(user_records):
+        session = requests.Session()
+        for record in user_records:
+            due = start + (record['ts'] - first_ts) / speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            lag_ms = max(0.0, -delay) * 1000.0
+
+            headers = dict(record['headers'])
+            if access_token and 'authorization' in headers:
+                headers['authorization'] = f"Bearer {access_token}"
+            url = f"{target}{record['path']}"
+            params = parse_qsl(record['query'], keep_blank_values=True) if record.get('query') else None
+
+            sent = time.perf_counter()
+            try:
+                response = session.request(record['method'], url, params=params, headers=headers,
+                                           data=record_body(record), timeout=timeout, allow_redirects=False)
+                status, size, error = response.status_code, len(response.content), response.status_code >= 500
+            except requests.exceptions.RequestException:
+                status, size, error = None, 0, True
+            recorder.record(route_key(record, matchers), (time.perf_counter() - sent) * 1000.0,
+                            status=status, size=size, error=error)
+            with lock:
+                lags.append(lag_ms)
+                if record.get('status') is not None and status != record['status']:
+                    mismatches[0] += 1
+
+    threads = [threading.Thread(target=run_user, args=(user_records,), daemon=True)
+               for user_records in by_user.values()]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {'recorder': recorder, 'lag_ms': sorted(lags), 'status_mismatches': mismatches[0],
+            'users': len(by_user)}
+
+
+def print_capture_info(path: str):
+    reader = CaptureReader(path)
+    records = reader.load()
+    size = os.path.getsize(path)
+    raw = sum(len(json.dumps(r, separators=(',', ':'), ensure_ascii=False).encode('utf-8')) + 1 for r in records)
+    print("=" * 80)
+    print(f"📼 CAPTURE {path}")
+    print("=" * 80)
+    print(f"Records: {len(records)} in {len(reader.index)} blocks")
+    print(f"Size: {size} bytes ({raw / size if size else 0:.1f}x smaller than raw JSON lines)")
+    if records:
+        span = records[-1]['ts'] - records[0]['ts']
+        print(f"Span: {span:.1f}s ({len(records) / span if span else 0:.2f} req/s average)")
+        print(f"Users: {len({r['user'] for r in records})}")
+        methods: Dict[str, int] = {}
+        for record in records:
+            methods[record['method']] = methods.get(record['method'], 0) + 1
+        print(f"Methods: {methods}")
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FERDI traffic capture and replay")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="run a recording proxy in front of the app")
+    record_parser.add_argument("--listen", default="127.0.0.1:8080")
+    record_parser.add_argument("--target", default=BASE_URL)
+    record_parser.add_argument("--out", required=True)
+
+    har_parser = subparsers.add_parser("import-har", help="convert a browser HAR export")
+    har_parser.add_argument("har")
+    har_parser.add_argument("--out", required=True)
+
+    info_parser = subparsers.add_parser("info", help="summarise a capture file")
+    info_parser.add_argument("capture")
+
+    replay_parser = subparsers.add_parser("replay", help="replay a capture against a target")
+    replay_parser.add_argument("capture")
+    replay_parser.add_argument("--target", default=BASE_URL)
+    replay_parser.add_argument("--speed", type=float, default=1.0, help="time compression factor (10 = 10x faster)")
+    replay_parser.add_argument("--read-only", action="store_true", help="drop POST/PUT/PATCH/DELETE requests")
+    replay_parser.add_argument("--rewrite-auth", action="store_true",
+                               help="replace captured bearer tokens with a fresh harness token")
+    replay_parser.add_argument("--output", help="write per-route summaries as JSON")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record_proxy(args.listen, args.target, args.out)
+        return True
+    if args.command == "import-har":
+        count = import_har(args.har, args.out)
+        print(f"💾 Imported {count} /api requests to {args.out}")
+        return True
+    if args.command == "info":
+        print_capture_info(args.capture)
+        return True
+
+    records = CaptureReader(args.capture).load()
+    access_token = None
+    if args.rewrite_auth:
+        session = requests.Session()
+        access_token = obtain_access_token(session, f"{args.target.rstrip('/')}{API_PREFIX}") or MOCK_ACCESS_TOKEN
+
+    print(f"▶️  Replaying {len(records)} requests against {args.target} at {args.speed:g}x")
+    result = replay(records, args.target, args.speed, args.read_only, access_token)
+    recorder, lags = result['recorder'], result['lag_ms']
+    print_latency_table(recorder.summaries(), f"REPLAY AT {args.speed:g}x - {result['users']} users")
+    if lags:
+        print(f"Schedule lag: p50 {percentile(lags, 50):.1f} ms, p99 {percentile(lags, 99):.1f} ms, "
+              f"max {lags[-1]:.1f} ms")
+    print(f"Status mismatches vs capture: {result['status_mismatches']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(recorder.summaries(), f, indent=2)
+        print(f"Wrote summaries to {args.output}")
+    return all(s['errors'] == 0 for s in recorder.summaries())
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+FERDI Watch Mode
+Watches app/, components/ and lib/ and re-runs only the checks that depend on
+the files that changed. Events are debounced so an editor save (or a git
+checkout touching many files) triggers one run. Checks run in-process on warm
+tester instances, so parsed sources, cached tokens and pooled connections are
+reused between runs.
+
+Dependencies come from two places:
+- source paths referenced inside each test method (e.g. '/app/app/invitations/page.js')
+- DEPENDENCY_RULES for files whose effect is indirect (proxy route, enums, mock data)
+
+Usage:
+    python ferdi_watch.py                                  # watch and re-run on save
+    python ferdi_watch.py --changed lib/constants/enums.js # run the checks for one file and exit
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import fnmatch
+import inspect
+import os
+import re
+import select
+import struct
+import sys
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ferdi_daemon import WarmRunner
+from ferdi_test_runner import TESTERS
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+WATCH_DIRS = ('app', 'components', 'lib')
+IGNORED_DIRS = {'node_modules', '.next', '.git', '__pycache__'}
+
+# Testers whose checks go through the Next.js API proxy
+HTTP_TESTERS = ['api', 'enum', 'improvements', 'invitation-api', 'routes']
+
+# (glob relative to the repo root, testers, methods or None for the whole tester)
+DEPENDENCY_RULES = [
+    ('app/api/*', HTTP_TESTERS, None),
+    ('lib/constants/enums.js', ['enum'], None),
+    ('lib/api-client.js', ['routes'], None),
+    ('lib/mock-data.js', ['enum', 'improvements'], None),
+]
+
+_SOURCE_PATH_RE = re.compile(r"""['"]/app/([^'"]+)['"]""")
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _is_ignored_name(name: str) -> bool:
+    """Editor swap and backup files"""
+    return name.startswith('.') or name.endswith(('~', '.swp', '.swx', '.tmp')) or name.isdigit()
+
+
+def _walk_dirs(root: str, dirs: Iterable[str]) -> Iterable[str]:
+    for directory in dirs:
+        top = os.path.join(root, directory)
+        for current, subdirs, _ in os.walk(top):
+            subdirs[:] = [d for d in subdirs if d not in IGNORED_DIRS and not d.startswith('.')]
+            yield current
+
+
+class InotifyWatcher:
+    """Recursive inotify watcher over the given directories"""
+
+    def __init__(self, root: str = ROOT_DIR, dirs: Iterable[str] = WATCH_DIRS):
+        libc_name = ctypes.util.find_library('c')
+        if not libc_name:
+            raise OSError("libc not found")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = root
+        self.watches: Dict[int, str] = {}
+        for directory in _walk_dirs(root, dirs):
+            self._add_watch(directory)
+
+    def _add_watch(self, directory: str):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd >= 0:
+            self.watches[wd] = directory
+
+    def wait(self, timeout: Optional[float]) -> Set[str]:
+        """Changed paths (relative to root) seen within timeout; empty on timeout"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                changed.add('*')  # Events were dropped - treat as "everything changed"
+                continue
+            directory = self.watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and name not in IGNORED_DIRS:
+                    for new_dir in _walk_dirs(directory, [name]):
+                        self._add_watch(new_dir)
+                continue
+            if not _is_ignored_name(name):
+                changed.add(os.path.relpath(path, self.root))
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """mtime-scanning fallback for platforms without inotify"""
+
+    def __init__(self, root: str = ROOT_DIR, dirs: Iterable[str] = WATCH_DIRS, interval: float = 0.5):
+        self.root = root
+        self.dirs = tuple(dirs)
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for directory in _walk_dirs(self.root, self.dirs):
+            for entry in os.scandir(directory):
+                if entry.is_file() and not _is_ignored_name(entry.name):
+                    stat = entry.stat()
+                    snapshot[os.path.relpath(entry.path, self.root)] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout: Optional[float]) -> Set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval if deadline is None else max(0.0, min(self.interval, deadline - time.monotonic())))
+            current = self._scan()
+            changed = {path for path in current.keys() | self.snapshot.keys()
+                       if current.get(path) != self.snapshot.get(path)}
+            self.snapshot = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def create_watcher(force_polling: bool = False):
+    """inotify where available, polling otherwise"""
+    if not force_polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError) as e:
+            print(f"⚠️  inotify unavailable ({e}) - falling back to polling")
+    return PollingWatcher()
+
+
+def collect_changes(watcher, debounce: float = 0.3) -> Set[str]:
+    """Block until something changes, then gather events until debounce seconds pass quietly"""
+    changed = watcher.wait(None)
+    while True:
+        more = watcher.wait(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+def _test_methods(cls) -> List[str]:
+    """test_* methods in source order, which is also the order run_all_tests uses"""
+    methods = [(name, func) for name, func in inspect.getmembers(cls, inspect.isfunction)
+               if name.startswith('test_')]
+    return [name for name, func in sorted(methods, key=lambda m: m[1].__code__.co_firstlineno)]
+
+
+def build_dependency_map(runner: WarmRunner) -> Dict[str, Set[Tuple[str, str]]]:
+    """Repo-relative source path -> (tester, method) checks that read it"""
+    dependencies: Dict[str, Set[Tuple[str, str]]] = {}
+    for name in TESTERS:
+        try:
+            tester, _ = runner.get_tester(name)
+        except Exception as e:
+            print(f"⚠️  Could not load tester {name}: {str(e)}")
+            continue
+        for method in _test_methods(type(tester)):
+            try:
+                source = inspect.getsource(getattr(type(tester), method))
+            except (OSError, TypeError):
+                continue
+            for path in _SOURCE_PATH_RE.findall(source):
+                dependencies.setdefault(path, set()).add((name, method))
+    return dependencies
+
+
+def affected_checks(changed: Iterable[str], runner: WarmRunner) -> 'OrderedDict[str, Optional[List[str]]]':
+    """Tester -> methods to re-run (None re-runs the whole tester)"""
+    changed = set(changed)
+    whole: Set[str] = set()
+    methods: Dict[str, Set[str]] = {}
+
+    if '*' in changed:
+        whole.update(TESTERS)
+    dependencies = build_dependency_map(runner)
+    for path in changed:
+        for tester, method in dependencies.get(path, ()):
+            methods.setdefault(tester, set()).add(method)
+        for pattern, testers, rule_methods in DEPENDENCY_RULES:
+            if fnmatch.fnmatch(path, pattern):
+                if rule_methods is None:
+                    whole.update(testers)
+                else:
+                    for tester in testers:
+                        methods.setdefault(tester, set()).update(rule_methods)
+
+    checks: 'OrderedDict[str, Optional[List[str]]]' = OrderedDict()
+    for name in TESTERS:
+        if name in whole:
+            checks[name] = None
+        elif name in methods:
+            tester, _ = runner.get_tester(name)
+            checks[name] = [m for m in _test_methods(type(tester)) if m in methods[name]]
+    return checks
+
+
+def run_checks(runner: WarmRunner, checks: 'OrderedDict[str, Optional[List[str]]]') -> bool:
+    """Run the selected checks on warm testers and print a one-line verdict"""
+    from ferdi_test_runner import run_tester
+
+    started = time.perf_counter()
+    results = []
+    for name, methods in checks.items():
+        tester = runner.prepare_tester(name)
+        if methods is None:
+            results.extend(run_tester(name, tester)['results'])
+            continue
+        print(f"🧪 {name}: {', '.join(methods)}")
+        for method in methods:
+            try:
+                getattr(tester, method)()
+            except Exception as e:
+                print(f"❌ FAIL {method}: Test execution failed: {str(e)}")
+                tester.test_results.append({'test': method, 'success': False})
+        results.extend(tester.test_results)
+
+    passed = sum(1 for r in results if r.get('success'))
+    icon = "✅" if passed == len(results) else "❌"
+    print(f"{icon} {passed}/{len(results)} checks passed in {time.perf_counter() - started:.2f}s")
+    return passed == len(results)
+
+
+def watch(debounce: float = 0.3, force_polling: bool = False):
+    runner = WarmRunner()
+    watcher = create_watcher(force_polling)
+    kind = "inotify" if isinstance(watcher, InotifyWatcher) else "polling"
+    print(f"👀 Watching {', '.join(d + '/' for d in WATCH_DIRS)} ({kind}, {debounce * 1000:.0f} ms debounce)")
+    print("   Ctrl+C to stop")
+    try:
+        while True:
+            changed = collect_changes(watcher, debounce)
+            print()
+            print("=" * 80)
+            print(f"📝 Changed: {', '.join(sorted(changed))}")
+            checks = affected_checks(changed, runner)
+            if not checks:
+                print("💤 No checks depend on these files")
+                continue
+            run_checks(runner, checks)
+    except KeyboardInterrupt:
+        print("\n👋 Watch stopped")
+    finally:
+        watcher.close()
+
+
+def main(argv: Optional[List[str]] = None) -> bool:
+    parser = argparse.ArgumentParser(description="Re-run affected FERDI checks when sources change")
+    parser.add_argument("--debounce", type=float, default=0.3, help="quiet period in seconds before running")
+    parser.add_argument("--poll", action="store_true", help="use mtime polling instead of inotify")
+    parser.add_argument("--changed", nargs="+", metavar="PATH",
+                        help="run the checks for these repo-relative paths once and exit")
+    args = parser.parse_args(argv)
+
+    if args.changed:
+        runner = WarmRunner()
+        checks = affected_checks([os.path.normpath(p) for p in args.changed], runner)
+        if not checks:
+            print("💤 No checks depend on these files")
+            return True
+        return run_checks(runner, checks)
+
+    watch(args.debounce, args.poll)
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
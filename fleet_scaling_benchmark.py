@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+FERDI Fleet and Maintenance-History Scaling Benchmark
+Seeds a fleet and its maintenance histories in growing steps (vehicles x
+records per vehicle) and, after each step, measures:
+    list                 GET /vehicles/?limit=50
+    list-all             GET /vehicles/?limit=<fleet size>
+    detail               GET /vehicles/{id}
+    status-update        PUT /vehicles/{id}/status
+    maintenance-history  GET /vehicles/{id}/maintenance
+    maintenance-append   POST /vehicles/{id}/maintenance
+
+Steps build on each other: the fleet and histories of one step are topped
+up for the next, so a 320x120 step only seeds what 80x48 did not. The
+scaling curve is p50/p95 per operation and step, plus the log-log slope
+against the size that operation should depend on (fleet size for the
+vehicle routes, history length for the maintenance routes) - roughly 0 is
+flat, 1 linear, 2 quadratic.
+
+Seeded vehicles are deleted at the end with their histories (see
+ferdi_teardown.py).
+
+Usage:
+    python fleet_scaling_benchmark.py
+    python fleet_scaling_benchmark.py --steps 50x20,200x80,800x240 --samples 50 --output fleet.json --csv fleet.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from ferdi_auth import MOCK_ACCESS_TOKEN, obtain_access_token
+from ferdi_benchmark import LatencyRecorder, print_latency_table, run_workload, scaling_exponent
+from ferdi_data_factory import current_namespace
+from ferdi_teardown import current_tracker, print_teardown_report, teardown, track_session
+
+# Configuration
+BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
+API_BASE_URL = f"{BASE_URL}/api"
+
+SCALING_CONFIG = {
+    'steps': '20x12,80x48,320x120',   # vehicles x maintenance records per vehicle
+    'samples': 30,                    # requests per operation and step
+    'concurrency': 2,                 # kept low so latency reflects data size, not queueing
+    'seed_concurrency': 16,
+    'list_limit': 50,
+    'timeout': 30,
+    'seed': 42
+}
+
+OPERATIONS = ('list', 'list-all', 'detail', 'status-update', 'maintenance-history', 'maintenance-append')
+
+# The size each operation's cost should depend on
+SCALES_WITH = {
+    'list': 'vehicles',
+    'list-all': 'vehicles',
+    'detail': 'vehicles',
+    'status-update': 'vehicles',
+    'maintenance-history': 'records',
+    'maintenance-append': 'records'
+}
+
+OK_STATUSES = (200, 201, 202, 204)
+VEHICLE_STATUSES = ('available', 'maintenance')
+
+
+def parse_steps(text: str) -> List[Tuple[int, int]]:
+    """'20x12,80x48' -> [(20, 12), (80, 48)], checked to grow monotonically"""
+    steps = []
+    for part in text.split(','):
+        if not part.strip():
+            continue
+        vehicles, _, records = part.strip().lower().partition('x')
+        steps.append((int(vehicles), int(records or 0)))
+    for previous, step in zip(steps, steps[1:]):
+        if step[0] < previous[0] or step[1] < previous[1]:
+            raise ValueError(f"Steps must grow: {previous[0]}x{previous[1]} is followed by {step[0]}x{step[1]}")
+    return steps
+
+
+def curve_shape(exponent: Optional[float]) -> str:
+    if exponent is None:
+        return "-"
+    if exponent < 0.2:
+        return "flat"
+    if exponent < 0.7:
+        return "sublinear"
+    if exponent < 1.3:
+        return "linear"
+    return "superlinear ⚠️"
+
+
+class FleetScalingBenchmark:
+    """Grows one fleet step by step and measures the vehicle routes at each size"""
+
+    def __init__(self, config: Dict[str, Any], headers: Dict[str, str]):
+        self.config = config
+        self.headers = dict(headers, **{'Content-Type': 'application/json'})
+        self.tenant = current_namespace()
+        self.random = random.Random(config['seed'])
+        self.session = track_session(requests.Session())
+        pool = max(config['seed_concurrency'], config['concurrency'], 10)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.vehicles: List[str] = []
+        self.history: Dict[str, int] = {}
+        self.seeding = LatencyRecorder()
+        self.steps: List[Dict[str, Any]] = []
+
+    def _send(self, method: str, path: str, **kwargs) -> requests.Response:
+        return self.session.request(method, f"{API_BASE_URL}{path}", headers=self.headers,
+                                    timeout=self.config['timeout'], **kwargs)
+
+    def _seed_one(self, job: Tuple[str, Any]) -> Optional[str]:
+        kind, target = job
+        started = time.perf_counter()
+        try:
+            if kind == 'vehicle':
+                response = self._send('POST', '/vehicles/', json=self.tenant.vehicle())
+            else:
+                vehicle_id, sequence = target
+                response = self._send('POST', f"/vehicles/{vehicle_id}/maintenance",
+                                      json=self.tenant.maintenance_record(sequence))
+            status, size = response.status_code, len(response.content)
+        except requests.exceptions.RequestException as e:
+            response, status, size = None, type(e).__name__, 0
+        self.seeding.record(f"seed-{kind}", (time.perf_counter() - started) * 1000.0, status, size,
+                            status not in OK_STATUSES)
+        if kind != 'vehicle' or status not in OK_STATUSES:
+            return None
+        try:
+            return response.json().get('id')
+        except (ValueError, AttributeError):
+            return None
+
+    def grow(self, vehicles: int, records: int) -> Dict[str, Any]:
+        """Top the fleet up to `vehicles`, and every history up to `records`"""
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.config['seed_concurrency']) as pool:
+            missing = max(vehicles - len(self.vehicles), 0)
+            for vehicle_id in pool.map(self._seed_one, [('vehicle', None)] * missing):
+                if vehicle_id:
+                    self.vehicles.append(vehicle_id)
+                    self.history[vehicle_id] = 0
+            jobs = [('maintenance', (vehicle_id, sequence))
+                    for vehicle_id in self.vehicles
+                    for sequence in range(self.history[vehicle_id], records)]
+            list(pool.map(self._seed_one, jobs))
+            for vehicle_id in self.vehicles:
+                self.history[vehicle_id] = max(self.history[vehicle_id], records)
+        return {'seed_seconds': time.perf_counter() - started, 'maintenance_seeded': len(jobs)}
+
+    def _workload(self) -> List[Dict[str, Any]]:
+        items = []
+        for operation in OPERATIONS:
+            for _ in range(self.config['samples']):
+                items.append({'key': operation, 'vehicle_id': self.random.choice(self.vehicles)})
+        # Interleaved so every operation sees the same backend conditions
+        self.random.shuffle(items)
+        return items
+
+    def _measure_one(self, item: Dict[str, Any]) -> Tuple[Any, int]:
+        vehicle_id, operation = item['vehicle_id'], item['key']
+        if operation == 'list':
+            response = self._send('GET', '/vehicles/', params={'page': 1, 'limit': self.config['list_limit']})
+        elif operation == 'list-all':
+            response = self._send('GET', '/vehicles/', params={'page': 1, 'limit': max(len(self.vehicles), 1)})
+        elif operation == 'detail':
+            response = self._send('GET', f"/vehicles/{vehicle_id}")
+        elif operation == 'status-update':
+            response = self._send('PUT', f"/vehicles/{vehicle_id}/status",
+                                  json={'status': self.random.choice(VEHICLE_STATUSES)})
+        elif operation == 'maintenance-history':
+            response = self._send('GET', f"/vehicles/{vehicle_id}/maintenance")
+        else:
+            sequence = self.history[vehicle_id]
+            self.history[vehicle_id] += 1
+            response = self._send('POST', f"/vehicles/{vehicle_id}/maintenance",
+                                  json=self.tenant.maintenance_record(sequence))
+        return response.status_code, len(response.content)
+
+    def run_step(self, vehicles: int, records: int) -> Dict[str, Any]:
+        seeded = self.grow(vehicles, records)
+        step = {'vehicles': len(self.vehicles), 'records': records, 'target_vehicles': vehicles,
+                'total_records': sum(self.history.values()), **seeded}
+        if not self.vehicles:
+            step['operations'] = {}
+            self.steps.append(step)
+            return step
+        recorder = run_workload(self._workload(), self._measure_one, LatencyRecorder(),
+                                concurrency=self.config['concurrency'],
+                                is_error=lambda status: status not in OK_STATUSES)
+        step['operations'] = {operation: recorder.summary(operation) for operation in recorder.keys()}
+        self.steps.append(step)
+        return step
+
+
+def scaling_curves(steps: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Per operation: (size, p50, p95) points against its scaling basis, and the log-log slope of p50"""
+    curves = {}
+    for operation in OPERATIONS:
+        basis = SCALES_WITH[operation]
+        points = [(step[basis], step['operations'][operation]['p50_ms'], step['operations'][operation]['p95_ms'])
+                  for step in steps if operation in step.get('operations', {})]
+        exponent = scaling_exponent([p[0] for p in points], [p[1] for p in points])
+        curves[operation] = {'basis': basis, 'points': points, 'exponent': exponent, 'shape': curve_shape(exponent)}
+    return curves
+
+
+def print_scaling_report(steps: List[Dict[str, Any]], curves: Dict[str, Dict[str, Any]]):
+    print("=" * 80)
+    print("📈 FLEET SCALING CURVE - p50 / p95 per operation and fleet size")
+    print("=" * 80)
+    labels = [f"{step['vehicles']}x{step['records']}" for step in steps]
+    print(f"{'Operation':<20}" + "".join(f"{label:>14}" for label in labels) + f"  {'slope':>6}  shape")
+    print("-" * 80)
+    for operation, curve in curves.items():
+        cells = []
+        for step in steps:
+            summary = step.get('operations', {}).get(operation)
+            cells.append(f"{summary['p50_ms']:.1f}/{summary['p95_ms']:.1f}" if summary else "-")
+        exponent = f"{curve['exponent']:.2f}" if curve['exponent'] is not None else "-"
+        print(f"{operation:<20}" + "".join(f"{cell:>14}" for cell in cells) + f"  {exponent:>6}  {curve['shape']}")
+    print("-" * 80)
+    print("Cells are p50/p95 in ms; slope is log(p50) over log(fleet size) for vehicle routes, "
+          "log(history length) for maintenance routes")
+    for step in steps:
+        errors = {op: f"{s['error_rate'] * 100:.0f}%" for op, s in step.get('operations', {}).items() if s['errors']}
+        line = (f"   {step['vehicles']}x{step['records']}: seeded in {step['seed_seconds']:.1f}s, "
+                f"{step['total_records']} maintenance records in total")
+        if step['vehicles'] < step['target_vehicles']:
+            line += f" - only {step['vehicles']}/{step['target_vehicles']} vehicles could be created"
+        if errors:
+            line += f" - errors {errors}"
+        print(line)
+    print("=" * 80)
+
+
+def write_curve_csv(path: str, steps: List[Dict[str, Any]]):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['operation', 'vehicles', 'records_per_vehicle', 'total_records', 'count',
+                         'p50_ms', 'p95_ms', 'p99_ms', 'error_rate', 'mean_bytes'])
+        for step in steps:
+            for operation, summary in step.get('operations', {}).items():
+                writer.writerow([operation, step['vehicles'], step['records'], step['total_records'], summary['count'],
+                                 round(summary['p50_ms'], 3), round(summary['p95_ms'], 3),
+                                 round(summary['p99_ms'], 3), round(summary['error_rate'], 4),
+                                 int(summary['mean_bytes'])])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FERDI fleet and maintenance-history scaling benchmark")
+    parser.add_argument("--steps", default=SCALING_CONFIG['steps'],
+                        help="growing VEHICLESxRECORDS steps, e.g. 20x12,80x48,320x120")
+    parser.add_argument("--samples", type=int, default=SCALING_CONFIG['samples'],
+                        help="requests per operation and step")
+    parser.add_argument("--concurrency", type=int, default=SCALING_CONFIG['concurrency'])
+    parser.add_argument("--seed-concurrency", type=int, default=SCALING_CONFIG['seed_concurrency'])
+    parser.add_argument("--keep-data", action="store_true", help="do not delete the seeded fleet afterwards")
+    parser.add_argument("--output", help="write steps and curves as JSON")
+    parser.add_argument("--csv", help="write the scaling curve as CSV")
+    args = parser.parse_args()
+    try:
+        steps = parse_steps(args.steps)
+    except ValueError as e:
+        parser.error(str(e))
+
+    config = dict(SCALING_CONFIG, samples=args.samples, concurrency=args.concurrency,
+                  seed_concurrency=args.seed_concurrency)
+    session = requests.Session()
+    token = obtain_access_token(session, API_BASE_URL) or MOCK_ACCESS_TOKEN
+    benchmark = FleetScalingBenchmark(config, {'Authorization': f'Bearer {token}', 'Accept': 'application/json'})
+
+    print(f"🚛 Fleet scaling against {API_BASE_URL}: steps {', '.join(f'{v}x{r}' for v, r in steps)}")
+    try:
+        for vehicles, records in steps:
+            step = benchmark.run_step(vehicles, records)
+            print(f"   {step['vehicles']} vehicles x {records} records: seeded {step['maintenance_seeded']} "
+                  f"records in {step['seed_seconds']:.1f}s, measured {len(step['operations'])} operations")
+    finally:
+        cleanup = None if args.keep_data else teardown(current_tracker())
+
+    print_latency_table(benchmark.seeding.summaries(), "FLEET SEEDING - write latency while growing the fleet",
+                        sort_key="count")
+    curves = scaling_curves(benchmark.steps)
+    print_scaling_report(benchmark.steps, curves)
+    if cleanup:
+        print_teardown_report(cleanup)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'steps': benchmark.steps, 'curves': curves}, f, indent=2)
+        print(f"Wrote report to {args.output}")
+    if args.csv:
+        write_curve_csv(args.csv, benchmark.steps)
+        print(f"Wrote scaling curve to {args.csv}")
+    return bool(benchmark.vehicles) and not any(curve['shape'].startswith('superlinear') for curve in curves.values())
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
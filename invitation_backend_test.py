@@ -11,17 +11,27 @@ import os
 import sys
 from datetime import datetime, timedelta
 
+from ferdi_data_factory import current_namespace
+from ferdi_event_log import log_test_event
+from ferdi_http import create_session
+from ferdi_sources import read_source
+
 # Configuration
 BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'https://1203e6e9-e02a-436a-a857-1c91e1f5577f.preview.emergentagent.com')
 API_BASE_URL = f"{BASE_URL}/api"
 
-# Test data
+# Pause between tests in seconds (the warm runner daemon sets this to 0)
+TEST_DELAY = float(os.getenv('FERDI_TEST_DELAY', '0.5'))
+
+# Test data, with the invitee in this run's own namespace
+TENANT = current_namespace()
+
 TEST_INVITATION_DATA = {
-    "email": "test.invitation@example.com",
+    "email": TENANT.email('test.invitation'),
     "role": "driver",
     "first_name": "Jean",
     "last_name": "Dupont",
-    "mobile": "0601234567",
+    "mobile": TENANT.mobile(),
     "personal_message": "Bienvenue dans l'équipe FERDI!"
 }
 
@@ -35,7 +45,7 @@ TEST_ACCEPT_DATA = {
 
 class InvitationAPITester:
     def __init__(self):
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'Content-Type': 'application/json',
             'Accept': 'application/json',
@@ -54,6 +64,8 @@ class InvitationAPITester:
             'response_data': response_data
         }
         self.test_results.append(result)
+        if log_test_event(self, result):
+            return
         
         status = "✅ PASS" if success else "❌ FAIL"
         print(f"{status} {test_name}: {message}")
@@ -285,8 +297,7 @@ class InvitationAPITester:
         
         try:
             # Read the api-client.js file to verify invitationsAPI export
-            with open('/app/lib/api-client.js', 'r') as f:
-                content = f.read()
+            content = read_source('/app/lib/api-client.js')
             
             # Check for invitationsAPI export
             if 'export const invitationsAPI' in content:
@@ -331,8 +342,7 @@ class InvitationAPITester:
             
             if mock_enabled:
                 # Check that invitation pages contain mock data logic
-                with open('/app/app/invitations/page.js', 'r') as f:
-                    content = f.read()
+                content = read_source('/app/app/invitations/page.js')
                 
                 if 'USE_MOCK_DATA' in content and 'mockInvitations' in content:
                     self.log_test(test_name, True, 
@@ -416,7 +426,7 @@ class InvitationAPITester:
             try:
                 if test():
                     passed += 1
-                time.sleep(0.5)  # Small delay between tests
+                time.sleep(TEST_DELAY)  # Small delay between tests
             except Exception as e:
                 print(f"❌ FAIL {test.__name__}: Unexpected error: {str(e)}")
         
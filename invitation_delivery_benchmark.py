@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+FERDI Invitation Delivery Benchmark
+Bulk-invites drivers through POST /api/invitations/ and follows every
+invitation to the inbox: a local SMTP sink (ferdi_smtp_sink.py) receives the
+backend's emails, each message is correlated with its invitation by recipient
+and accept-link token, and create-to-inbox latency and delivery throughput
+are reported.
+
+The backend mailer must point at the sink, e.g. SMTP_HOST=127.0.0.1 SMTP_PORT=2525.
+
+Usage:
+    python invitation_delivery_benchmark.py --count 200 --concurrency 16
+    python invitation_delivery_benchmark.py --count 50 --resend 10
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from ferdi_auth import MOCK_ACCESS_TOKEN, obtain_access_token
+from ferdi_benchmark import percentile
+from ferdi_smtp_sink import DEFAULT_PORT, SmtpSink
+
+# Configuration
+BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
+API_BASE_URL = f"{BASE_URL}/api"
+
+DELIVERY_CONFIG = {
+    'count': 100,
+    'concurrency': 8,
+    'delivery_timeout': 60.0,
+    'smtp_host': os.getenv('FERDI_SMTP_SINK_HOST', '127.0.0.1'),
+    'smtp_port': int(os.getenv('FERDI_SMTP_SINK_PORT', str(DEFAULT_PORT))),
+    'email_domain': 'example.test',
+    'timeout': 30
+}
+
+
+def invitation_payload(run_id: str, index: int, domain: str) -> Dict[str, Any]:
+    return {
+        "email": f"driver.invite.{run_id}.{index:04d}@{domain}",
+        "role": "DRIVER",
+        "first_name": "Chauffeur",
+        "last_name": f"Invite {index:04d}",
+        "personal_message": "Bienvenue dans l'équipe FERDI!"
+    }
+
+
+def create_invitations(session: requests.Session, headers: Dict[str, str], payloads: List[Dict[str, Any]],
+                       concurrency: int, timeout: float) -> List[Dict[str, Any]]:
+    """POST every invitation and return what was sent and created, with timestamps"""
+
+    def create(payload):
+        sent_at = time.time()
+        try:
+            response = session.post(f"{API_BASE_URL}/invitations/", json=payload, headers=headers, timeout=timeout)
+            status = response.status_code
+            try:
+                data = response.json()
+            except ValueError:
+                data = {}
+        except requests.exceptions.RequestException as e:
+            status, data = type(e).__name__, {}
+        if not isinstance(data, dict):
+            data = {}
+        return {
+            'email': payload['email'].lower(),
+            'sent_at': sent_at,
+            'created_at': time.time(),
+            'status': status,
+            'id': data.get('id'),
+            'token': data.get('token') or data.get('invitation_token')
+        }
+
+    with ThreadPoolExecutor(max(concurrency, 1)) as pool:
+        return list(pool.map(create, payloads))
+
+
+def correlate(invitations: List[Dict[str, Any]], sink: SmtpSink) -> Dict[str, Any]:
+    """Match each created invitation with its delivered message(s)"""
+    created = [inv for inv in invitations if inv['status'] in (200, 201)]
+    delivered, missing, duplicates, token_mismatches = [], [], 0, 0
+
+    for invitation in created:
+        messages = sink.find(recipient=invitation['email'], since=invitation['sent_at'])
+        if not messages:
+            missing.append(invitation)
+            continue
+        if len(messages) > 1:
+            duplicates += 1
+        message = messages[0]
+        if invitation['token'] and message['invitation_token'] and message['invitation_token'] != invitation['token']:
+            token_mismatches += 1
+        invitation['message'] = message
+        invitation['inbox_ms'] = (message['received_at'] - invitation['sent_at']) * 1000.0
+        invitation['after_response_ms'] = (message['received_at'] - invitation['created_at']) * 1000.0
+        delivered.append(invitation)
+
+    inbox = sorted(inv['inbox_ms'] for inv in delivered)
+    after_response = sorted(inv['after_response_ms'] for inv in delivered)
+    first_sent = min((inv['sent_at'] for inv in invitations), default=0.0)
+    last_created = max((inv['created_at'] for inv in invitations), default=0.0)
+    last_received = max((inv['message']['received_at'] for inv in delivered), default=0.0)
+
+    return {
+        'requested': len(invitations),
+        'created': len(created),
+        'delivered': len(delivered),
+        'missing': [inv['email'] for inv in missing],
+        'duplicate_deliveries': duplicates,
+        'token_mismatches': token_mismatches,
+        'create_statuses': _count_statuses(invitations),
+        'create_rps': len(created) / (last_created - first_sent) if last_created > first_sent else 0.0,
+        'delivery_rps': len(delivered) / (last_received - first_sent) if last_received > first_sent else 0.0,
+        'inbox_p50_ms': percentile(inbox, 50),
+        'inbox_p95_ms': percentile(inbox, 95),
+        'inbox_p99_ms': percentile(inbox, 99),
+        'inbox_max_ms': inbox[-1] if inbox else 0.0,
+        'after_response_p50_ms': percentile(after_response, 50),
+        'after_response_p99_ms': percentile(after_response, 99)
+    }
+
+
+def _count_statuses(items: List[Dict[str, Any]]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for item in items:
+        counts[str(item['status'])] = counts.get(str(item['status']), 0) + 1
+    return counts
+
+
+def resend_invitations(session: requests.Session, headers: Dict[str, str], invitations: List[Dict[str, Any]],
+                       sink: SmtpSink, timeout: float, delivery_timeout: float) -> Dict[str, Any]:
+    """POST /invitations/{id}/resend and wait for the second message of each invitation"""
+    resent = []
+    for invitation in invitations:
+        sent_at = time.time()
+        try:
+            response = session.post(f"{API_BASE_URL}/invitations/{invitation['id']}/resend",
+                                    headers=headers, timeout=timeout)
+            status = response.status_code
+        except requests.exceptions.RequestException as e:
+            status = type(e).__name__
+        resent.append({'email': invitation['email'], 'sent_at': sent_at, 'status': status})
+
+    accepted = [r for r in resent if r['status'] in (200, 201, 202, 204)]
+    sink.wait_for(lambda _: all(sink.find(recipient=r['email'], since=r['sent_at']) for r in accepted),
+                  delivery_timeout)
+    latencies = []
+    for item in accepted:
+        messages = sink.find(recipient=item['email'], since=item['sent_at'])
+        if messages:
+            latencies.append((messages[0]['received_at'] - item['sent_at']) * 1000.0)
+    latencies.sort()
+    return {
+        'resent': len(resent),
+        'statuses': _count_statuses(resent),
+        'delivered': len(latencies),
+        'p50_ms': percentile(latencies, 50),
+        'p99_ms': percentile(latencies, 99)
+    }
+
+
+def cancel_invitations(session: requests.Session, headers: Dict[str, str], invitations: List[Dict[str, Any]],
+                       timeout: float):
+    for invitation in invitations:
+        if invitation.get('id'):
+            try:
+                session.delete(f"{API_BASE_URL}/invitations/{invitation['id']}", headers=headers, timeout=timeout)
+            except requests.exceptions.RequestException:
+                pass
+
+
+def print_delivery_report(report: Dict[str, Any], resend: Optional[Dict[str, Any]] = None):
+    print("=" * 80)
+    print("📊 INVITATION DELIVERY - create to inbox")
+    print("=" * 80)
+    print(f"Invitations requested: {report['requested']}  created: {report['created']}  {report['create_statuses']}")
+    print(f"Delivered: {report['delivered']}/{report['created']}")
+    if report['missing']:
+        shown = ", ".join(report['missing'][:5])
+        more = f" (+{len(report['missing']) - 5} more)" if len(report['missing']) > 5 else ""
+        print(f"❌ Missing: {shown}{more}")
+    if report['duplicate_deliveries']:
+        print(f"⚠️  Invitations delivered more than once: {report['duplicate_deliveries']}")
+    if report['token_mismatches']:
+        print(f"❌ Accept-link token differs from the API token: {report['token_mismatches']}")
+    print(f"Create-to-inbox: p50 {report['inbox_p50_ms']:.0f} ms, p95 {report['inbox_p95_ms']:.0f} ms, "
+          f"p99 {report['inbox_p99_ms']:.0f} ms, max {report['inbox_max_ms']:.0f} ms")
+    print(f"Response-to-inbox: p50 {report['after_response_p50_ms']:.0f} ms, "
+          f"p99 {report['after_response_p99_ms']:.0f} ms")
+    print(f"Throughput: {report['create_rps']:.1f} invitations/s created, {report['delivery_rps']:.1f} emails/s delivered")
+    if resend:
+        print(f"Resend: {resend['delivered']}/{resend['resent']} re-delivered {resend['statuses']}, "
+              f"p50 {resend['p50_ms']:.0f} ms, p99 {resend['p99_ms']:.0f} ms")
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FERDI invitation create-to-inbox benchmark")
+    parser.add_argument("--count", type=int, default=DELIVERY_CONFIG['count'], help="invitations to create")
+    parser.add_argument("--concurrency", type=int, default=DELIVERY_CONFIG['concurrency'])
+    parser.add_argument("--delivery-timeout", type=float, default=DELIVERY_CONFIG['delivery_timeout'])
+    parser.add_argument("--smtp-host", default=DELIVERY_CONFIG['smtp_host'])
+    parser.add_argument("--smtp-port", type=int, default=DELIVERY_CONFIG['smtp_port'])
+    parser.add_argument("--resend", type=int, default=0, metavar="N", help="also resend N delivered invitations")
+    parser.add_argument("--keep", action="store_true", help="do not cancel the invitations afterwards")
+    parser.add_argument("--output", help="write the report as JSON")
+    args = parser.parse_args()
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(args.concurrency, 10))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    token = obtain_access_token(session, API_BASE_URL) or MOCK_ACCESS_TOKEN
+    headers = {'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'}
+
+    run_id = uuid.uuid4().hex[:8]
+    payloads = [invitation_payload(run_id, i, DELIVERY_CONFIG['email_domain']) for i in range(args.count)]
+
+    with SmtpSink(args.smtp_host, args.smtp_port) as sink:
+        print(f"📮 SMTP sink on {args.smtp_host}:{sink.port}")
+        print(f"📨 Creating {args.count} invitations against {API_BASE_URL}/invitations/ (run {run_id})")
+        invitations = create_invitations(session, headers, payloads, args.concurrency, DELIVERY_CONFIG['timeout'])
+
+        expected = {inv['email'] for inv in invitations if inv['status'] in (200, 201)}
+        sink.wait_for(lambda messages: expected <= {r for m in messages for r in m['recipients']},
+                      args.delivery_timeout)
+        report = correlate(invitations, sink)
+
+        resend = None
+        if args.resend:
+            targets = [inv for inv in invitations if inv.get('message') and inv.get('id')][:args.resend]
+            resend = resend_invitations(session, headers, targets, sink, DELIVERY_CONFIG['timeout'],
+                                        args.delivery_timeout)
+
+    print_delivery_report(report, resend)
+    if not args.keep:
+        cancel_invitations(session, headers, invitations, DELIVERY_CONFIG['timeout'])
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'delivery': report, 'resend': resend}, f, indent=2)
+        print(f"Wrote report to {args.output}")
+    return report['created'] > 0 and report['delivered'] == report['created']
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -8,6 +8,9 @@ import os
 import json
 from datetime import datetime
 
+from ferdi_event_log import log_test_event
+from ferdi_sources import read_source, source_exists
+
 class InvitationFrontendTester:
     def __init__(self):
         self.test_results = []
@@ -22,6 +25,8 @@ class InvitationFrontendTester:
             'details': details or {}
         }
         self.test_results.append(result)
+        if log_test_event(self, result):
+            return
         
         status = "✅ PASS" if success else "❌ FAIL"
         print(f"{status} {test_name}: {message}")
@@ -42,7 +47,7 @@ class InvitationFrontendTester:
             
             missing_pages = []
             for page in pages:
-                if not os.path.exists(page):
+                if not source_exists(page):
                     missing_pages.append(page)
             
             if not missing_pages:
@@ -72,7 +77,7 @@ class InvitationFrontendTester:
             
             missing_components = []
             for component in components:
-                if not os.path.exists(component):
+                if not source_exists(component):
                     missing_components.append(component)
             
             if not missing_components:
@@ -94,8 +99,7 @@ class InvitationFrontendTester:
         test_name = "Invitation Page Implementation"
         
         try:
-            with open('/app/app/invitations/page.js', 'r') as f:
-                content = f.read()
+            content = read_source('/app/app/invitations/page.js')
             
             required_features = {
                 'invitationsAPI import': 'invitationsAPI' in content,
@@ -131,8 +135,7 @@ class InvitationFrontendTester:
         test_name = "Invitation Accept Page Implementation"
         
         try:
-            with open('/app/app/invitations/accept/page.js', 'r') as f:
-                content = f.read()
+            content = read_source('/app/app/invitations/accept/page.js')
             
             required_features = {
                 'Token parameter handling': 'useSearchParams' in content and 'token' in content,
@@ -164,8 +167,7 @@ class InvitationFrontendTester:
         test_name = "Invitations Table Component"
         
         try:
-            with open('/app/components/invitations/invitations-table.jsx', 'r') as f:
-                content = f.read()
+            content = read_source('/app/components/invitations/invitations-table.jsx')
             
             required_features = {
                 'Status badges': 'getStatusBadge' in content,
@@ -199,8 +201,7 @@ class InvitationFrontendTester:
         test_name = "Create Invitation Modal"
         
         try:
-            with open('/app/components/invitations/create-invitation-modal.jsx', 'r') as f:
-                content = f.read()
+            content = read_source('/app/components/invitations/create-invitation-modal.jsx')
             
             required_features = {
                 'Form validation': 'useForm' in content and 'formErrors' in content,
@@ -235,8 +236,7 @@ class InvitationFrontendTester:
         test_name = "Invitation Accept Form"
         
         try:
-            with open('/app/components/invitations/invitation-accept-form.jsx', 'r') as f:
-                content = f.read()
+            content = read_source('/app/components/invitations/invitation-accept-form.jsx')
             
             required_features = {
                 'Form validation': 'useForm' in content and 'errors' in content,
@@ -272,8 +272,7 @@ class InvitationFrontendTester:
         test_name = "Role-Based Access Control"
         
         try:
-            with open('/app/app/invitations/page.js', 'r') as f:
-                content = f.read()
+            content = read_source('/app/app/invitations/page.js')
             
             # Check for proper role restrictions
             if "allowedRoles={['1', '2']}" in content:
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+FERDI Invitation Lifecycle Pipeline Benchmark
+Drives thousands of invitations concurrently through
+create -> resend (optional) -> accept or cancel, with a worker pool per stage so
+the stages overlap like real traffic. Reports per-stage throughput and
+latency, and samples GET /invitations/?active_only=true as the invitation
+table grows to show how listing degrades.
+
+Accept needs the invitation token: it is taken from the create response when
+the API returns it, otherwise from the delivered email when an SMTP sink port
+is given (see ferdi_smtp_sink.py).
+
+Usage:
+    python invitation_pipeline_benchmark.py --count 2000 --concurrency 16
+    python invitation_pipeline_benchmark.py --count 1000 --smtp-port 2525 --accept-ratio 0.7
+"""
+
+import argparse
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from ferdi_auth import MOCK_ACCESS_TOKEN, obtain_access_token
+from ferdi_benchmark import LatencyRecorder, percentile, print_latency_table
+from invitation_delivery_benchmark import invitation_payload
+
+# Configuration
+BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
+API_BASE_URL = f"{BASE_URL}/api"
+
+PIPELINE_CONFIG = {
+    'count': 1000,
+    'concurrency': 8,          # workers per stage
+    'resend_ratio': 0.2,
+    'accept_ratio': 0.5,       # the rest is cancelled
+    'list_checkpoints': 10,    # GET /invitations/ samples taken as the table grows
+    'list_samples': 5,
+    'list_limit': 100,
+    'token_timeout': 30.0,
+    'email_domain': 'example.test',
+    'timeout': 30,
+    'seed': 42
+}
+
+STAGES = ('create', 'resend', 'accept', 'cancel', 'list')
+OK_STATUSES = (200, 201, 202, 204)
+
+
+class InvitationPipeline:
+    """Per-stage worker pools connected by queues"""
+
+    def __init__(self, config: Dict[str, Any], sink=None):
+        self.config = config
+        self.sink = sink
+        self.random = random.Random(config['seed'])
+        self.random_lock = threading.Lock()
+        self.session = requests.Session()
+        pool = max(config['concurrency'] * len(STAGES), 10)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        token = obtain_access_token(self.session, API_BASE_URL) or MOCK_ACCESS_TOKEN
+        self.headers = {'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'}
+
+        self.queues = {stage: queue.Queue() for stage in STAGES}
+        self.recorders = {stage: LatencyRecorder() for stage in STAGES}
+        self.counts = {'created': 0, 'accepted': 0, 'cancelled': 0, 'no_token': 0, 'failed': 0}
+        self.counts_lock = threading.Lock()
+        self.in_flight = 0
+        self.done = threading.Event()
+        self.list_points: List[Dict[str, Any]] = []
+        self.next_checkpoint = 0
+        self.checkpoint_step = max(config['count'] // max(config['list_checkpoints'], 1), 1)
+
+    def _chance(self, ratio: float) -> bool:
+        with self.random_lock:
+            return self.random.random() < ratio
+
+    def _request(self, stage: str, method: str, path: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, f"{API_BASE_URL}{path}", headers=self.headers,
+                                            timeout=self.config['timeout'], **kwargs)
+            status, size = response.status_code, len(response.content)
+        except requests.exceptions.RequestException as e:
+            response, status, size = None, type(e).__name__, 0
+        self.recorders[stage].record(stage, (time.perf_counter() - started) * 1000.0, status, size,
+                                     status not in OK_STATUSES)
+        return response, status
+
+    def _count(self, key: str):
+        with self.counts_lock:
+            self.counts[key] += 1
+
+    def _finish(self):
+        with self.counts_lock:
+            self.in_flight -= 1
+            if self.in_flight == 0:
+                self.done.set()
+
+    def _stage_create(self, item):
+        response, status = self._request('create', 'POST', '/invitations/', json=item['payload'])
+        if status not in OK_STATUSES:
+            self._count('failed')
+            return self._finish()
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+        item['id'] = data.get('id')
+        item['token'] = data.get('token') or data.get('invitation_token')
+
+        with self.counts_lock:
+            self.counts['created'] += 1
+            created = self.counts['created']
+            checkpoint = created >= self.next_checkpoint
+            if checkpoint:
+                self.next_checkpoint = created + self.checkpoint_step
+                active = created - self.counts['accepted'] - self.counts['cancelled']
+        if checkpoint:
+            self.queues['list'].put({'created': created, 'active': active, 'phase': 'loaded'})
+
+        if not item['id']:
+            self._count('failed')
+            return self._finish()
+        next_stage = 'resend' if self._chance(self.config['resend_ratio']) else 'resolve'
+        self._route(next_stage, item)
+
+    def _stage_resend(self, item):
+        self._request('resend', 'POST', f"/invitations/{item['id']}/resend")
+        self._route('resolve', item)
+
+    def _route(self, stage: str, item):
+        if stage == 'resolve':
+            stage = 'accept' if self._chance(self.config['accept_ratio']) else 'cancel'
+        self.queues[stage].put(item)
+
+    def _stage_accept(self, item):
+        token = item.get('token') or self._token_from_inbox(item['payload']['email'])
+        if not token:
+            self._count('no_token')
+            self.queues['cancel'].put(item)  # Cannot accept without a token - retire it instead
+            return
+        _, status = self._request('accept', 'POST', '/invitations/accept', json={
+            "invitation_token": token,
+            "first_name": item['payload']['first_name'],
+            "last_name": item['payload']['last_name'],
+            "mobile": "0601234567",
+            "password": "SecurePassword123!"
+        })
+        self._count('accepted' if status in OK_STATUSES else 'failed')
+        self._finish()
+
+    def _token_from_inbox(self, email: str) -> Optional[str]:
+        if self.sink is None:
+            return None
+        self.sink.wait_for(lambda _: any(m['invitation_token'] for m in self.sink.find(recipient=email)),
+                           self.config['token_timeout'])
+        tokens = [m['invitation_token'] for m in self.sink.find(recipient=email) if m['invitation_token']]
+        return tokens[-1] if tokens else None
+
+    def _stage_cancel(self, item):
+        _, status = self._request('cancel', 'DELETE', f"/invitations/{item['id']}")
+        self._count('cancelled' if status in OK_STATUSES else 'failed')
+        self._finish()
+
+    def _stage_list(self, point):
+        latencies, sizes = [], []
+        for _ in range(self.config['list_samples']):
+            started = time.perf_counter()
+            response, status = self._request('list', 'GET', '/invitations/', params={
+                'active_only': 'true', 'limit': self.config['list_limit'], 'offset': 0
+            })
+            latencies.append((time.perf_counter() - started) * 1000.0)
+            sizes.append(len(response.content) if response is not None else 0)
+        latencies.sort()
+        point.update({'p50_ms': percentile(latencies, 50), 'p95_ms': percentile(latencies, 95),
+                      'bytes': sum(sizes) // max(len(sizes), 1)})
+        with self.counts_lock:
+            self.list_points.append(point)
+
+    def _worker(self, stage: str):
+        handler = getattr(self, f"_stage_{stage}")
+        while True:
+            item = self.queues[stage].get()
+            if item is None:
+                return
+            try:
+                handler(item)
+            except Exception as e:
+                print(f"❌ {stage} stage error: {str(e)}")
+                if stage != 'list':
+                    self._count('failed')
+                    self._finish()
+
+    def run(self, run_id: str) -> Dict[str, Any]:
+        workers = []
+        for stage in STAGES:
+            count = 1 if stage == 'list' else self.config['concurrency']
+            for _ in range(count):
+                thread = threading.Thread(target=self._worker, args=(stage,), daemon=True)
+                thread.start()
+                workers.append((stage, thread))
+
+        # Listing latency with an idle pipeline, before the table grows
+        self._stage_list({'created': 0, 'active': 0, 'phase': 'idle'})
+
+        started = time.perf_counter()
+        self.in_flight = self.config['count']
+        if self.in_flight == 0:
+            self.done.set()
+        for index in range(self.config['count']):
+            self.queues['create'].put({'payload': invitation_payload(run_id, index, self.config['email_domain'])})
+        self.done.wait()
+        elapsed = time.perf_counter() - started
+
+        for stage, _ in workers:
+            self.queues[stage].put(None)
+        for _, thread in workers:
+            thread.join()
+
+        # Same query on the grown table with the pipeline idle again, so table
+        # growth can be told apart from contention with the other stages
+        counts = self.counts
+        self._stage_list({'created': counts['created'], 'phase': 'idle',
+                          'active': counts['created'] - counts['accepted'] - counts['cancelled']})
+        return {'elapsed': elapsed, 'counts': dict(self.counts),
+                'list_points': self.list_points}
+
+
+def list_degradation(points: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Idle empty-vs-full p95 ratio, and the least-squares p95 slope over the loaded checkpoints"""
+    idle = [p for p in points if p['phase'] == 'idle']
+    loaded = sorted((p for p in points if p['phase'] == 'loaded'), key=lambda p: p['created'])
+    growth_ratio = idle[-1]['p95_ms'] / max(idle[0]['p95_ms'], 0.1) if len(idle) >= 2 else 1.0
+
+    slope = 0.0
+    if len(loaded) >= 2:
+        xs = [p['created'] for p in loaded]
+        ys = [p['p95_ms'] for p in loaded]
+        mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+        var_x = sum((x - mean_x) ** 2 for x in xs)
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x if var_x else 0.0
+    return {'ms_per_1000': slope * 1000.0, 'growth_ratio': growth_ratio}
+
+
+def print_pipeline_report(result: Dict[str, Any], recorders: Dict[str, LatencyRecorder]):
+    summaries = [recorders[stage].summary(stage) for stage in STAGES if recorders[stage].keys()]
+    print_latency_table(summaries, "INVITATION PIPELINE - per-stage latency and throughput", sort_key="count")
+    counts = result['counts']
+    print(f"Pipeline wall time: {result['elapsed']:.1f}s")
+    print(f"Created {counts['created']}, accepted {counts['accepted']}, cancelled {counts['cancelled']}, "
+          f"failed {counts['failed']}, accept without token {counts['no_token']}")
+    print()
+    print("📈 GET /invitations/?active_only=true as the table grows")
+    print(f"{'phase':>6}  {'created':>8}  {'active':>7}  {'p50':>9}  {'p95':>9}  {'bytes':>8}")
+    print("-" * 80)
+    for point in result['list_points']:
+        print(f"{point['phase']:>6}  {point['created']:>8}  {point['active']:>7}  {point['p50_ms']:>7.1f}ms  "
+              f"{point['p95_ms']:>7.1f}ms  {point['bytes']:>8}")
+    degradation = list_degradation(result['list_points'])
+    print(f"Idle p95, empty vs grown table: {degradation['growth_ratio']:.2f}x")
+    print(f"p95 slope under load: {degradation['ms_per_1000']:+.2f} ms per 1000 invitations")
+    print("=" * 80)
+    return degradation
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FERDI invitation lifecycle pipeline benchmark")
+    parser.add_argument("--count", type=int, default=PIPELINE_CONFIG['count'])
+    parser.add_argument("--concurrency", type=int, default=PIPELINE_CONFIG['concurrency'], help="workers per stage")
+    parser.add_argument("--resend-ratio", type=float, default=PIPELINE_CONFIG['resend_ratio'])
+    parser.add_argument("--accept-ratio", type=float, default=PIPELINE_CONFIG['accept_ratio'])
+    parser.add_argument("--checkpoints", type=int, default=PIPELINE_CONFIG['list_checkpoints'])
+    parser.add_argument("--smtp-port", type=int, help="read accept tokens from an SMTP sink on this port")
+    parser.add_argument("--output", help="write the report as JSON")
+    args = parser.parse_args()
+
+    config = dict(PIPELINE_CONFIG, count=args.count, concurrency=args.concurrency,
+                  resend_ratio=args.resend_ratio, accept_ratio=args.accept_ratio,
+                  list_checkpoints=args.checkpoints)
+    sink = None
+    if args.smtp_port:
+        from ferdi_smtp_sink import SmtpSink
+        sink = SmtpSink(port=args.smtp_port).start()
+
+    run_id = uuid.uuid4().hex[:8]
+    print(f"🏭 Driving {args.count} invitations through the lifecycle against {API_BASE_URL} (run {run_id})")
+    try:
+        pipeline = InvitationPipeline(config, sink)
+        result = pipeline.run(run_id)
+    finally:
+        if sink:
+            sink.stop()
+
+    degradation = print_pipeline_report(result, pipeline.recorders)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'stages': {stage: pipeline.recorders[stage].summary(stage) for stage in STAGES},
+                'counts': result['counts'],
+                'list_points': result['list_points'],
+                'list_degradation': degradation
+            }, f, indent=2)
+        print(f"Wrote report to {args.output}")
+    return result['counts']['failed'] == 0
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
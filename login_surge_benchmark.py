@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+FERDI Shift-Start Login Surge Benchmark
+Reproduces the morning shift start: a pool of seeded DRIVER accounts logs in
+through POST /api/login/access-token (the proxy's form-encoding branch) with
+an arrival rate that ramps from zero to a target rate, then holds.
+
+The proxy treats the three login body encodings differently: urlencoded is
+passed through, multipart is re-encoded via request.formData(), and anything
+else is read as text. --encodings runs one surge per encoding and compares
+latency and the proxy's CPU time per login, sampled from /proc when the
+Next.js server runs on this host.
+
+Arrivals are open-loop - requests are issued on schedule whether or not
+earlier logins have finished - so a saturated backend shows up as queueing
+delay instead of silently slowing the generator down.
+
+Reported:
+- success rate, p50/p95/p99 login time
+- queueing delay: client-side dispatch lag plus the time spent waiting on the
+  backend beyond the unloaded login time
+- offered vs. completed logins per second over the run
+- how the password-hash cost bounds throughput per backend core
+- per encoding: proxy CPU milliseconds per login
+
+Usage:
+    python login_surge_benchmark.py --rate 50 --ramp 20 --hold 30
+    python login_surge_benchmark.py --seed 200          # create driver accounts first
+    python login_surge_benchmark.py --accounts drivers.json --backend-cores 4
+    python login_surge_benchmark.py --encodings urlencoded,multipart,json --rate 30
+"""
+
+import argparse
+import json
+import math
+import os
+import queue
+import statistics
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from ferdi_auth import LOGIN_ENCODINGS, MOCK_ACCESS_TOKEN, login, obtain_access_token
+from ferdi_benchmark import ProcessSampler, local_server_pid, percentile
+
+# Configuration
+BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
+API_BASE_URL = f"{BASE_URL}/api"
+
+SURGE_CONFIG = {
+    'rate': 20.0,            # target logins per second after the ramp
+    'ramp_seconds': 10.0,
+    'hold_seconds': 20.0,
+    'max_in_flight': 256,
+    'baseline_samples': 5,
+    'backend_cores': int(os.getenv('FERDI_BACKEND_CORES', '1')),
+    'bcrypt_rounds': 12,     # passlib/bcrypt default work factor
+    'settle_seconds': 5.0,   # pause between encodings so the backend drains
+    'timeout': 30
+}
+
+# Seeded driver accounts (see --seed)
+SURGE_EMAIL_DOMAIN = os.getenv('FERDI_SURGE_DOMAIN', 'transport-bretagne.fr')
+SURGE_PASSWORD = os.getenv('FERDI_SURGE_PASSWORD', 'DriverPass123!')
+FALLBACK_ACCOUNTS = [{'email': 'pierre.bernard@transport-bretagne.fr', 'password': 'DriverPass123!'}]
+
+
+def surge_account(index: int) -> Dict[str, str]:
+    return {'email': f"driver.surge{index:04d}@{SURGE_EMAIL_DOMAIN}", 'password': SURGE_PASSWORD}
+
+
+def seed_driver_accounts(count: int, session: requests.Session) -> List[Dict[str, str]]:
+    """Create DRIVER accounts through POST /users/ as the harness admin"""
+    token = obtain_access_token(session, API_BASE_URL) or MOCK_ACCESS_TOKEN
+    headers = {'Authorization': f'Bearer {token}'}
+    accounts = []
+    for index in range(count):
+        account = surge_account(index)
+        response = session.post(f"{API_BASE_URL}/users/", json={
+            'first_name': 'Chauffeur',
+            'last_name': f'Surge {index:04d}',
+            'email': account['email'],
+            'mobile': f"06{index:08d}",
+            'role': 'DRIVER',
+            'password': account['password']
+        }, headers=headers, timeout=SURGE_CONFIG['timeout'])
+        # 400/409: the account already exists from an earlier seed
+        if response.status_code in (200, 201, 400, 409):
+            accounts.append(account)
+        else:
+            print(f"⚠️  Seeding {account['email']} failed: {response.status_code}")
+    return accounts
+
+
+def arrival_offsets(rate: float, ramp: float, hold: float) -> List[float]:
+    """Arrival times for a rate ramping linearly 0 -> rate over `ramp` seconds, then constant.
+
+    During the ramp N(t) = rate * t^2 / (2 * ramp), so arrival i is at
+    sqrt(2 * ramp * i / rate); afterwards arrivals are spaced 1/rate apart.
+    """
+    if rate <= 0:
+        return []
+    ramp_arrivals = int(rate * ramp / 2) if ramp > 0 else 0
+    offsets = [math.sqrt(2 * ramp * i / rate) for i in range(1, ramp_arrivals + 1)]
+    hold_arrivals = int(rate * hold)
+    offsets.extend(ramp + (i + 1) / rate for i in range(hold_arrivals))
+    return offsets
+
+
+def measure_baseline(session: requests.Session, accounts: List[Dict[str, str]], samples: int,
+                     encoding: str = 'urlencoded') -> Optional[float]:
+    """Median unloaded login time in ms, used as the service-time estimate"""
+    latencies = []
+    for i in range(samples):
+        account = accounts[i % len(accounts)]
+        started = time.perf_counter()
+        try:
+            response = login(session, API_BASE_URL, account['email'], account['password'],
+                             timeout=SURGE_CONFIG['timeout'], encoding=encoding)
+        except requests.exceptions.RequestException:
+            continue
+        if response.status_code == 200:
+            latencies.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(latencies) if latencies else None
+
+
+def measure_hash_cost(rounds: int) -> Optional[float]:
+    """Local bcrypt cost in ms at the given work factor, when bcrypt is installed"""
+    try:
+        import bcrypt
+    except ImportError:
+        return None
+    hashed = bcrypt.hashpw(b'DriverPass123!', bcrypt.gensalt(rounds))
+    started = time.perf_counter()
+    bcrypt.checkpw(b'DriverPass123!', hashed)
+    return (time.perf_counter() - started) * 1000.0
+
+
+def run_surge(accounts: List[Dict[str, str]], rate: float, ramp: float, hold: float,
+              max_in_flight: int = 256, timeout: float = 30,
+              encoding: str = 'urlencoded') -> List[Dict[str, Any]]:
+    """Issue logins on the ramp schedule and return one outcome per arrival"""
+    offsets = arrival_offsets(rate, ramp, hold)
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=max_in_flight)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    pending: 'queue.Queue[Optional[Dict[str, Any]]]' = queue.Queue()
+    outcomes: List[Dict[str, Any]] = []
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            picked = time.perf_counter()
+            account = accounts[item['index'] % len(accounts)]
+            try:
+                response = login(session, API_BASE_URL, account['email'], account['password'],
+                                 timeout=timeout, encoding=encoding)
+                status = response.status_code
+            except requests.exceptions.Timeout:
+                status = 'timeout'
+            except requests.exceptions.RequestException as e:
+                status = type(e).__name__
+            done = time.perf_counter()
+            with lock:
+                outcomes.append({
+                    'offset': item['offset'],
+                    'dispatch_lag_ms': (picked - item['due']) * 1000.0,
+                    'latency_ms': (done - picked) * 1000.0,
+                    'completed_offset': done - item['start'],
+                    'status': status
+                })
+
+    workers = [threading.Thread(target=worker, daemon=True) for _ in range(max(max_in_flight, 1))]
+    for thread in workers:
+        thread.start()
+
+    start = time.perf_counter()
+    for index, offset in enumerate(offsets):
+        due = start + offset
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        pending.put({'index': index, 'offset': offset, 'due': due, 'start': start})
+
+    for _ in workers:
+        pending.put(None)
+    for thread in workers:
+        thread.join()
+    return sorted(outcomes, key=lambda o: o['offset'])
+
+
+def analyse_surge(outcomes: List[Dict[str, Any]], baseline_ms: Optional[float], backend_cores: int,
+                  hash_cost_ms: Optional[float] = None) -> Dict[str, Any]:
+    """Success rate, latency and queueing percentiles, per-second throughput and capacity bounds"""
+    successes = [o for o in outcomes if o['status'] == 200]
+    latencies = sorted(o['latency_ms'] for o in outcomes)
+    service_ms = baseline_ms or (percentile(sorted(o['latency_ms'] for o in successes), 5) if successes else 0.0)
+    queueing = sorted(o['dispatch_lag_ms'] + max(o['latency_ms'] - service_ms, 0.0) for o in outcomes)
+
+    statuses: Dict[str, int] = {}
+    for outcome in outcomes:
+        statuses[str(outcome['status'])] = statuses.get(str(outcome['status']), 0) + 1
+
+    windows: Dict[int, Dict[str, Any]] = {}
+    for outcome in outcomes:
+        offered = windows.setdefault(int(outcome['offset']), {'offered': 0, 'completed': 0, 'ok': 0, 'latencies': []})
+        offered['offered'] += 1
+        done = windows.setdefault(int(outcome['completed_offset']), {'offered': 0, 'completed': 0, 'ok': 0, 'latencies': []})
+        done['completed'] += 1
+        done['latencies'].append(outcome['latency_ms'])
+        if outcome['status'] == 200:
+            done['ok'] += 1
+    timeline = []
+    for second in sorted(windows):
+        window = windows[second]
+        lat = sorted(window['latencies'])
+        timeline.append({'second': second, 'offered': window['offered'], 'completed': window['completed'],
+                         'succeeded': window['ok'], 'p99_ms': percentile(lat, 99)})
+
+    peak_ok = max((w['succeeded'] for w in timeline), default=0)
+    capacity = {
+        'service_time_ms': service_ms,
+        'logins_per_core_bound': (1000.0 / service_ms) if service_ms else 0.0,
+        'predicted_capacity_rps': (1000.0 / service_ms * backend_cores) if service_ms else 0.0,
+        'observed_peak_rps': peak_ok,
+        'observed_per_core_rps': peak_ok / max(backend_cores, 1),
+        'backend_cores': backend_cores,
+        'hash_cost_ms': hash_cost_ms,
+        'hash_bound_per_core_rps': (1000.0 / hash_cost_ms) if hash_cost_ms else None
+    }
+
+    return {
+        'requests': len(outcomes),
+        'success_rate': len(successes) / len(outcomes) if outcomes else 0.0,
+        'statuses': statuses,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+        'queueing_p50_ms': percentile(queueing, 50),
+        'queueing_p99_ms': percentile(queueing, 99),
+        'dispatch_lag_p99_ms': percentile(sorted(o['dispatch_lag_ms'] for o in outcomes), 99),
+        'timeline': timeline,
+        'capacity': capacity
+    }
+
+
+def print_surge_report(report: Dict[str, Any], rate: float):
+    print("=" * 80)
+    print(f"📊 LOGIN SURGE - ramp to {rate:g} logins/s ({report.get('encoding', 'urlencoded')})")
+    print("=" * 80)
+    print(f"Logins issued: {report['requests']}")
+    print(f"Success rate: {report['success_rate'] * 100:.1f}%  {report['statuses']}")
+    print(f"Login time: p50 {report['p50_ms']:.1f} ms, p95 {report['p95_ms']:.1f} ms, p99 {report['p99_ms']:.1f} ms")
+    print(f"Queueing delay: p50 {report['queueing_p50_ms']:.1f} ms, p99 {report['queueing_p99_ms']:.1f} ms "
+          f"(client dispatch lag p99 {report['dispatch_lag_p99_ms']:.1f} ms)")
+    if report.get('proxy'):
+        print(f"Proxy CPU: {report['proxy']['cpu_ms_per_login']:.2f} ms per login, "
+              f"{report['proxy']['cpu_utilisation'] * 100:.0f}% of a core, "
+              f"RSS peak +{report['proxy']['rss_growth'] / 1024 / 1024:.1f} MB")
+    print()
+    print(f"{'second':>6}  {'offered':>7}  {'done':>6}  {'ok':>6}  {'p99':>9}")
+    print("-" * 80)
+    for window in report['timeline']:
+        print(f"{window['second']:>6}  {window['offered']:>7}  {window['completed']:>6}  "
+              f"{window['succeeded']:>6}  {window['p99_ms']:>7.1f}ms")
+    print()
+
+    capacity = report['capacity']
+    print("🔐 PASSWORD-HASH CAPACITY")
+    print("-" * 80)
+    print(f"Unloaded login time: {capacity['service_time_ms']:.1f} ms "
+          f"-> at most {capacity['logins_per_core_bound']:.1f} logins/s per backend core")
+    if capacity['hash_cost_ms'] is not None:
+        print(f"Local bcrypt verify: {capacity['hash_cost_ms']:.1f} ms "
+              f"-> hash-bound ceiling {capacity['hash_bound_per_core_rps']:.1f} logins/s per core")
+    else:
+        print("Local bcrypt verify: not measured (pip install bcrypt to compare)")
+    print(f"Predicted capacity with {capacity['backend_cores']} core(s): {capacity['predicted_capacity_rps']:.1f} logins/s")
+    print(f"Observed peak: {capacity['observed_peak_rps']} logins/s "
+          f"({capacity['observed_per_core_rps']:.1f} per core)")
+    if rate > capacity['predicted_capacity_rps'] > 0:
+        print(f"⚠️  Target rate exceeds the hash-bound capacity - expect queueing to grow for the whole hold phase")
+    print("=" * 80)
+
+
+def proxy_usage(sampler: ProcessSampler, start_index: int, requests_sent: int) -> Dict[str, Any]:
+    """Proxy CPU and memory over one surge, normalised per login"""
+    usage = sampler.window(start_index, sampler.mark())
+    usage['cpu_ms_per_login'] = usage['cpu_seconds'] * 1000.0 / requests_sent if requests_sent else 0.0
+    return usage
+
+
+def print_encoding_comparison(reports: List[Dict[str, Any]]):
+    """Side-by-side latency and proxy CPU per login body encoding"""
+    print("=" * 80)
+    print("📊 LOGIN BODY ENCODINGS - urlencoded vs multipart vs JSON")
+    print("=" * 80)
+    print(f"{'encoding':<12}  {'success':>8}  {'p50':>9}  {'p99':>9}  {'queue p99':>10}  {'proxy CPU/login':>16}")
+    print("-" * 80)
+    for report in reports:
+        if report.get('skipped'):
+            print(f"{report['encoding']:<12}  {'-':>8}  baseline logins failed ({report['skipped']})")
+            continue
+        cpu = f"{report['proxy']['cpu_ms_per_login']:.2f} ms" if report.get('proxy') else "n/a"
+        print(f"{report['encoding']:<12}  {report['success_rate'] * 100:>7.1f}%  {report['p50_ms']:>7.1f}ms  "
+              f"{report['p99_ms']:>7.1f}ms  {report['queueing_p99_ms']:>8.1f}ms  {cpu:>16}")
+    print("-" * 80)
+
+    usable = [r for r in reports if not r.get('skipped') and r['success_rate'] >= 0.99]
+    if not usable:
+        print("❌ No encoding sustained the surge")
+    else:
+        def cost(report):
+            proxy_ms = report['proxy']['cpu_ms_per_login'] if report.get('proxy') else 0.0
+            return (proxy_ms, report['p99_ms'])
+
+        best = min(usable, key=cost)
+        basis = "proxy CPU per login" if best.get('proxy') else "p99 login time"
+        print(f"✅ Recommended for the mobile client: {best['encoding']} (lowest {basis} among encodings "
+              f"with >= 99% success)")
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FERDI shift-start login surge benchmark")
+    parser.add_argument("--rate", type=float, default=SURGE_CONFIG['rate'], help="target logins per second")
+    parser.add_argument("--ramp", type=float, default=SURGE_CONFIG['ramp_seconds'], help="seconds to reach the rate")
+    parser.add_argument("--hold", type=float, default=SURGE_CONFIG['hold_seconds'], help="seconds at the target rate")
+    parser.add_argument("--max-in-flight", type=int, default=SURGE_CONFIG['max_in_flight'])
+    parser.add_argument("--accounts", help="JSON list of {email, password} driver accounts")
+    parser.add_argument("--seed", type=int, metavar="N", help="create N driver accounts before the surge")
+    parser.add_argument("--backend-cores", type=int, default=SURGE_CONFIG['backend_cores'])
+    parser.add_argument("--bcrypt-rounds", type=int, default=SURGE_CONFIG['bcrypt_rounds'])
+    parser.add_argument("--encodings", default="urlencoded",
+                        help=f"comma-separated login body encodings to compare ({', '.join(LOGIN_ENCODINGS)})")
+    parser.add_argument("--proxy-pid", type=int, help="PID of the Next.js server (default: found by port)")
+    parser.add_argument("--output", help="write the report as JSON")
+    args = parser.parse_args()
+
+    encodings = [encoding.strip() for encoding in args.encodings.split(',') if encoding.strip()]
+    unknown = [encoding for encoding in encodings if encoding not in LOGIN_ENCODINGS]
+    if unknown or not encodings:
+        print(f"❌ Unknown encodings {unknown} - choose from {', '.join(LOGIN_ENCODINGS)}")
+        return False
+
+    session = requests.Session()
+    if args.seed:
+        accounts = seed_driver_accounts(args.seed, session)
+        print(f"🌱 Seeded {len(accounts)} driver accounts")
+    elif args.accounts:
+        with open(args.accounts, 'r', encoding='utf-8') as f:
+            accounts = json.load(f)
+    else:
+        accounts = FALLBACK_ACCOUNTS
+        print(f"⚠️  No driver pool given - every arrival logs in as {accounts[0]['email']}")
+    if not accounts:
+        print("❌ No driver accounts available")
+        return False
+
+    pid = local_server_pid(BASE_URL, args.proxy_pid)
+    sampler = ProcessSampler(pid) if pid else None
+    if sampler and not sampler.available:
+        sampler = None
+    if sampler:
+        sampler.start()
+
+    print(f"🚀 Login surge against {API_BASE_URL}/login/access-token")
+    print(f"   {len(accounts)} accounts, 0 -> {args.rate:g}/s over {args.ramp:g}s, hold {args.hold:g}s")
+    print(f"   Encodings: {', '.join(encodings)}"
+          + (f" - sampling proxy PID {pid}" if sampler else " - proxy CPU not sampled"))
+    hash_cost = measure_hash_cost(args.bcrypt_rounds)
+
+    reports = []
+    try:
+        for position, encoding in enumerate(encodings):
+            if position:
+                time.sleep(SURGE_CONFIG['settle_seconds'])
+            baseline = measure_baseline(session, accounts, SURGE_CONFIG['baseline_samples'], encoding)
+            if baseline is None:
+                print(f"❌ Baseline {encoding} logins failed - check the driver accounts and the proxy's handling")
+                reports.append({'encoding': encoding, 'skipped': 'no successful baseline login', 'success_rate': 0.0})
+                continue
+
+            start_index = sampler.mark() if sampler else None
+            outcomes = run_surge(accounts, args.rate, args.ramp, args.hold, args.max_in_flight,
+                                 SURGE_CONFIG['timeout'], encoding)
+            report = analyse_surge(outcomes, baseline, args.backend_cores, hash_cost)
+            report['encoding'] = encoding
+            if sampler:
+                report['proxy'] = proxy_usage(sampler, start_index, len(outcomes))
+            print_surge_report(report, args.rate)
+            reports.append(report)
+    finally:
+        if sampler:
+            sampler.stop()
+
+    if len(reports) > 1:
+        print_encoding_comparison(reports)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(reports[0] if len(reports) == 1 else {'encodings': reports}, f, indent=2)
+        print(f"Wrote report to {args.output}")
+    return any(report['success_rate'] >= 0.99 for report in reports)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
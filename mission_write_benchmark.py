@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+FERDI Mission Write-Path Benchmark
+Creates missions at a target rate (open loop - arrivals do not wait for the
+backend) and drives each one through its write lifecycle:
+    POST /missions/
+    PUT /missions/{id}/assign-driver and /assign-vehicle, sent concurrently
+    PUT /missions/{id}/status  pending -> confirmed -> completed
+
+A share of the arrivals are conflict pairs: two missions in the same time
+slot that two dispatchers, on separate connections, staff with the same
+driver at the same instant. The backend should accept one and reject the
+other; both succeeding means the driver is double-booked.
+
+Reports sustained write throughput (per-second buckets, not just the
+average), schedule lag when the backend falls behind the target rate,
+per-operation latency, and the outcome of the contested assignments.
+Every mission created is deleted at the end (see ferdi_teardown.py).
+
+Usage:
+    python mission_write_benchmark.py --rate 20 --duration 60
+    python mission_write_benchmark.py --rate 5 --conflict-ratio 0.5 --keep-data
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from ferdi_auth import MOCK_ACCESS_TOKEN, obtain_access_token
+from ferdi_benchmark import LatencyRecorder, percentile, print_latency_table
+from ferdi_data_factory import current_namespace
+from ferdi_route_catalog import PATH_PARAM_VALUES
+from ferdi_teardown import current_tracker, print_teardown_report, teardown, track_session
+
+# Configuration
+BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
+API_BASE_URL = f"{BASE_URL}/api"
+
+MISSION_CONFIG = {
+    'rate': 10.0,             # missions created per second
+    'duration': 30.0,         # seconds of arrivals
+    'concurrency': 16,        # lifecycles in flight at most
+    'conflict_ratio': 0.2,    # share of arrivals that are a contested pair
+    'lifecycle': ('confirmed', 'completed'),
+    'slot_hours': 6,          # each mission gets its own slot so regular assignments never overlap
+    'timeout': 30,
+    'seed': 42
+}
+
+OK_STATUSES = (200, 201, 202, 204)
+# What a backend that detects the double booking answers the losing dispatcher
+REJECT_STATUSES = (400, 409, 422)
+
+SLOT_ORIGIN = datetime(2026, 3, 2, 6, 0, tzinfo=timezone.utc)
+
+
+def load_pool(session: requests.Session, headers: Dict[str, str], path: str, fallback: str) -> List[str]:
+    """Ids from a dashboard availability route, or the catalog placeholder"""
+    try:
+        response = session.get(f"{API_BASE_URL}{path}", headers=headers, timeout=MISSION_CONFIG['timeout'])
+        data = response.json().get('data', []) if response.status_code == 200 else []
+        ids = [item['id'] for item in data if isinstance(item, dict) and item.get('id')]
+    except (requests.exceptions.RequestException, ValueError, AttributeError):
+        ids = []
+    return ids or [fallback]
+
+
+def slot(index: int, hours: int) -> Tuple[str, str]:
+    departure = SLOT_ORIGIN + timedelta(hours=index * hours)
+    arrival = departure + timedelta(hours=max(hours - 1, 1))
+    return departure.strftime('%Y-%m-%dT%H:%M:%SZ'), arrival.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class MissionWriteBenchmark:
+    """Open-loop mission arrivals, each run through create, assignments and status changes"""
+
+    def __init__(self, config: Dict[str, Any], headers: Dict[str, str], drivers: List[str], vehicles: List[str]):
+        self.config = config
+        self.headers = dict(headers, **{'Content-Type': 'application/json'})
+        self.drivers = drivers
+        self.vehicles = vehicles
+        self.tenant = current_namespace()
+        self.recorder = LatencyRecorder()
+        pool = max(config['concurrency'] * 2, 10)
+        self.session = self._session(pool)
+        # Two dispatchers with their own connections, as two browsers would be
+        self.dispatchers = [self._session(pool), self._session(pool)]
+
+        self.lock = threading.Lock()
+        self.counts = {'missions': 0, 'completed': 0, 'failed': 0, 'unstaffed': 0}
+        self.contested = {'pairs': 0, 'rejected': 0, 'double_booked': 0, 'both_rejected': 0, 'errors': 0,
+                          'requests': 0, 'non_2xx': 0}
+        self.write_seconds: Dict[int, int] = {}
+        self.lags: List[float] = []
+        self.started = 0.0
+        self.next_slot = 0
+
+    @staticmethod
+    def _session(pool: int) -> requests.Session:
+        session = track_session(requests.Session())
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _request(self, operation: str, method: str, path: str, body: Dict[str, Any],
+                 session: Optional[requests.Session] = None) -> Tuple[Any, Dict[str, Any]]:
+        session = session or self.session
+        started = time.perf_counter()
+        try:
+            response = session.request(method, f"{API_BASE_URL}{path}", json=body, headers=self.headers,
+                                       timeout=self.config['timeout'])
+            status, size = response.status_code, len(response.content)
+            try:
+                data = response.json()
+            except ValueError:
+                data = {}
+        except requests.exceptions.RequestException as e:
+            status, size, data = type(e).__name__, 0, {}
+        finished = time.perf_counter()
+        self.recorder.record(operation, (finished - started) * 1000.0, status, size, status not in OK_STATUSES)
+        if status in OK_STATUSES:
+            with self.lock:
+                second = int(finished - self.started)
+                self.write_seconds[second] = self.write_seconds.get(second, 0) + 1
+        return status, data if isinstance(data, dict) else {}
+
+    def _take_slot(self) -> Tuple[str, str]:
+        with self.lock:
+            index = self.next_slot
+            self.next_slot += 1
+        return slot(index, self.config['slot_hours'])
+
+    def _create(self, departure: str, arrival: str) -> Optional[str]:
+        status, data = self._request('create', 'POST', '/missions/',
+                                     self.tenant.mission(departure=departure, arrival=arrival))
+        mission_id = data.get('id') if status in OK_STATUSES else None
+        with self.lock:
+            self.counts['missions' if mission_id else 'failed'] += 1
+        return mission_id
+
+    def _advance(self, mission_id: str) -> bool:
+        """Status transitions, in order; stops at the first refused one"""
+        for status_value in self.config['lifecycle']:
+            status, _ = self._request('status', 'PUT', f"/missions/{mission_id}/status", {'status': status_value})
+            if status not in OK_STATUSES:
+                return False
+        return True
+
+    def _finish(self, completed: bool):
+        with self.lock:
+            self.counts['completed' if completed else 'failed'] += 1
+
+    def lifecycle(self, index: int):
+        """One mission: create, both assignments at once, then the status changes"""
+        mission_id = self._create(*self._take_slot())
+        if not mission_id:
+            return
+        driver = self.drivers[index % len(self.drivers)]
+        vehicle = self.vehicles[index % len(self.vehicles)]
+        outcome = {}
+        vehicle_thread = threading.Thread(target=lambda: outcome.update(vehicle=self._request(
+            'assign-vehicle', 'PUT', f"/missions/{mission_id}/assign-vehicle", {'vehicle_id': vehicle})[0]))
+        vehicle_thread.start()
+        driver_status, _ = self._request('assign-driver', 'PUT', f"/missions/{mission_id}/assign-driver",
+                                         {'driver_id': driver})
+        vehicle_thread.join()
+        assigned = driver_status in OK_STATUSES and outcome.get('vehicle') in OK_STATUSES
+        self._finish(assigned and self._advance(mission_id))
+
+    def contested_pair(self, index: int):
+        """Two missions in one slot, staffed with the same driver by two dispatchers at once"""
+        departure, arrival = self._take_slot()
+        missions = [self._create(departure, arrival), self._create(departure, arrival)]
+        if not all(missions):
+            return
+        driver = self.drivers[index % len(self.drivers)]
+        barrier = threading.Barrier(2)
+        statuses: List[Any] = [None, None]
+
+        def dispatch(which: int):
+            barrier.wait()
+            statuses[which] = self._request('contested-assign', 'PUT', f"/missions/{missions[which]}/assign-driver",
+                                            {'driver_id': driver}, self.dispatchers[which])[0]
+
+        threads = [threading.Thread(target=dispatch, args=(which,)) for which in (0, 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        accepted = [status in OK_STATUSES for status in statuses]
+        with self.lock:
+            self.contested['pairs'] += 1
+            self.contested['requests'] += 2
+            self.contested['non_2xx'] += accepted.count(False)
+            if any(status not in OK_STATUSES + REJECT_STATUSES for status in statuses):
+                self.contested['errors'] += 1
+            elif all(accepted):
+                self.contested['double_booked'] += 1
+            elif any(accepted):
+                self.contested['rejected'] += 1
+            else:
+                self.contested['both_rejected'] += 1
+        for mission_id, won in zip(missions, accepted):
+            if won:
+                self._finish(self._advance(mission_id))
+            else:
+                # The losing dispatcher's mission stays pending without a driver, as intended
+                with self.lock:
+                    self.counts['unstaffed'] += 1
+
+    def _arrival(self, index: int, scheduled: float):
+        with self.lock:
+            self.lags.append((time.perf_counter() - scheduled) * 1000.0)
+        try:
+            if self._is_contested(index):
+                self.contested_pair(index)
+            else:
+                self.lifecycle(index)
+        except Exception as e:
+            print(f"❌ Mission {index} failed: {str(e)}")
+            self._finish(False)
+
+    def _is_contested(self, index: int) -> bool:
+        # Drawn from a per-arrival generator so the choice does not depend on thread timing
+        return random.Random(self.config['seed'] * 1000003 + index).random() < self.config['conflict_ratio']
+
+    def run(self) -> Dict[str, Any]:
+        arrivals = int(self.config['rate'] * self.config['duration'])
+        interval = 1.0 / self.config['rate']
+        self.started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.config['concurrency'], thread_name_prefix="mission") as pool:
+            for index in range(arrivals):
+                scheduled = self.started + index * interval
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self._arrival, index, scheduled)
+        elapsed = time.perf_counter() - self.started
+        return {'arrivals': arrivals, 'elapsed': elapsed}
+
+
+def sustained_throughput(write_seconds: Dict[int, int], elapsed: float) -> Dict[str, float]:
+    """Successful writes per second: overall, and the median and worst full second"""
+    full = sorted(write_seconds.get(second, 0) for second in range(1, max(int(elapsed) - 1, 1)))
+    total = sum(write_seconds.values())
+    return {
+        'average': total / elapsed if elapsed > 0 else 0.0,
+        'median': percentile(full, 50) if full else 0.0,
+        'worst': full[0] if full else 0.0
+    }
+
+
+def print_write_report(benchmark: MissionWriteBenchmark, result: Dict[str, Any]) -> Dict[str, Any]:
+    print_latency_table(benchmark.recorder.summaries(), "MISSION WRITE PATH - per-operation latency",
+                        sort_key="count")
+    config, counts, contested = benchmark.config, benchmark.counts, benchmark.contested
+    throughput = sustained_throughput(benchmark.write_seconds, result['elapsed'])
+    lags = sorted(benchmark.lags)
+    created_rate = counts['missions'] / result['elapsed'] if result['elapsed'] > 0 else 0.0
+    print(f"Target {config['rate']:.1f} arrivals/s for {config['duration']:.0f}s - {result['arrivals']} arrivals "
+          f"created {counts['missions']} missions ({created_rate:.1f}/s, contested pairs count twice), completed lifecycle {counts['completed']}, failed {counts['failed']}, "
+          f"left unstaffed by a rejected assignment {counts['unstaffed']}")
+    print(f"Sustained writes: {throughput['average']:.1f}/s average, {throughput['median']:.0f}/s median second, "
+          f"{throughput['worst']:.0f}/s worst second")
+    print(f"Schedule lag: p50 {percentile(lags, 50):.1f} ms, p99 {percentile(lags, 99):.1f} ms, "
+          f"max {lags[-1] if lags else 0.0:.1f} ms")
+    if lags and percentile(lags, 99) > 1000.0 / config['rate'] * 10:
+        print(f"⚠️  Arrivals fell behind the target rate - the write path saturates below "
+              f"{config['rate']:.1f} missions/s at concurrency {config['concurrency']}")
+    print()
+
+    print("🚦 SAME DRIVER ASSIGNED BY TWO DISPATCHERS AT ONCE")
+    print("-" * 80)
+    error_rate = contested['non_2xx'] / contested['requests'] * 100 if contested['requests'] else 0.0
+    if not contested['pairs']:
+        print("No contested pairs ran (raise --conflict-ratio)")
+    else:
+        print(f"Pairs: {contested['pairs']} - one accepted and one rejected: {contested['rejected']}, "
+              f"both accepted (double-booked): {contested['double_booked']}, "
+              f"both rejected: {contested['both_rejected']}, server errors: {contested['errors']}")
+        print(f"Error rate on contested assignments: {error_rate:.1f}% of {contested['requests']} requests "
+              f"(50% is the ideal - exactly one loser per pair)")
+        if contested['double_booked']:
+            print("❌ The backend lets two missions in the same slot share a driver")
+        if contested['errors']:
+            print("❌ Concurrent assignment produced server errors or timeouts instead of a clean rejection")
+    print("=" * 80)
+    return {'throughput': throughput, 'contested_error_rate': error_rate,
+            'lag_p99_ms': percentile(lags, 99), 'created_per_second': created_rate}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FERDI mission write-path throughput benchmark")
+    parser.add_argument("--rate", type=float, default=MISSION_CONFIG['rate'], help="missions created per second")
+    parser.add_argument("--duration", type=float, default=MISSION_CONFIG['duration'], help="seconds of arrivals")
+    parser.add_argument("--concurrency", type=int, default=MISSION_CONFIG['concurrency'])
+    parser.add_argument("--conflict-ratio", type=float, default=MISSION_CONFIG['conflict_ratio'],
+                        help="share of arrivals that are two dispatchers assigning the same driver")
+    parser.add_argument("--keep-data", action="store_true", help="do not delete the missions afterwards")
+    parser.add_argument("--output", help="write the report as JSON")
+    args = parser.parse_args()
+    if args.rate <= 0:
+        parser.error("--rate must be positive")
+
+    config = dict(MISSION_CONFIG, rate=args.rate, duration=args.duration, concurrency=args.concurrency,
+                  conflict_ratio=args.conflict_ratio)
+    session = requests.Session()
+    token = obtain_access_token(session, API_BASE_URL) or MOCK_ACCESS_TOKEN
+    headers = {'Authorization': f'Bearer {token}', 'Accept': 'application/json'}
+    drivers = load_pool(session, headers, '/dashboard/available-drivers', PATH_PARAM_VALUES['driver_id'])
+    vehicles = load_pool(session, headers, '/dashboard/available-vehicles', PATH_PARAM_VALUES['vehicle_id'])
+
+    print(f"🚌 Mission writes against {API_BASE_URL}: {config['rate']:.1f}/s for {config['duration']:.0f}s, "
+          f"{len(drivers)} drivers, {len(vehicles)} vehicles, {config['conflict_ratio']:.0%} contested")
+    benchmark = MissionWriteBenchmark(config, headers, drivers, vehicles)
+    try:
+        result = benchmark.run()
+    finally:
+        if not args.keep_data:
+            cleanup = teardown(current_tracker())
+    report = print_write_report(benchmark, result)
+    if not args.keep_data:
+        print_teardown_report(cleanup)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'config': {key: value for key, value in config.items() if key != 'lifecycle'},
+                'operations': benchmark.recorder.summaries(),
+                'counts': benchmark.counts,
+                'contested': benchmark.contested,
+                **report
+            }, f, indent=2)
+        print(f"Wrote report to {args.output}")
+    return benchmark.contested['double_booked'] == 0 and benchmark.contested['errors'] == 0
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+FERDI Bulk Planning Grid Benchmark
+Generates weekly planning grids - every driver paired with a vehicle on every
+working day - from 10 to 1000 resources over 1 to 8 weeks, and saves them
+through the proxy with PUT /planning/. For each grid size it measures:
+- save latency and request/response size
+- how long GET /planning/{drivers,vehicles}/{id}/availability takes to
+  show the saved assignment (polled for a few resources after every save)
+
+Consecutive saves of one grid rotate the drivers and vehicles across the
+missions, so every save really changes the availability being polled.
+
+It also runs conflicting saves: two planners save different grids for the
+same missions at the same instant, on separate connections. The planning
+read back afterwards must be exactly one of the two grids. A mix of both is
+a torn write; both saves succeeding means one planner's week was silently
+overwritten.
+
+Grid ids are tagged with the run's tenant (see ferdi_data_factory.py) so
+concurrent runs never touch each other's grid.
+
+Usage:
+    python planning_grid_benchmark.py
+    python planning_grid_benchmark.py --resources 10,100,1000 --weeks 1,4,8 --samples 3 --output planning.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from ferdi_auth import MOCK_ACCESS_TOKEN, obtain_access_token
+from ferdi_benchmark import LatencyRecorder, percentile
+from ferdi_data_factory import current_namespace
+
+# Configuration
+BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
+API_BASE_URL = f"{BASE_URL}/api"
+
+PLANNING_CONFIG = {
+    'resources': '10,100,1000',   # drivers + vehicles in the grid
+    'weeks': '1,4,8',
+    'samples': 5,                 # saves per grid size
+    'workdays': 5,                # Monday to Friday
+    'shift': ('07:30', '17:30'),
+    'probes': 4,                  # drivers and vehicles polled for availability after each save
+    'visibility_timeout': 10.0,   # seconds before a change counts as not visible
+    'poll_interval': 0.1,
+    'conflict_rounds': 5,
+    'conflict_grid': '100x1',     # resources x weeks of the conflicting saves
+    'timeout': 60
+}
+
+OK_STATUSES = (200, 201, 202, 204)
+# What a backend that detects the concurrent save answers the losing planner
+REJECT_STATUSES = (400, 409, 412, 422)
+
+GRID_ORIGIN = datetime(2026, 3, 2, tzinfo=timezone.utc)  # a Monday
+
+
+def parse_counts(text: str) -> List[int]:
+    return [int(part) for part in text.split(',') if part.strip()]
+
+
+def format_bytes(size: float) -> str:
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    if size >= 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size:.0f} B"
+
+
+class PlanningGrid:
+    """Missions for every driver/vehicle pair on every working day, and who staffs them"""
+
+    def __init__(self, prefix: str, resources: int, weeks: int, origin: datetime,
+                 workdays: int = PLANNING_CONFIG['workdays'], shift: Tuple[str, str] = PLANNING_CONFIG['shift']):
+        self.resources, self.weeks, self.shift = resources, weeks, shift
+        pairs = max(resources // 2, 1)
+        self.drivers = [f"{prefix}-driver-{index:04d}" for index in range(pairs)]
+        self.vehicles = [f"{prefix}-vehicle-{index:04d}" for index in range(pairs)]
+        self.days = [(origin + timedelta(days=week * 7 + day)).strftime('%Y-%m-%d')
+                     for week in range(weeks) for day in range(workdays)]
+        self.prefix = prefix
+
+    @property
+    def pairs(self) -> int:
+        return len(self.drivers)
+
+    @property
+    def size(self) -> int:
+        return self.pairs * len(self.days)
+
+    def mission_id(self, pair: int, day: int) -> str:
+        return f"{self.prefix}-mission-{pair:04d}-{day:03d}"
+
+    def date_range(self) -> Tuple[str, str]:
+        return self.days[0], self.days[-1]
+
+    def updates(self, rotation: int) -> List[Dict[str, Any]]:
+        """The whole grid; rotation shifts which driver and vehicle staff each mission"""
+        updates = []
+        for day, date in enumerate(self.days):
+            for pair in range(self.pairs):
+                resource = (pair + rotation) % self.pairs
+                updates.append({
+                    "mission_id": self.mission_id(pair, day),
+                    "driver_id": self.drivers[resource],
+                    "vehicle_id": self.vehicles[resource],
+                    "date": date,
+                    "start_time": self.shift[0],
+                    "end_time": self.shift[1]
+                })
+        return updates
+
+    def body(self, rotation: int) -> bytes:
+        return json.dumps({"updates": self.updates(rotation)}).encode('utf-8')
+
+    def staffing(self, rotation: int) -> Dict[str, str]:
+        """mission id -> driver id for a rotation"""
+        return {update['mission_id']: update['driver_id'] for update in self.updates(rotation)}
+
+    def expected_mission(self, resource: int, rotation: int, day: int) -> str:
+        """The mission a resource staffs on a day under a rotation"""
+        return self.mission_id((resource - rotation) % self.pairs, day)
+
+
+class PlanningGridBenchmark:
+    """Saves grids of growing size and follows each save through to the availability routes"""
+
+    def __init__(self, config: Dict[str, Any], headers: Dict[str, str]):
+        self.config = config
+        self.headers = dict(headers, **{'Content-Type': 'application/json'})
+        self.tenant = current_namespace()
+        pool = max(config['probes'] * 2, 10)
+        self.session = self._session(pool)
+        # Two planners with their own connections, as two browsers would be
+        self.planners = [self._session(pool), self._session(pool)]
+        self.recorder = LatencyRecorder()
+        self.cells: List[Dict[str, Any]] = []
+        self.conflicts = {'rounds': 0, 'one_rejected': 0, 'both_accepted': 0, 'both_rejected': 0, 'errors': 0,
+                          'torn': 0, 'unverified': 0}
+        self.grids = 0
+
+    @staticmethod
+    def _session(pool: int) -> requests.Session:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _grid(self, resources: int, weeks: int) -> PlanningGrid:
+        # Every grid gets its own weeks of the calendar so grids never overlap
+        origin = GRID_ORIGIN + timedelta(weeks=self.grids * 9)
+        self.grids += 1
+        return PlanningGrid(f"{self.tenant.tenant}-{resources}r{weeks}w", resources, weeks, origin,
+                            self.config['workdays'], self.config['shift'])
+
+    def save(self, grid: PlanningGrid, rotation: int, key: str,
+             session: Optional[requests.Session] = None) -> Tuple[Any, int, float]:
+        """PUT the grid; returns (status, request bytes, perf_counter when the response arrived)"""
+        body = grid.body(rotation)
+        started = time.perf_counter()
+        try:
+            response = (session or self.session).put(f"{API_BASE_URL}/planning/", data=body, headers=self.headers,
+                                                     timeout=self.config['timeout'])
+            status, size = response.status_code, len(response.content)
+        except requests.exceptions.RequestException as e:
+            status, size = type(e).__name__, 0
+        finished = time.perf_counter()
+        self.recorder.record(key, (finished - started) * 1000.0, status, size, status not in OK_STATUSES)
+        return status, len(body), finished
+
+    def _availability(self, kind: str, resource_id: str, date: str) -> List[Dict[str, Any]]:
+        try:
+            response = self.session.get(f"{API_BASE_URL}/planning/{kind}/{resource_id}/availability",
+                                        params={'start_date': date, 'end_date': date}, headers=self.headers,
+                                        timeout=self.config['timeout'])
+            entries = response.json().get('availability', []) if response.status_code == 200 else []
+        except (requests.exceptions.RequestException, ValueError, AttributeError):
+            return []
+        return [entry for entry in entries if isinstance(entry, dict)] if isinstance(entries, list) else []
+
+    def wait_visible(self, kind: str, resource_id: str, date: str, mission_id: str, saved_at: float) -> Optional[float]:
+        """Milliseconds from the save response until availability shows the mission, or None on timeout"""
+        deadline = saved_at + self.config['visibility_timeout']
+        while True:
+            entries = self._availability(kind, resource_id, date)
+            if any(entry.get('date') == date and entry.get('mission_id') == mission_id for entry in entries):
+                return (time.perf_counter() - saved_at) * 1000.0
+            if time.perf_counter() >= deadline:
+                return None
+            time.sleep(self.config['poll_interval'])
+
+    def probe(self, grid: PlanningGrid, rotation: int, saved_at: float) -> List[Optional[float]]:
+        """Poll availability for a spread of drivers and vehicles on the grid's last day"""
+        day = len(grid.days) - 1
+        count = min(self.config['probes'], grid.pairs)
+        resources = sorted({index * grid.pairs // count for index in range(count)}) if count else []
+        jobs = [(kind, ids[resource], grid.expected_mission(resource, rotation, day))
+                for resource in resources
+                for kind, ids in (('drivers', grid.drivers), ('vehicles', grid.vehicles))]
+        if not jobs:
+            return []
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            return list(pool.map(lambda job: self.wait_visible(job[0], job[1], grid.days[day], job[2], saved_at), jobs))
+
+    def run_cell(self, resources: int, weeks: int) -> Dict[str, Any]:
+        grid = self._grid(resources, weeks)
+        key = f"{resources}x{weeks}w"
+        lags: List[float] = []
+        missed = 0
+        request_bytes = 0
+        for rotation in range(self.config['samples']):
+            status, request_bytes, saved_at = self.save(grid, rotation, key)
+            if status not in OK_STATUSES:
+                continue
+            for lag in self.probe(grid, rotation, saved_at):
+                if lag is None:
+                    missed += 1
+                else:
+                    lags.append(lag)
+        lags.sort()
+        cell = {
+            'resources': resources, 'weeks': weeks, 'assignments': grid.size, 'request_bytes': request_bytes,
+            'save': self.recorder.summary(key),
+            'visibility': {
+                'probes': len(lags) + missed, 'not_visible': missed,
+                'p50_ms': percentile(lags, 50), 'p95_ms': percentile(lags, 95), 'max_ms': lags[-1] if lags else 0.0
+            }
+        }
+        self.cells.append(cell)
+        return cell
+
+    def read_back(self, grid: PlanningGrid, staffings: List[Dict[str, str]]) -> Optional[str]:
+        """Which staffing the stored planning matches: an index, 'mixed', or None when it cannot be read"""
+        start, end = grid.date_range()
+        try:
+            response = self.session.get(f"{API_BASE_URL}/planning/", params={'start_date': start, 'end_date': end},
+                                        headers=self.headers, timeout=self.config['timeout'])
+            missions = response.json().get('missions', []) if response.status_code == 200 else []
+        except (requests.exceptions.RequestException, ValueError, AttributeError):
+            return None
+        stored = {mission.get('id'): mission.get('driver_id') for mission in missions
+                  if isinstance(mission, dict) and mission.get('id') in staffings[0]}
+        if len(stored) < len(staffings[0]):
+            return None
+        for index, staffing in enumerate(staffings):
+            if stored == staffing:
+                return index
+        return 'mixed'
+
+    def conflict_round(self, grid: PlanningGrid, round_index: int):
+        """Two planners save different staffings of the same grid at the same instant"""
+        rotations = (2 * round_index + 1, 2 * round_index + 2)
+        barrier = threading.Barrier(2)
+        statuses: List[Any] = [None, None]
+
+        def plan(which: int):
+            barrier.wait()
+            statuses[which] = self.save(grid, rotations[which], 'conflicting-save', self.planners[which])[0]
+
+        threads = [threading.Thread(target=plan, args=(which,)) for which in (0, 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        accepted = [status in OK_STATUSES for status in statuses]
+        stored = self.read_back(grid, [grid.staffing(rotation) for rotation in rotations])
+        counts = self.conflicts
+        counts['rounds'] += 1
+        if any(status not in OK_STATUSES + REJECT_STATUSES for status in statuses):
+            counts['errors'] += 1
+        elif all(accepted):
+            counts['both_accepted'] += 1
+        elif any(accepted):
+            counts['one_rejected'] += 1
+        else:
+            counts['both_rejected'] += 1
+        if stored is None:
+            counts['unverified'] += 1
+        elif stored == 'mixed' or (any(accepted) and not accepted[stored]):
+            # Half of each grid, or the rejected planner's grid on disk
+            counts['torn'] += 1
+
+    def run_conflicts(self, resources: int, weeks: int, rounds: int):
+        if rounds <= 0:
+            return
+        grid = self._grid(resources, weeks)
+        self.save(grid, 0, 'conflict-setup')
+        for round_index in range(rounds):
+            self.conflict_round(grid, round_index)
+
+
+def print_planning_report(benchmark: PlanningGridBenchmark, conflict_grid: str) -> bool:
+    print("=" * 80)
+    print("🗓️  PLANNING GRID SAVES - PUT /planning/ through the proxy")
+    print("=" * 80)
+    print(f"{'Grid':<12}{'assign.':>8}{'request':>11}{'p50':>10}{'p95':>10}{'max':>10}"
+          f"{'per 1k':>9}{'resp':>10}{'err%':>7}")
+    print("-" * 80)
+    for cell in benchmark.cells:
+        save = cell['save']
+        per_thousand = save['p50_ms'] / cell['assignments'] * 1000 if cell['assignments'] else 0.0
+        print(f"{cell['resources']:>4} x {cell['weeks']}w  {cell['assignments']:>8}"
+              f"{format_bytes(cell['request_bytes']):>11}{save['p50_ms']:>8.1f}ms{save['p95_ms']:>8.1f}ms"
+              f"{save['max_ms']:>8.1f}ms{per_thousand:>7.1f}ms{format_bytes(save['mean_bytes']):>10}"
+              f"{save['error_rate'] * 100:>7.1f}")
+    print("-" * 80)
+    print("per 1k: p50 save time per 1000 assignments - it falls while fixed overhead dominates, "
+          "then should level off; a rise means saves cost more than linear in grid size")
+    print()
+
+    print("👀 AVAILABILITY VISIBILITY - save response until availability shows the new assignment")
+    print("-" * 80)
+    print(f"{'Grid':<12}{'probes':>8}{'p50':>12}{'p95':>12}{'max':>12}{'not visible':>14}")
+    for cell in benchmark.cells:
+        visibility = cell['visibility']
+        print(f"{cell['resources']:>4} x {cell['weeks']}w  {visibility['probes']:>8}{visibility['p50_ms']:>10.0f}ms"
+              f"{visibility['p95_ms']:>10.0f}ms{visibility['max_ms']:>10.0f}ms{visibility['not_visible']:>14}")
+    missed = sum(cell['visibility']['not_visible'] for cell in benchmark.cells)
+    if missed:
+        print(f"⚠️  {missed} availability probes never showed the saved assignment within "
+              f"{benchmark.config['visibility_timeout']:.0f}s")
+    print()
+
+    conflicts = benchmark.conflicts
+    print(f"🚦 CONFLICTING SAVES - two planners saving the same {conflict_grid} grid at once")
+    print("-" * 80)
+    healthy = True
+    if not conflicts['rounds']:
+        print("No conflicting saves ran (--conflict-rounds 0)")
+    else:
+        print(f"Rounds: {conflicts['rounds']} - one rejected: {conflicts['one_rejected']}, "
+              f"both accepted: {conflicts['both_accepted']}, both rejected: {conflicts['both_rejected']}, "
+              f"server errors: {conflicts['errors']}")
+        print(f"Stored planning: torn {conflicts['torn']}, could not be read back {conflicts['unverified']}")
+        if conflicts['torn']:
+            print("❌ The stored planning mixes both grids, or keeps the one that was rejected")
+            healthy = False
+        if conflicts['errors']:
+            print("❌ Concurrent saves produced server errors or timeouts instead of a clean rejection")
+            healthy = False
+        if conflicts['both_accepted']:
+            print("⚠️  Both saves were accepted - the later one silently overwrote the other planner's week")
+    print("=" * 80)
+    return healthy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FERDI bulk planning grid update benchmark")
+    parser.add_argument("--resources", default=PLANNING_CONFIG['resources'],
+                        help="comma-separated grid sizes in drivers + vehicles")
+    parser.add_argument("--weeks", default=PLANNING_CONFIG['weeks'], help="comma-separated grid lengths in weeks")
+    parser.add_argument("--samples", type=int, default=PLANNING_CONFIG['samples'], help="saves per grid size")
+    parser.add_argument("--probes", type=int, default=PLANNING_CONFIG['probes'],
+                        help="drivers and vehicles polled for availability after each save")
+    parser.add_argument("--visibility-timeout", type=float, default=PLANNING_CONFIG['visibility_timeout'])
+    parser.add_argument("--conflict-rounds", type=int, default=PLANNING_CONFIG['conflict_rounds'])
+    parser.add_argument("--conflict-grid", default=PLANNING_CONFIG['conflict_grid'],
+                        help="RESOURCESxWEEKS of the conflicting saves")
+    parser.add_argument("--output", help="write the report as JSON")
+    args = parser.parse_args()
+    try:
+        resources, weeks = parse_counts(args.resources), parse_counts(args.weeks)
+        conflict_resources, _, conflict_weeks = args.conflict_grid.lower().partition('x')
+        conflict_grid = (int(conflict_resources), int(conflict_weeks or 1))
+    except ValueError as e:
+        parser.error(str(e))
+
+    config = dict(PLANNING_CONFIG, samples=args.samples, probes=args.probes,
+                  visibility_timeout=args.visibility_timeout)
+    session = requests.Session()
+    token = obtain_access_token(session, API_BASE_URL) or MOCK_ACCESS_TOKEN
+    benchmark = PlanningGridBenchmark(config, {'Authorization': f'Bearer {token}', 'Accept': 'application/json'})
+
+    print(f"🗓️  Planning grids against {API_BASE_URL}: {len(resources)} sizes x {len(weeks)} lengths, "
+          f"{config['samples']} saves each")
+    for resource_count in resources:
+        for week_count in weeks:
+            cell = benchmark.run_cell(resource_count, week_count)
+            print(f"   {resource_count} resources x {week_count}w: {cell['assignments']} assignments, "
+                  f"p50 {cell['save']['p50_ms']:.1f} ms")
+    benchmark.run_conflicts(*conflict_grid, args.conflict_rounds)
+    healthy = print_planning_report(benchmark, f"{conflict_grid[0]}x{conflict_grid[1]}w")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'config': {key: value for key, value in config.items() if key != 'shift'},
+                'grids': benchmark.cells,
+                'conflicts': benchmark.conflicts,
+                'operations': benchmark.recorder.summaries()
+            }, f, indent=2)
+        print(f"Wrote report to {args.output}")
+    return healthy
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+FERDI Proxy Payload-Size Sweep
+The Next.js proxy (app/api/[[...path]]/route.js) buffers every request body
+with `await request.text()` and every JSON response with `response.json()`
+before re-serializing it. This sweep pushes growing bodies through that path
+and pulls growing list responses back, while sampling the proxy process's
+resident memory and CPU time from /proc.
+
+Request sweep:  PUT /planning/ and POST /missions/ with 1 KB .. 10 MB bodies
+Response sweep: GET /missions/, /users/ and /planning/ with growing page sizes
+
+For every step the report shows latency, effective MB/s and how far the
+proxy's RSS peaked above where it started. The first size where throughput
+collapses or memory grows by a multiple of the payload is flagged as the
+buffering knee.
+
+Usage:
+    python proxy_payload_benchmark.py
+    python proxy_payload_benchmark.py --sizes 1KB,100KB,1MB,10MB --repeat 10
+    python proxy_payload_benchmark.py --proxy-pid 4242 --output payload.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from ferdi_auth import MOCK_ACCESS_TOKEN, obtain_access_token
+from ferdi_benchmark import ProcessSampler, local_server_pid, percentile
+from ferdi_teardown import current_tracker, print_teardown_report, teardown, track_session
+
+# Configuration
+BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
+API_BASE_URL = f"{BASE_URL}/api"
+
+PAYLOAD_CONFIG = {
+    'sizes': '1KB,10KB,100KB,1MB,10MB',
+    'page_sizes': '10,100,1000,10000',
+    'repeat': 5,
+    'sample_interval': 0.02,
+    'rss_factor': 4.0,         # RSS growth per buffered byte that counts as a memory problem
+    'throughput_drop': 0.5,    # MB/s below this fraction of the best smaller step counts as a latency problem
+    'timeout': 120
+}
+
+REQUEST_ROUTES = [
+    ('PUT', '/planning/'),
+    ('POST', '/missions/'),
+]
+
+LIST_ROUTES = [
+    '/missions/',
+    '/users/',
+    '/planning/',
+]
+
+_UNITS = {'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3}
+
+
+def parse_size(text: str) -> int:
+    """'10MB' -> 10485760"""
+    value = text.strip().upper()
+    for unit in ('GB', 'MB', 'KB', 'B'):
+        if value.endswith(unit):
+            return int(float(value[:-len(unit)]) * _UNITS[unit])
+    return int(value)
+
+
+def format_size(size: float) -> str:
+    for unit in ('GB', 'MB', 'KB'):
+        if size >= _UNITS[unit]:
+            return f"{size / _UNITS[unit]:.1f} {unit}"
+    return f"{int(size)} B"
+
+
+def mission_body(size: int) -> bytes:
+    """Mission creation body padded to about size bytes through its notes"""
+    body = {
+        "title": f"Transfert gare de Quimper {uuid.uuid4().hex[:8]}",
+        "description": "Navette charge utile",
+        "start_date": "2026-03-02T07:30:00",
+        "end_date": "2026-03-02T09:00:00",
+        "pickup_address": "Place Louis Armand, 29000 Quimper",
+        "dropoff_address": "Aéroport de Quimper-Bretagne, 29700 Pluguffan",
+        "passengers": 40,
+        "notes": ""
+    }
+    filler = max(size - len(json.dumps(body).encode('utf-8')), 0)
+    body["notes"] = ("Arret supplementaire demande. " * (filler // 30 + 1))[:filler]
+    return json.dumps(body).encode('utf-8')
+
+
+def planning_body(size: int) -> bytes:
+    """Planning update body with as many assignments as fit in about size bytes"""
+    def entry(index):
+        return {
+            "driver_id": f"driver-{index % 250:04d}",
+            "vehicle_id": f"vehicle-{index % 120:04d}",
+            "mission_id": f"mission-{index:07d}",
+            "date": f"2026-03-{index % 28 + 1:02d}",
+            "start_time": "07:30",
+            "end_time": "09:00"
+        }
+
+    entry_bytes = len(json.dumps(entry(0)).encode('utf-8')) + 2
+    count = max(size // entry_bytes, 1)
+    return json.dumps({"assignments": [entry(i) for i in range(count)]}).encode('utf-8')
+
+
+REQUEST_BODIES = {
+    '/planning/': planning_body,
+    '/missions/': mission_body,
+}
+
+
+def list_params(route: str, page_size: int) -> Dict[str, Any]:
+    if route == '/planning/':
+        return {'start_date': '2026-01-01', 'end_date': '2026-12-31', 'limit': page_size}
+    return {'skip': 0, 'limit': page_size}
+
+
+class PayloadSweep:
+    """Runs request and response size steps and keeps one measurement per step"""
+
+    def __init__(self, session: requests.Session, headers: Dict[str, str],
+                 sampler: Optional[ProcessSampler], repeat: int, timeout: float):
+        self.session = session
+        self.headers = headers
+        self.sampler = sampler
+        self.repeat = max(repeat, 1)
+        self.timeout = timeout
+        self.steps: List[Dict[str, Any]] = []
+
+    def _measure(self, route: str, direction: str, target: int, send) -> Dict[str, Any]:
+        start_index = self.sampler.mark() if self.sampler else None
+        latencies, statuses, sent, received = [], {}, 0, 0
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            try:
+                status, request_bytes, response_bytes = send()
+            except requests.exceptions.RequestException as e:
+                status, request_bytes, response_bytes = type(e).__name__, 0, 0
+            latencies.append((time.perf_counter() - started) * 1000.0)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+            sent, received = max(sent, request_bytes), max(received, response_bytes)
+
+        latencies.sort()
+        payload = sent if direction == 'request' else received
+        step = {
+            'route': route,
+            'direction': direction,
+            'target': target,
+            'request_bytes': sent,
+            'response_bytes': received,
+            'payload_bytes': payload,
+            'statuses': statuses,
+            'p50_ms': percentile(latencies, 50),
+            'max_ms': latencies[-1],
+            'mb_per_s': (payload / _UNITS['MB']) / (percentile(latencies, 50) / 1000.0) if latencies[0] > 0 else 0.0
+        }
+        if self.sampler:
+            step.update(self.sampler.window(start_index, self.sampler.mark()))
+            step['rss_per_byte'] = step['rss_growth'] / payload if payload else 0.0
+        self.steps.append(step)
+        return step
+
+    def request_step(self, method: str, route: str, size: int) -> Dict[str, Any]:
+        body = REQUEST_BODIES[route](size)
+        headers = dict(self.headers, **{'Content-Type': 'application/json'})
+
+        def send():
+            response = self.session.request(method, f"{API_BASE_URL}{route}", data=body, headers=headers,
+                                            timeout=self.timeout)
+            return response.status_code, len(body), len(response.content)
+
+        return self._measure(f"{method} {route}", 'request', size, send)
+
+    def response_step(self, route: str, page_size: int) -> Dict[str, Any]:
+        params = list_params(route, page_size)
+
+        def send():
+            response = self.session.get(f"{API_BASE_URL}{route}", params=params, headers=self.headers,
+                                        timeout=self.timeout)
+            return response.status_code, 0, len(response.content)
+
+        return self._measure(f"GET {route}", 'response', page_size, send)
+
+
+def find_knees(steps: List[Dict[str, Any]], rss_factor: float, throughput_drop: float) -> Dict[str, Dict[str, Any]]:
+    """First step per route where memory or throughput stops scaling with payload size"""
+    knees: Dict[str, Dict[str, Any]] = {}
+    by_route: Dict[str, List[Dict[str, Any]]] = {}
+    for step in steps:
+        by_route.setdefault(step['route'], []).append(step)
+
+    for route, series in by_route.items():
+        best = 0.0
+        for step in sorted(series, key=lambda s: s['payload_bytes']):
+            reasons = []
+            if step.get('rss_per_byte', 0.0) > rss_factor and step['rss_growth'] > _UNITS['MB']:
+                reasons.append(f"RSS grew {step['rss_per_byte']:.1f}x the payload")
+            if best and step['mb_per_s'] < best * throughput_drop:
+                reasons.append(f"{step['mb_per_s']:.1f} MB/s vs {best:.1f} MB/s at smaller sizes")
+            if any(not s.isdigit() or int(s) >= 500 for s in step['statuses']):
+                reasons.append(f"failed with {sorted(step['statuses'])}")
+            if reasons:
+                step['flags'] = reasons
+                knees.setdefault(route, step)
+            best = max(best, step['mb_per_s'])
+    return knees
+
+
+def print_payload_report(steps: List[Dict[str, Any]], knees: Dict[str, Dict[str, Any]], sampled: bool):
+    print("=" * 80)
+    print("📊 PROXY PAYLOAD SWEEP - body buffering in forwardRequest")
+    print("=" * 80)
+    memory_header = f"  {'RSS start':>10}  {'RSS +peak':>10}  {'CPU s':>6}" if sampled else ""
+    print(f"{'Route':<18}  {'payload':>9}  {'p50':>9}  {'max':>9}  {'MB/s':>7}{memory_header}  status")
+    print("-" * 80)
+    for step in steps:
+        memory = ""
+        if sampled:
+            memory = (f"  {format_size(step['rss_start']):>10}  {format_size(step['rss_growth']):>10}  "
+                      f"{step['cpu_seconds']:>6.2f}")
+        flag = " ⚠️" if step.get('flags') else ""
+        statuses = ",".join(f"{k}x{v}" for k, v in sorted(step['statuses'].items()))
+        print(f"{step['route']:<18}  {format_size(step['payload_bytes']):>9}  {step['p50_ms']:>7.1f}ms  "
+              f"{step['max_ms']:>7.1f}ms  {step['mb_per_s']:>7.1f}{memory}  {statuses}{flag}")
+    print("-" * 80)
+    if not sampled:
+        print("ℹ️  Proxy process not sampled (not local, or pass --proxy-pid) - latency only")
+    if not knees:
+        print("✅ Latency and proxy memory scale with payload size across the sweep")
+    for route, step in knees.items():
+        print(f"⚠️  {route}: buffering knee at {format_size(step['payload_bytes'])} - {'; '.join(step['flags'])}")
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FERDI proxy payload-size sweep")
+    parser.add_argument("--sizes", default=PAYLOAD_CONFIG['sizes'], help="request body sizes, e.g. 1KB,1MB,10MB")
+    parser.add_argument("--page-sizes", default=PAYLOAD_CONFIG['page_sizes'], help="list limits for the response sweep")
+    parser.add_argument("--repeat", type=int, default=PAYLOAD_CONFIG['repeat'], help="requests per step")
+    parser.add_argument("--proxy-pid", type=int, help="PID of the Next.js server (default: found by port)")
+    parser.add_argument("--skip-requests", action="store_true")
+    parser.add_argument("--skip-responses", action="store_true")
+    parser.add_argument("--keep-data", action="store_true", help="do not delete the missions the sweep created")
+    parser.add_argument("--output", help="write the steps as JSON")
+    args = parser.parse_args()
+
+    sizes = [parse_size(size) for size in args.sizes.split(',') if size.strip()]
+    page_sizes = [int(size) for size in args.page_sizes.split(',') if size.strip()]
+
+    session = track_session(requests.Session())
+    token = obtain_access_token(session, API_BASE_URL) or MOCK_ACCESS_TOKEN
+    headers = {'Authorization': f'Bearer {token}', 'Accept': 'application/json'}
+
+    pid = local_server_pid(BASE_URL, args.proxy_pid)
+    sampler = ProcessSampler(pid, PAYLOAD_CONFIG['sample_interval']) if pid else None
+    if sampler and not sampler.available:
+        sampler = None
+    print(f"📦 Payload sweep against {API_BASE_URL}"
+          + (f" - sampling proxy PID {pid}" if sampler else " - proxy memory not sampled"))
+
+    sweep = PayloadSweep(session, headers, sampler, args.repeat, PAYLOAD_CONFIG['timeout'])
+    if sampler:
+        sampler.start()
+    try:
+        if not args.skip_requests:
+            for method, route in REQUEST_ROUTES:
+                for size in sizes:
+                    step = sweep.request_step(method, route, size)
+                    print(f"   {method} {route} {format_size(step['request_bytes'])}: {step['p50_ms']:.1f} ms")
+        if not args.skip_responses:
+            for route in LIST_ROUTES:
+                for page_size in page_sizes:
+                    step = sweep.response_step(route, page_size)
+                    print(f"   GET {route} limit={page_size} -> {format_size(step['response_bytes'])}: "
+                          f"{step['p50_ms']:.1f} ms")
+    finally:
+        if sampler:
+            sampler.stop()
+
+    knees = find_knees(sweep.steps, PAYLOAD_CONFIG['rss_factor'], PAYLOAD_CONFIG['throughput_drop'])
+    print_payload_report(sweep.steps, knees, sampler is not None)
+    if not args.keep_data:
+        print_teardown_report(teardown(current_tracker()))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'steps': sweep.steps, 'knees': {route: step['payload_bytes'] for route, step in knees.items()}},
+                      f, indent=2)
+        print(f"Wrote report to {args.output}")
+    return not any('failed' in flag for step in sweep.steps for flag in step.get('flags', []))
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
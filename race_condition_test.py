@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+FERDI Race Condition Testing - Uniqueness-Sensitive Endpoints
+Fires K identical or conflicting requests through a barrier so they reach the
+backend together, then verifies that exactly one of them wins:
+1. The same invitation accepted K times (POST /invitations/accept)
+2. K admins creating the same email (POST /users/)
+3. K company registrations with the same SIRET (POST /companies/register)
+
+Every racer warms its own connection before the barrier, so the requests
+leave within a few hundred microseconds of each other. The contended
+latencies are compared with an uncontended request of the same kind to show
+how much lock contention or retry time the backend adds.
+
+Usage:
+    python race_condition_test.py --racers 10
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from ferdi_auth import MOCK_ACCESS_TOKEN, obtain_access_token
+from ferdi_benchmark import percentile
+from ferdi_data_factory import current_namespace
+from ferdi_event_log import log_test_event
+from ferdi_http import create_session
+from ferdi_teardown import current_tracker, print_teardown_report, teardown, track_session
+
+# Test configuration
+BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
+API_BASE_URL = f"{BASE_URL}/api"
+
+RACE_CONFIG = {
+    'racers': int(os.getenv('FERDI_RACERS', '10')),
+    'rounds': 3,
+    'timeout': 30
+}
+
+OK_STATUSES = (200, 201)
+# Expected answers for the racers that lose
+CONFLICT_STATUSES = (400, 403, 404, 409, 410, 422)
+
+
+class RaceConditionTester:
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = dict(RACE_CONFIG, **(config or {}))
+        self.session = create_session()
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'User-Agent': 'FERDI-Race-Tester/1.0'
+        })
+        self.test_results = []
+        self.access_token = None
+        self.tenant = current_namespace()
+
+    def log_test(self, test_name: str, success: bool, message: str, details: Dict = None):
+        """Log test results with detailed information"""
+        result = {
+            "test": test_name,
+            "success": success,
+            "message": message,
+            "details": details or {}
+        }
+        self.test_results.append(result)
+        if log_test_event(self, result):
+            return
+
+        status = "✅ PASS" if success else "❌ FAIL"
+        print(f"{status} {test_name}: {message}")
+        if details:
+            for key, value in details.items():
+                print(f"    {key}: {value}")
+        print()
+
+    def _headers(self) -> Dict[str, str]:
+        if self.access_token is None:
+            self.access_token = obtain_access_token(self.session, API_BASE_URL) or MOCK_ACCESS_TOKEN
+        return {'Authorization': f'Bearer {self.access_token}', 'Content-Type': 'application/json'}
+
+    def _send(self, session: requests.Session, method: str, path: str, payload: Dict[str, Any],
+              headers: Dict[str, str]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            response = session.request(method, f"{API_BASE_URL}{path}", json=payload, headers=headers,
+                                       timeout=self.config['timeout'])
+            status = response.status_code
+            try:
+                body = response.json()
+            except ValueError:
+                body = {}
+        except requests.exceptions.RequestException as e:
+            status, body = type(e).__name__, {}
+        return {'status': status, 'body': body if isinstance(body, dict) else {},
+                'started': started, 'latency_ms': (time.perf_counter() - started) * 1000.0}
+
+    def race(self, method: str, path: str, payloads: List[Dict[str, Any]],
+             headers: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Send one request per payload from separate threads released by a single barrier"""
+        barrier = threading.Barrier(len(payloads))
+        outcomes: List[Dict[str, Any]] = [{} for _ in payloads]
+
+        def racer(index: int):
+            session = track_session(requests.Session())
+            # Open the connection before the barrier so only the request itself races
+            try:
+                session.get(f"{API_BASE_URL}/utils/health-check/", timeout=self.config['timeout'])
+            except requests.exceptions.RequestException:
+                pass
+            barrier.wait()
+            outcomes[index] = self._send(session, method, path, payloads[index], headers)
+            session.close()
+
+        threads = [threading.Thread(target=racer, args=(i,), daemon=True) for i in range(len(payloads))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def _judge(self, test_name: str, rounds: List[Dict[str, Any]]):
+        """Exactly one winner per round, losers rejected cleanly, contention overhead reported"""
+        problems = []
+        winners_per_round = []
+        loser_latencies, winner_latencies, spreads, uncontended = [], [], [], []
+        statuses: Dict[str, int] = {}
+
+        for race_round in rounds:
+            outcomes = race_round['outcomes']
+            winners = [o for o in outcomes if o['status'] in OK_STATUSES]
+            losers = [o for o in outcomes if o['status'] not in OK_STATUSES]
+            winners_per_round.append(len(winners))
+            winner_latencies.extend(o['latency_ms'] for o in winners)
+            loser_latencies.extend(o['latency_ms'] for o in losers)
+            starts = [o['started'] for o in outcomes]
+            spreads.append((max(starts) - min(starts)) * 1000.0)
+            if race_round.get('baseline_ms') is not None:
+                uncontended.append(race_round['baseline_ms'])
+            for outcome in outcomes:
+                statuses[str(outcome['status'])] = statuses.get(str(outcome['status']), 0) + 1
+
+            if len(winners) > 1:
+                problems.append(f"{len(winners)} requests succeeded in one round")
+            elif not winners:
+                problems.append("no request succeeded in one round")
+            unexpected = [o['status'] for o in losers if o['status'] not in CONFLICT_STATUSES]
+            if unexpected:
+                problems.append(f"losers answered {sorted(set(map(str, unexpected)))} instead of a 4xx conflict")
+
+        contended = sorted(winner_latencies + loser_latencies)
+        baseline = percentile(sorted(uncontended), 50) if uncontended else None
+        details = {
+            "racers": self.config['racers'],
+            "rounds": len(rounds),
+            "winners_per_round": winners_per_round,
+            "statuses": statuses,
+            "barrier_spread_ms": round(max(spreads, default=0.0), 2),
+            "uncontended_ms": round(baseline, 1) if baseline is not None else "n/a",
+            "contended_p50_ms": round(percentile(contended, 50), 1),
+            "contended_p99_ms": round(percentile(contended, 99), 1),
+            "loser_p99_ms": round(percentile(sorted(loser_latencies), 99), 1)
+        }
+        if baseline is not None:
+            details["contention_overhead_ms"] = round(percentile(contended, 50) - baseline, 1)
+
+        if problems:
+            self.log_test(test_name, False, "; ".join(sorted(set(problems))), details)
+        else:
+            self.log_test(test_name, True, "Exactly one request won every round", details)
+
+    def _rounds(self, run_round: Callable[[int], Optional[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        rounds = []
+        for index in range(self.config['rounds']):
+            result = run_round(index)
+            if result is not None:
+                rounds.append(result)
+        return rounds
+
+    def test_double_invitation_accept(self):
+        """Test 1: The same invitation token accepted by K racers"""
+        test_name = "Invitation Accepted Twice"
+        try:
+            headers = self._headers()
+
+            def invite(index):
+                invitation = self._send(self.session, 'POST', '/invitations/', {
+                    "email": self.tenant.email('race.invite'),
+                    "role": "DRIVER",
+                    "first_name": "Course",
+                    "last_name": f"Invitation {index}"
+                }, headers)
+                token = invitation['body'].get('token') or invitation['body'].get('invitation_token')
+                if invitation['status'] not in OK_STATUSES or not token:
+                    return None
+                return {
+                    "invitation_token": token,
+                    "first_name": "Course",
+                    "last_name": f"Invitation {index}",
+                    "mobile": "0601234567",
+                    "password": "SecurePassword123!"
+                }
+
+            def run_round(index):
+                solo, payload = invite(index), invite(index)
+                if payload is None:
+                    return None
+                public = {'Content-Type': 'application/json'}
+                baseline = self._send(self.session, 'POST', '/invitations/accept', solo, public) if solo else None
+                outcomes = self.race('POST', '/invitations/accept',
+                                     [dict(payload) for _ in range(self.config['racers'])], public)
+                ok = baseline is not None and baseline['status'] in OK_STATUSES
+                return {'outcomes': outcomes, 'baseline_ms': baseline['latency_ms'] if ok else None}
+
+            rounds = self._rounds(run_round)
+            if not rounds:
+                self.log_test(test_name, False,
+                              "Could not create an invitation with a token to race on",
+                              {"endpoint": f"{API_BASE_URL}/invitations/"})
+                return
+            self._judge(test_name, rounds)
+        except Exception as e:
+            self.log_test(test_name, False, f"Invitation accept race failed: {str(e)}")
+
+    def test_duplicate_user_email(self):
+        """Test 2: K admins creating a user with the same email"""
+        test_name = "Duplicate User Email"
+        try:
+            headers = self._headers()
+
+            def user_payload(email, index):
+                return {
+                    "first_name": "Course",
+                    "last_name": f"Admin {index}",
+                    "email": email,
+                    "mobile": "0687654321",
+                    "role": "DRIVER",
+                    "password": "TempPass123!"
+                }
+
+            def run_round(index):
+                baseline = self._send(self.session, 'POST', '/users/',
+                                      user_payload(self.tenant.email('race.solo'), 0), headers)
+                email = self.tenant.email('race.user')
+                outcomes = self.race('POST', '/users/',
+                                     [user_payload(email, i) for i in range(self.config['racers'])], headers)
+                return {'outcomes': outcomes,
+                        'baseline_ms': baseline['latency_ms'] if baseline['status'] in OK_STATUSES else None}
+
+            self._judge(test_name, self._rounds(run_round))
+        except Exception as e:
+            self.log_test(test_name, False, f"Duplicate user race failed: {str(e)}")
+
+    def test_duplicate_company_siret(self):
+        """Test 3: K company registrations with the same SIRET"""
+        test_name = "Duplicate Company SIRET"
+        try:
+            def registration(siret, index):
+                return self.tenant.company_registration(
+                    company=self.tenant.company(name=self.tenant.name("Transport Course"), siret=siret),
+                    manager_last_name=f"Course {index}")
+
+            def run_round(index):
+                baseline = self._send(self.session, 'POST', '/companies/register',
+                                      registration(self.tenant.siret(), 0), {'Content-Type': 'application/json'})
+                siret = self.tenant.siret()
+                outcomes = self.race('POST', '/companies/register',
+                                     [registration(siret, i) for i in range(self.config['racers'])],
+                                     {'Content-Type': 'application/json'})
+                return {'outcomes': outcomes,
+                        'baseline_ms': baseline['latency_ms'] if baseline['status'] in OK_STATUSES else None}
+
+            self._judge(test_name, self._rounds(run_round))
+        except Exception as e:
+            self.log_test(test_name, False, f"Duplicate SIRET race failed: {str(e)}")
+
+    def run_all_tests(self):
+        """Run every race scenario"""
+        print("🧪 FERDI RACE CONDITION TESTING")
+        print("=" * 80)
+        print(f"Testing against: {BASE_URL}")
+        print(f"API Base URL: {API_BASE_URL}")
+        print(f"Racers per round: {self.config['racers']}, rounds: {self.config['rounds']}")
+        print("=" * 80)
+        print()
+
+        self.test_double_invitation_accept()
+        self.test_duplicate_user_email()
+        self.test_duplicate_company_siret()
+
+        self.print_summary()
+
+    def print_summary(self):
+        """Print test summary"""
+        print("=" * 80)
+        print("📊 RACE CONDITION TEST SUMMARY")
+        print("=" * 80)
+        total_tests = len(self.test_results)
+        passed_tests = sum(1 for result in self.test_results if result["success"])
+        print(f"Total Tests: {total_tests}")
+        print(f"✅ Passed: {passed_tests}")
+        print(f"❌ Failed: {total_tests - passed_tests}")
+        if total_tests:
+            print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+        print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FERDI race tests for uniqueness-sensitive endpoints")
+    parser.add_argument("--racers", type=int, default=RACE_CONFIG['racers'], help="concurrent requests per round")
+    parser.add_argument("--rounds", type=int, default=RACE_CONFIG['rounds'])
+    args = parser.parse_args()
+
+    tester = RaceConditionTester({'racers': args.racers, 'rounds': args.rounds})
+    try:
+        tester.run_all_tests()
+    finally:
+        # Users and invitations the races created are tracked by their sessions
+        print_teardown_report(teardown(current_tracker()))
+    return all(result['success'] for result in tester.test_results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
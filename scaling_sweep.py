@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+FERDI Scaling Sweep - Latency Growth Classes Across Dataset Sizes
+Reseeds the local stand-in backend at geometric dataset sizes (1k, 10k, 100k,
+1M rows by default), measures every read route of the route catalog at each
+size, and fits how each route's p50 grows with the data: constant, log,
+linear or superlinear (n log n, quadratic).
+
+The backend is reseeded by --seed-command, run through the shell before each
+size with {rows} replaced by the size (also exported as FERDI_SEED_ROWS). The
+sweep waits for the health check to pass again before measuring.
+
+Save a sweep with --output and pass it as --baseline to the next release's
+sweep: routes whose growth class got worse are flagged and fail the run.
+
+Usage:
+    python scaling_sweep.py --seed-command "python backend/seed.py --rows {rows}" --output sweep.json
+    python scaling_sweep.py --seed-command "make reseed ROWS={rows}" --routes stats --baseline sweep.json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from ferdi_auth import MOCK_ACCESS_TOKEN, obtain_access_token
+from ferdi_benchmark import GROWTH_CLASSES, LatencyRecorder, fit_growth, run_workload, scaling_exponent
+from ferdi_http import preflight
+from ferdi_route_catalog import build_workload, load_route_catalog, send_request
+
+# Configuration
+BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
+API_BASE_URL = f"{BASE_URL}/api"
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SWEEP_CONFIG = {
+    'sizes': '1000,10000,100000,1000000',
+    'iterations': 20,       # measured requests per route and size
+    'warmup': 3,            # discarded requests per route after each reseed
+    'concurrency': 1,       # one request at a time, so latency reflects the data and not queueing
+    'seed_timeout': 3600,
+    'ready_timeout': 120,
+    'max_error_rate': 0.5,  # routes failing more often than this at any size are not fitted
+    'flat_ratio': 1.2,      # fitted p50 growth over the whole sweep below which a route is constant
+    'noise_ms': 2.0,        # latency jitter: smaller fitted increases, and fit differences, are ignored
+}
+
+
+def parse_sizes(text: str) -> List[int]:
+    sizes = sorted({int(float(part)) for part in text.split(',') if part.strip()})
+    if len(sizes) < 2 or sizes[0] <= 0:
+        raise ValueError("--sizes needs at least two positive dataset sizes")
+    return sizes
+
+
+def format_rows(rows: int) -> str:
+    if rows >= 1000000 and rows % 1000000 == 0:
+        return f"{rows // 1000000}M"
+    if rows >= 1000 and rows % 1000 == 0:
+        return f"{rows // 1000}k"
+    return str(rows)
+
+
+def reseed(command: str, rows: int, timeout: float) -> float:
+    """Run the seed command for one dataset size; returns how long it took"""
+    started = time.monotonic()
+    result = subprocess.run(command.replace('{rows}', str(rows)), shell=True, cwd=ROOT_DIR,
+                            env=dict(os.environ, FERDI_SEED_ROWS=str(rows)), timeout=timeout)
+    if result.returncode != 0:
+        raise RuntimeError(f"Seed command exited with {result.returncode} for {rows} rows")
+    return time.monotonic() - started
+
+
+def wait_ready(timeout: float) -> bool:
+    """Poll the backend health check until it answers again after a reseed"""
+    deadline = time.monotonic() + timeout
+    while True:
+        if preflight(API_BASE_URL, ttl=0)['available']:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(1.0)
+
+
+class ScalingSweep:
+    """Measures the same read workload after every reseed"""
+
+    def __init__(self, config: Dict[str, Any], workload: List[Dict[str, Any]]):
+        self.config = config
+        self.workload = workload
+        self.session = requests.Session()
+        self.session.headers.update({'Accept': 'application/json', 'User-Agent': 'FERDI-Scaling-Sweep/1.0'})
+        pool = max(config['concurrency'], 1)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool, pool_maxsize=pool)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.access_token = None
+        self.points: List[Dict[str, Any]] = []
+
+    def _send(self, request: Dict[str, Any]):
+        response = send_request(self.session, request, self.access_token)
+        return response.status_code, len(response.content)
+
+    def measure(self, rows: int, seed_seconds: float) -> Dict[str, Any]:
+        # Reseeding may have reset the accounts, so log in again at every size
+        self.access_token = obtain_access_token(self.session, API_BASE_URL, use_cache=False) or MOCK_ACCESS_TOKEN
+        run_workload(self.workload, self._send, LatencyRecorder(), concurrency=self.config['concurrency'],
+                     iterations=self.config['warmup'])
+        recorder = run_workload(self.workload, self._send, LatencyRecorder(), concurrency=self.config['concurrency'],
+                                iterations=self.config['iterations'])
+        point = {'rows': rows, 'seed_seconds': seed_seconds,
+                 'routes': {summary['key']: summary for summary in recorder.summaries()}}
+        self.points.append(point)
+        return point
+
+
+def fit_routes(points: List[Dict[str, Any]], config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Growth model per route from its p50 at every dataset size"""
+    routes = sorted({key for point in points for key in point['routes']})
+    fits = {}
+    for route in routes:
+        summaries = [point['routes'].get(route) for point in points]
+        failing = any(summary is None or summary['error_rate'] > config['max_error_rate'] for summary in summaries)
+        sizes = [point['rows'] for point in points]
+        p50s = [summary['p50_ms'] if summary else None for summary in summaries]
+        if failing:
+            fits[route] = {'model': None, 'growth': None, 'ratio': None, 'exponent': None, 'p50_ms': p50s,
+                           'note': 'too many errors to fit'}
+            continue
+        fit = fit_growth(sizes, p50s, flat_ratio=config['flat_ratio'], min_increase=config['noise_ms'])
+        fits[route] = {'model': fit['model'], 'growth': fit['growth'], 'ratio': fit['ratio'],
+                       'exponent': scaling_exponent(sizes, p50s), 'p50_ms': p50s, 'fits': fit['fits']}
+    return fits
+
+
+def compare_growth(fits: Dict[str, Dict[str, Any]], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Routes whose growth class is worse than in the baseline sweep"""
+    regressions = []
+    for route, fit in fits.items():
+        before = baseline.get('routes', {}).get(route, {}).get('growth')
+        if before in GROWTH_CLASSES and fit['growth'] in GROWTH_CLASSES \
+                and GROWTH_CLASSES.index(fit['growth']) > GROWTH_CLASSES.index(before):
+            regressions.append({'route': route, 'before': before, 'after': fit['growth'],
+                                'baseline_release': baseline.get('release')})
+    return regressions
+
+
+def print_sweep_report(points: List[Dict[str, Any]], fits: Dict[str, Dict[str, Any]],
+                       regressions: List[Dict[str, Any]], baseline: Optional[Dict[str, Any]]):
+    print("=" * 80)
+    print("📈 SCALING SWEEP - p50 per dataset size and fitted growth")
+    print("=" * 80)
+    labels = [format_rows(point['rows']) for point in points]
+    width = max((len(route) for route in fits), default=10)
+    width = min(max(width, 10), 34)
+    print(f"{'Route':<{width}}" + "".join(f"{label:>9}" for label in labels) + f"{'slope':>7}  growth")
+    print("-" * 80)
+    worse = {regression['route'] for regression in regressions}
+    for route, fit in fits.items():
+        cells = "".join(f"{p50:>7.1f}ms" if p50 is not None else f"{'-':>9}" for p50 in fit['p50_ms'])
+        slope = f"{fit['exponent']:.2f}" if fit['exponent'] is not None else "-"
+        growth = fit['note'] if fit.get('note') else (
+            fit['model'] if fit['model'] == fit['growth'] else f"{fit['growth']} ({fit['model']})")
+        previous = baseline.get('routes', {}).get(route, {}).get('growth') if baseline else None
+        if route in worse:
+            growth = f"❌ {growth}, was {previous}"
+        print(f"{route[:width]:<{width}}{cells}{slope:>7}  {growth}")
+    print("-" * 80)
+    seeded = ", ".join(f"{format_rows(point['rows'])} in {point['seed_seconds']:.0f}s" for point in points)
+    print(f"Reseeded {seeded}")
+    counts = {growth: sum(1 for fit in fits.values() if fit['growth'] == growth) for growth in GROWTH_CLASSES}
+    print("Growth classes: " + ", ".join(f"{growth} {count}" for growth, count in counts.items()))
+    if baseline:
+        print(f"Compared with release {baseline.get('release', '?')}: "
+              f"{len(regressions)} route(s) grow worse than before")
+    if counts['superlinear']:
+        print(f"⚠️  {counts['superlinear']} route(s) grow faster than the data - they will not survive next year's volume")
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FERDI scaling sweep across dataset sizes")
+    parser.add_argument("--seed-command", required=True,
+                        help="shell command that reseeds the local backend; {rows} is replaced by the size")
+    parser.add_argument("--sizes", default=SWEEP_CONFIG['sizes'], help="comma-separated dataset sizes in rows")
+    parser.add_argument("--routes", help="only routes whose name or path matches this regex")
+    parser.add_argument("--iterations", type=int, default=SWEEP_CONFIG['iterations'],
+                        help="measured requests per route and size")
+    parser.add_argument("--concurrency", type=int, default=SWEEP_CONFIG['concurrency'])
+    parser.add_argument("--noise-ms", type=float, default=SWEEP_CONFIG['noise_ms'],
+                        help="latency jitter of the backend; lower it on a quiet machine to tell growth classes apart")
+    parser.add_argument("--release", default=os.getenv('FERDI_RELEASE', 'current'),
+                        help="label stored with the results, compared against in later sweeps")
+    parser.add_argument("--baseline", help="an earlier sweep's --output to compare growth classes with")
+    parser.add_argument("--output", help="write points, fits and regressions as JSON")
+    args = parser.parse_args()
+    try:
+        sizes = parse_sizes(args.sizes)
+    except ValueError as e:
+        parser.error(str(e))
+
+    workload = build_workload(load_route_catalog())
+    if args.routes:
+        pattern = re.compile(args.routes)
+        workload = [request for request in workload if pattern.search(request['key']) or pattern.search(request['path'])]
+    if not workload:
+        parser.error("no read routes match --routes")
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    config = dict(SWEEP_CONFIG, iterations=args.iterations, concurrency=args.concurrency, noise_ms=args.noise_ms)
+    sweep = ScalingSweep(config, workload)
+    print(f"📏 Scaling sweep against {API_BASE_URL}: {len(workload)} routes at "
+          f"{', '.join(format_rows(size) for size in sizes)} rows")
+    for rows in sizes:
+        try:
+            seed_seconds = reseed(args.seed_command, rows, config['seed_timeout'])
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            print(f"❌ {str(e)} - stopping the sweep")
+            break
+        if not wait_ready(config['ready_timeout']):
+            print(f"❌ Backend not healthy {config['ready_timeout']}s after seeding {rows} rows - stopping the sweep")
+            break
+        point = sweep.measure(rows, seed_seconds)
+        print(f"   {format_rows(rows)} rows: seeded in {seed_seconds:.1f}s, measured {len(point['routes'])} routes")
+
+    if len(sweep.points) < 2:
+        print("❌ Fewer than two dataset sizes were measured - nothing to fit")
+        return False
+    fits = fit_routes(sweep.points, config)
+    regressions = compare_growth(fits, baseline) if baseline else []
+    print_sweep_report(sweep.points, fits, regressions, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'release': args.release, 'base_url': API_BASE_URL, 'config': config,
+                       'points': sweep.points, 'routes': fits, 'regressions': regressions}, f, indent=2)
+        print(f"Wrote sweep to {args.output}")
+    return len(sweep.points) == len(sizes) and not regressions
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
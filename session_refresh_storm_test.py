@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+FERDI Session Refresh Storm Test
+Simulates many browser tabs whose access tokens expire at the same moment and
+all call POST /sessions/refresh at once, then checks that the session
+endpoints stay fast as the session table grows.
+
+Scenario:
+1. Open sessions in steps (the session table grows) and time GET /sessions/me
+   and GET /sessions/admin/cleanup at every step
+2. Release every tab of every session through a barrier so all refreshes hit
+   the backend together
+3. Report refresh latency, failures and duplicate refreshes - several tabs of
+   one session each rotating the same refresh token into different tokens
+4. Terminate the sessions opened by the test
+
+Usage:
+    python session_refresh_storm_test.py --sessions 200 --tabs 3
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from ferdi_auth import DEFAULT_CREDENTIALS, login, token_expiry
+from ferdi_benchmark import LatencyRecorder, percentile, print_latency_table
+from ferdi_event_log import log_test_event
+from ferdi_http import create_session
+
+# Test configuration
+BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
+API_BASE_URL = f"{BASE_URL}/api"
+
+STORM_CONFIG = {
+    'sessions': int(os.getenv('FERDI_STORM_SESSIONS', '100')),
+    'tabs_per_session': int(os.getenv('FERDI_STORM_TABS', '3')),
+    'growth_steps': 4,
+    'growth_samples': 20,
+    'login_concurrency': 16,
+    # Acceptable p95 refresh latency under the storm
+    'max_refresh_p95_ms': 1000.0,
+    # /sessions/me and cleanup p95 at the largest table vs. the smallest
+    'max_growth_ratio': 3.0,
+    'wait_for_expiry': False,
+    'max_expiry_wait': 120.0,
+    'timeout': 30
+}
+
+
+class SessionRefreshStormTester:
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = dict(STORM_CONFIG, **(config or {}))
+        concurrency = self.config['sessions'] * self.config['tabs_per_session']
+        self.session = create_session()
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'User-Agent': 'FERDI-Refresh-Storm/1.0'
+        })
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=max(concurrency, 10))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.test_results = []
+        self.sessions: List[Dict[str, Any]] = []
+        self.recorder = LatencyRecorder()
+
+    def log_test(self, test_name: str, success: bool, message: str, details: Dict = None):
+        """Log test results with detailed information"""
+        result = {
+            "test": test_name,
+            "success": success,
+            "message": message,
+            "details": details or {}
+        }
+        self.test_results.append(result)
+        if log_test_event(self, result):
+            return
+
+        status = "✅ PASS" if success else "❌ FAIL"
+        print(f"{status} {test_name}: {message}")
+        if details:
+            for key, value in details.items():
+                print(f"    {key}: {value}")
+        print()
+
+    def _open_session(self, _=None) -> Optional[Dict[str, Any]]:
+        """Log in once and return the issued token pair"""
+        started = time.perf_counter()
+        try:
+            response = login(self.session, API_BASE_URL, DEFAULT_CREDENTIALS['email'],
+                             DEFAULT_CREDENTIALS['password'], timeout=self.config['timeout'])
+        except requests.exceptions.RequestException:
+            return None
+        self.recorder.record("POST /login/access-token", (time.perf_counter() - started) * 1000.0,
+                             response.status_code, len(response.content), response.status_code != 200)
+        if response.status_code != 200:
+            return None
+        try:
+            data = response.json()
+        except ValueError:
+            return None
+        if not data.get('access_token'):
+            return None
+        return {'access_token': data['access_token'], 'refresh_token': data.get('refresh_token')}
+
+    def _open_sessions(self, count: int) -> int:
+        with ThreadPoolExecutor(self.config['login_concurrency']) as pool:
+            opened = [s for s in pool.map(self._open_session, range(count)) if s]
+        self.sessions.extend(opened)
+        return len(opened)
+
+    def _time_get(self, path: str, key: str, access_token: str, samples: int) -> List[float]:
+        latencies = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            try:
+                response = self.session.get(f"{API_BASE_URL}{path}",
+                                            headers={'Authorization': f'Bearer {access_token}'},
+                                            timeout=self.config['timeout'])
+                status, size = response.status_code, len(response.content)
+            except requests.exceptions.RequestException as e:
+                status, size = type(e).__name__, 0
+            latency_ms = (time.perf_counter() - started) * 1000.0
+            self.recorder.record(key, latency_ms, status, size, not isinstance(status, int) or status >= 500)
+            latencies.append(latency_ms)
+        return sorted(latencies)
+
+    def test_session_table_growth(self):
+        """Test 1: GET /sessions/me and session cleanup latency as the session table grows"""
+        test_name = "Session Table Growth"
+        total = self.config['sessions']
+        steps = max(self.config['growth_steps'], 1)
+        samples = self.config['growth_samples']
+
+        try:
+            growth = []
+            for step in range(1, steps + 1):
+                target = max(1, total * step // steps)
+                self._open_sessions(target - len(self.sessions))
+                if not self.sessions:
+                    self.log_test(test_name, False, "Login failed - no session could be opened",
+                                  {"endpoint": f"{API_BASE_URL}/login/access-token"})
+                    return
+                token = self.sessions[-1]['access_token']
+                me = self._time_get('/sessions/me', f"GET /sessions/me @{len(self.sessions)}", token, samples)
+                cleanup = self._time_get('/sessions/admin/cleanup', f"GET /sessions/admin/cleanup @{len(self.sessions)}",
+                                         token, max(samples // 4, 1))
+                growth.append({
+                    'sessions': len(self.sessions),
+                    'me_p95_ms': round(percentile(me, 95), 1),
+                    'cleanup_p95_ms': round(percentile(cleanup, 95), 1)
+                })
+
+            first, last = growth[0], growth[-1]
+            me_ratio = last['me_p95_ms'] / max(first['me_p95_ms'], 0.1)
+            cleanup_ratio = last['cleanup_p95_ms'] / max(first['cleanup_p95_ms'], 0.1)
+            details = {
+                "steps": growth,
+                "sessions_me_growth": f"{me_ratio:.2f}x",
+                "cleanup_growth": f"{cleanup_ratio:.2f}x"
+            }
+            limit = self.config['max_growth_ratio']
+            if me_ratio <= limit and cleanup_ratio <= limit:
+                self.log_test(test_name, True,
+                              f"Session endpoints stay flat up to {last['sessions']} sessions", details)
+            else:
+                self.log_test(test_name, False,
+                              f"Session endpoint latency grows more than {limit:.1f}x with the session table",
+                              details)
+        except Exception as e:
+            self.log_test(test_name, False, f"Session table growth test failed: {str(e)}")
+
+    def test_refresh_storm(self):
+        """Test 2: Every tab of every session refreshes at the same instant"""
+        test_name = "Token Refresh Storm"
+        try:
+            if not self.sessions:
+                self._open_sessions(self.config['sessions'])
+            sessions = [s for s in self.sessions if s.get('refresh_token')]
+            if not sessions:
+                self.log_test(test_name, False, "Login responses carry no refresh_token - nothing to refresh",
+                              {"sessions_opened": len(self.sessions)})
+                return
+
+            if self.config['wait_for_expiry']:
+                self._wait_for_expiry(sessions)
+
+            tabs = self.config['tabs_per_session']
+            attempts = [(index, tab) for index in range(len(sessions)) for tab in range(tabs)]
+            barrier = threading.Barrier(len(attempts))
+            outcomes: List[Dict[str, Any]] = [{} for _ in attempts]
+
+            def refresh(slot: int):
+                index, tab = attempts[slot]
+                payload = {'refresh_token': sessions[index]['refresh_token']}
+                barrier.wait()
+                started = time.perf_counter()
+                try:
+                    response = self.session.post(f"{API_BASE_URL}/sessions/refresh", json=payload,
+                                                 timeout=self.config['timeout'])
+                    status = response.status_code
+                    try:
+                        body = response.json()
+                    except ValueError:
+                        body = {}
+                    size = len(response.content)
+                except requests.exceptions.RequestException as e:
+                    status, body, size = type(e).__name__, {}, 0
+                latency_ms = (time.perf_counter() - started) * 1000.0
+                self.recorder.record("POST /sessions/refresh (storm)", latency_ms, status, size,
+                                     not isinstance(status, int) or status >= 500)
+                outcomes[slot] = {
+                    'session': index,
+                    'status': status,
+                    'access_token': body.get('access_token') if status == 200 else None,
+                    'refresh_token': body.get('refresh_token') if status == 200 else None
+                }
+
+            threads = [threading.Thread(target=refresh, args=(slot,), daemon=True) for slot in range(len(attempts))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self._report_storm(test_name, sessions, outcomes)
+        except threading.BrokenBarrierError:
+            self.log_test(test_name, False, "Refresh storm could not be synchronised")
+        except Exception as e:
+            self.log_test(test_name, False, f"Refresh storm test failed: {str(e)}")
+
+    def _wait_for_expiry(self, sessions: List[Dict[str, Any]]):
+        """Sleep until every access token has actually expired, when the JWT says when"""
+        expiries = [token_expiry(s['access_token']) for s in sessions]
+        latest = max((e for e in expiries if e), default=None)
+        if latest is None:
+            print("⚠️  Access tokens carry no exp claim - refreshing without waiting")
+            return
+        wait = latest - time.time() + 1
+        if wait > self.config['max_expiry_wait']:
+            print(f"⚠️  Tokens expire in {wait:.0f}s (> {self.config['max_expiry_wait']:.0f}s) - refreshing now")
+            return
+        if wait > 0:
+            print(f"⏳ Waiting {wait:.0f}s for access tokens to expire")
+            time.sleep(wait)
+
+    def _report_storm(self, test_name: str, sessions: List[Dict[str, Any]], outcomes: List[Dict[str, Any]]):
+        summary = self.recorder.summary("POST /sessions/refresh (storm)")
+        by_session: Dict[int, List[Dict[str, Any]]] = {}
+        for outcome in outcomes:
+            by_session.setdefault(outcome['session'], []).append(outcome)
+
+        duplicates = 0
+        locked_out = 0
+        for index, session_outcomes in by_session.items():
+            issued = {o['access_token'] for o in session_outcomes if o['access_token']}
+            if len(issued) > 1:
+                duplicates += 1  # The same refresh token was rotated more than once
+            if not issued:
+                locked_out += 1
+            else:
+                newest = next(o for o in session_outcomes if o['access_token'])
+                sessions[index]['access_token'] = newest['access_token']
+                sessions[index]['refresh_token'] = newest['refresh_token'] or sessions[index]['refresh_token']
+
+        errors = sum(1 for o in outcomes if not isinstance(o['status'], int) or o['status'] >= 500)
+        details = {
+            "sessions": len(by_session),
+            "refresh_requests": len(outcomes),
+            "statuses": summary['statuses'],
+            "p50_ms": round(summary['p50_ms'], 1),
+            "p95_ms": round(summary['p95_ms'], 1),
+            "p99_ms": round(summary['p99_ms'], 1),
+            "server_errors": errors,
+            "sessions_locked_out": locked_out,
+            "duplicate_refreshes": duplicates
+        }
+
+        problems = []
+        if errors:
+            problems.append(f"{errors} refreshes failed")
+        if locked_out:
+            problems.append(f"{locked_out} sessions got no new token")
+        if duplicates:
+            problems.append(f"{duplicates} sessions refreshed more than once")
+        if summary['p95_ms'] > self.config['max_refresh_p95_ms']:
+            problems.append(f"p95 {summary['p95_ms']:.0f} ms over {self.config['max_refresh_p95_ms']:.0f} ms")
+
+        if problems:
+            self.log_test(test_name, False, "; ".join(problems), details)
+        else:
+            self.log_test(test_name, True,
+                          f"{len(outcomes)} simultaneous refreshes handled - one rotation per session", details)
+
+    def test_sessions_valid_after_storm(self):
+        """Test 3: Tokens issued during the storm are accepted by GET /sessions/me"""
+        test_name = "Sessions Valid After Storm"
+        try:
+            if not self.sessions:
+                self.log_test(test_name, False, "No sessions to verify")
+                return
+            rejected = 0
+            for session in self.sessions:
+                response = self.session.get(f"{API_BASE_URL}/sessions/me",
+                                            headers={'Authorization': f"Bearer {session['access_token']}"},
+                                            timeout=self.config['timeout'])
+                if response.status_code in (401, 403):
+                    rejected += 1
+            details = {"sessions": len(self.sessions), "rejected": rejected}
+            if rejected:
+                self.log_test(test_name, False, f"{rejected} sessions rejected after refreshing", details)
+            else:
+                self.log_test(test_name, True, "Every session still authenticates after the storm", details)
+        except Exception as e:
+            self.log_test(test_name, False, f"Post-storm verification failed: {str(e)}")
+
+    def cleanup_sessions(self):
+        """Terminate the sessions opened by the test (DELETE /sessions/ keeps the caller's)"""
+        if not self.sessions:
+            return
+        try:
+            self.session.delete(f"{API_BASE_URL}/sessions/",
+                                headers={'Authorization': f"Bearer {self.sessions[-1]['access_token']}"},
+                                timeout=self.config['timeout'])
+        except requests.exceptions.RequestException:
+            pass
+        self.sessions = []
+
+    def run_all_tests(self):
+        """Run the session refresh storm scenario"""
+        print("🧪 FERDI SESSION REFRESH STORM")
+        print("=" * 80)
+        print(f"Testing against: {BASE_URL}")
+        print(f"API Base URL: {API_BASE_URL}")
+        print(f"Sessions: {self.config['sessions']} x {self.config['tabs_per_session']} tabs")
+        print("=" * 80)
+        print()
+
+        self.sessions = []
+        self.recorder = LatencyRecorder()
+        try:
+            self.test_session_table_growth()
+            self.test_refresh_storm()
+            self.test_sessions_valid_after_storm()
+        finally:
+            self.cleanup_sessions()
+
+        self.print_summary()
+
+    def print_summary(self):
+        """Print latency table and test summary"""
+        print_latency_table(self.recorder.summaries(), "SESSION ENDPOINT LATENCY")
+        total_tests = len(self.test_results)
+        passed_tests = sum(1 for result in self.test_results if result["success"])
+        print(f"Total Tests: {total_tests}")
+        print(f"✅ Passed: {passed_tests}")
+        print(f"❌ Failed: {total_tests - passed_tests}")
+        if total_tests:
+            print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+        print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FERDI token refresh storm and session table growth test")
+    parser.add_argument("--sessions", type=int, default=STORM_CONFIG['sessions'])
+    parser.add_argument("--tabs", type=int, default=STORM_CONFIG['tabs_per_session'], help="tabs sharing each session")
+    parser.add_argument("--steps", type=int, default=STORM_CONFIG['growth_steps'], help="session table growth steps")
+    parser.add_argument("--wait-for-expiry", action="store_true",
+                        help="wait until the access tokens really expire before the storm")
+    args = parser.parse_args()
+
+    tester = SessionRefreshStormTester({
+        'sessions': args.sessions,
+        'tabs_per_session': args.tabs,
+        'growth_steps': args.steps,
+        'wait_for_expiry': args.wait_for_expiry
+    })
+    tester.run_all_tests()
+    return all(result['success'] for result in tester.test_results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)